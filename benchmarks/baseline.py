@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import sys
+
+# folder of baselines written by benchmarks when no other file is given, timings are valid only on machine that
+# measured them, so baselines are not versioned
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+
+def default_path(p_benchmark: str) -> str:
+    return os.path.join(BASELINES_PATH, f'{p_benchmark}.json')
+
+
+def save(p_path: str, p_results: dict) -> None:
+    """ writes results of benchmark ({name: {"seconds": ..., ...}}) as baseline """
+
+    if os.path.dirname(p_path):
+        os.makedirs(os.path.dirname(p_path), exist_ok=True)
+    with open(p_path, 'w') as f:
+        f.write(json.dumps(p_results, indent=2))
+
+    return
+
+
+def load(p_path: str) -> dict:
+    with open(p_path, 'r') as f:
+        return json.loads(f.read())
+
+
+def slower(p_results: dict, p_baseline: dict, p_threshold: float) -> list[str]:
+    """
+    Returns descriptions of measurements that got slower than baseline by more than p_threshold (fraction).
+    Measurements missing in baseline (e.g. new benchmarks) are skipped.
+    """
+
+    regressions = []
+    for name, measured in p_results.items():
+        if name not in p_baseline:
+            continue
+        base = p_baseline[name]["seconds"]
+        if measured["seconds"] > base * (1 + p_threshold):
+            regressions.append(f'{name}: {base:.6f}s -> {measured["seconds"]:.6f}s')
+
+    return regressions
+
+
+def report(p_regressions: list[str]) -> int:
+    """ prints regressions, returns exit code: 1 if there are any """
+
+    for regression in p_regressions:
+        print(f'REGRESSION {regression}')
+
+    return 1 if p_regressions else 0
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.baseline',
+                                     description='Compares saved results of benchmark with baseline.')
+    parser.add_argument('results', help='results of benchmark, saved with --save')
+    parser.add_argument('baseline', help='baseline to compare results against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slow down as fraction of baseline')
+    args = parser.parse_args(argv)
+
+    return report(slower(load(args.results), load(args.baseline), args.threshold))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,283 @@
+import argparse
+import copy
+import dataclasses
+import fnmatch
+import logging
+import statistics
+import sys
+import time
+
+from benchmarks.baseline import save, load, slower, report, default_path
+from src.evolution.Initialization import initialize_random_world, initialize_random_population
+from src.evolution.Operators import mutate, reproduce, evaluate_and_select
+from src.evolution.Simulation import population_step
+from src.external import grid, population, kill_set, move_queue
+from src.population.NeuralNetwork import NeuralNetwork
+from src.population.Sensor import Sensor
+from src.population.SensorActionEnums import SensorType
+from src.saves.Settings import Settings
+from src.utils import Rng
+from src.utils.Oscilator import Oscillator
+from src.utils.utils import drain_kill_set, drain_move_queue
+
+# settings of world and population of every scale, the rest comes from config
+SCALES = {
+    'small': {"dim": 32, "population_size": 100, "genome_length": 8},
+    'medium': {"dim": 64, "population_size": 500, "genome_length": 16},
+    'large': {"dim": 128, "population_size": 2000, "genome_length": 32}
+}
+# every fixture is made from the same seed, so every run measures the same work
+SEED = 2024
+# steps made before fixture is saved, so specimens have moved and pheromones are emitted
+WARMUP_STEPS = 1
+# kernel that can be called repeatedly is called so many times that one measurement takes at least that long
+MIN_MEASUREMENT_SECONDS = 0.02
+
+
+class Fixture:
+    """
+    Seeded world and population of one scale, after WARMUP_STEPS steps. Building population of the large scale takes
+    seconds, so fixture is built once and its copy is restored before every benchmark.
+    """
+
+    def __init__(self, p_scale: str, p_seed: int = SEED):
+        self.scale = p_scale
+        self.settings = dataclasses.replace(Settings(), seed=p_seed, **SCALES[p_scale])
+        Settings.settings = self.settings
+        Rng.seed(p_seed)
+        grid.reload_size()
+        kill_set.clear()
+        move_queue.clear()
+        initialize_random_world()
+        initialize_random_population()
+        for _ in range(WARMUP_STEPS):
+            step()
+
+        self._state = copy.deepcopy(self._capture())
+
+    @staticmethod
+    def _capture() -> dict:
+        return {
+            "population": population[:],
+            "data": grid.data,
+            "food_data": grid.food_data,
+            "barriers": grid.barriers,
+            "pheromones": grid.pheromones.grid,
+            "rng": Rng.get_state()
+        }
+
+    def restore(self) -> None:
+        """ puts copy of fixture into global grid and population """
+
+        state = copy.deepcopy(self._state)
+        Settings.settings = self.settings
+        population[:] = state["population"]
+        grid.data = state["data"]
+        grid.food_data = state["food_data"]
+        grid.barriers = state["barriers"]
+        grid.pheromones.grid = state["pheromones"]
+        kill_set.clear()
+        move_queue.clear()
+        Rng.set_state(state["rng"])
+
+        return
+
+
+def step() -> None:
+    """ one step of simulation, as in simulation loop """
+
+    population_step()
+    drain_kill_set(kill_set)
+    drain_move_queue(move_queue)
+    grid.pheromones.spread()
+
+    return
+
+
+def alive() -> list:
+    return [specimen for specimen in population[1:] if specimen.alive]
+
+
+# Benchmarks are functions called before every measurement (not measured), which return measured kernel and whether
+# it can be called repeatedly. Kernels work on the whole population, e.g. brains of every living specimen are run.
+
+def bench_population_step():
+    def kernel():
+        population_step()
+        kill_set.clear()
+        move_queue.clear()
+
+    # specimens age and die, so calling it many times in a row would measure emptier and emptier world
+    return kernel, False
+
+
+def bench_sensor(p_type: SensorType):
+    def prepare():
+        for specimen in population[1:]:
+            if specimen.oscillator is None:
+                specimen.oscillator = Oscillator()
+        sensors = [Sensor({p_type.value}, specimen) for specimen in alive()]
+
+        def kernel():
+            for sensor in sensors:
+                sensor.sense()
+
+        return kernel, True
+
+    return prepare
+
+
+def bench_neural_network_init():
+    specimens = alive()
+
+    def kernel():
+        for specimen in specimens:
+            NeuralNetwork(specimen.genome, specimen)
+
+    return kernel, True
+
+
+def bench_neural_network_run():
+    brains = [specimen.brain for specimen in alive()]
+
+    def kernel():
+        for brain in brains:
+            brain.run()
+
+    return kernel, True
+
+
+def bench_drain_move_queue():
+    # queue is filled by step of population and emptied by kernel
+    population_step()
+    kill_set.clear()
+
+    return lambda: drain_move_queue(move_queue), False
+
+
+def bench_pheromones_emit():
+    specimens = alive()
+
+    def kernel():
+        for specimen in specimens:
+            grid.pheromones.emit(specimen.location.x, specimen.location.y, specimen.last_movement_direction)
+
+    return kernel, True
+
+
+def bench_pheromones_spread():
+    return grid.pheromones.spread, True
+
+
+def bench_mutate():
+    specimens = population[1:]
+
+    def kernel():
+        for specimen in specimens:
+            mutate(specimen)
+
+    return kernel, True
+
+
+def bench_reproduce():
+    probabilities, selected_idx = evaluate_and_select()
+
+    return lambda: reproduce(probabilities, selected_idx), True
+
+
+def bench_evaluate_and_select():
+    return evaluate_and_select, True
+
+
+BENCHMARKS = {
+    'population_step': bench_population_step,
+    **{f'Sensor.sense.{sensor_type.name}': bench_sensor(sensor_type) for sensor_type in SensorType},
+    'NeuralNetwork.__init__': bench_neural_network_init,
+    'NeuralNetwork.run': bench_neural_network_run,
+    'drain_move_queue': bench_drain_move_queue,
+    'Pheromones.emit': bench_pheromones_emit,
+    'Pheromones.spread': bench_pheromones_spread,
+    'mutate': bench_mutate,
+    'reproduce': bench_reproduce,
+    'evaluate_and_select': bench_evaluate_and_select
+}
+
+
+def measure(p_fixture: Fixture, p_benchmark, p_repeat: int) -> dict:
+    """
+    Measures kernel p_repeat times, returns the best and median time of one call. Fixture is restored before every
+    measurement, so each of them does the same work. Kernel that can be called repeatedly is called as many times as
+    fits in MIN_MEASUREMENT_SECONDS.
+    """
+
+    times = []
+    calls = 1
+    for _ in range(p_repeat):
+        p_fixture.restore()
+        kernel, repeatable = p_benchmark()
+        start = time.perf_counter()
+        kernel()
+        seconds = time.perf_counter() - start
+        if repeatable:
+            # the first call tells how many calls are needed
+            if seconds < MIN_MEASUREMENT_SECONDS:
+                calls = max(calls, int(MIN_MEASUREMENT_SECONDS / max(seconds, 1e-9)) + 1)
+            if calls > 1:
+                start = time.perf_counter()
+                for _ in range(calls):
+                    kernel()
+                seconds = (time.perf_counter() - start) / calls
+        times.append(seconds)
+
+    return {"seconds": min(times), "median": statistics.median(times), "calls": calls}
+
+
+def run(p_scales: list[str], p_repeat: int = 5, p_only: list[str] = None) -> dict:
+    """ measures benchmarks (those matching any of p_only patterns, if given) at every scale """
+
+    results = {}
+    for scale in p_scales:
+        fixture = Fixture(scale)
+        for name, benchmark in BENCHMARKS.items():
+            if p_only and not any(fnmatch.fnmatchcase(name, pattern) for pattern in p_only):
+                continue
+            results[f'{scale}/{name}'] = measure(fixture, benchmark, p_repeat)
+
+    return results
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.kernels',
+                                     description='Measures core kernels of simulation on seeded fixtures.')
+    parser.add_argument('--scale', nargs='+', choices=list(SCALES), default=list(SCALES),
+                        help='sizes of world and population')
+    parser.add_argument('--only', nargs='+', metavar='PATTERN',
+                        help="benchmarks to run, e.g. 'Sensor.sense.*' or population_step")
+    parser.add_argument('--repeat', type=int, default=5, help='measurements of every benchmark, the best is kept')
+    parser.add_argument('--save', nargs='?', const=default_path('kernels'),
+                        help='write results as baseline to this file (benchmarks/baselines/kernels.json if not given)')
+    parser.add_argument('--compare', nargs='?', const=default_path('kernels'),
+                        help='baseline file to compare results against (benchmarks/baselines/kernels.json if not '
+                             'given)')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slow down as fraction of baseline')
+    args = parser.parse_args(argv)
+
+    # simulation functions log every call
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = run(args.scale, args.repeat, args.only)
+    for name, measured in results.items():
+        print(f'{name:40} {measured["seconds"] * 1000:10.3f} ms  (median {measured["median"] * 1000:.3f} ms, '
+              f'{measured["calls"]} calls)')
+
+    if args.save:
+        save(args.save, results)
+
+    if args.compare:
+        return report(slower(results, load(args.compare), args.threshold))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.baseline import save, load, slower, report
+
+# root of repository, child interpreters are started there so src can be imported
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module : function started in new process (or called by main process) that is imported from it
+ENTRY_POINTS = {
+    'src.evolution.Simulation': 'simulation',
+    'src.evolution.Initialization': 'initialize_simulation',
+    'src.evolution.Sweep': 'run_single',
+    'src.utils.Save': 'save_population_archive',
+    'src.utils.Plot': 'plot_world',
+    'src.utils.Render': 'render_worker',
+}
+
+# libraries that should be loaded only by functions that really need them
+HEAVY_MODULES = ['PyQt6', 'matplotlib', 'networkx', 'imageio', 'scipy']
+
+# executed by fresh interpreter, prints import time and heavy modules it loaded
+CHILD_CODE = '''
+import importlib, json, sys, time
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+getattr(module, sys.argv[2])
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "loaded": [name for name in sys.argv[3:] if name in sys.modules]}))
+'''
+
+
+def measure_import(p_module: str, p_entry: str, p_repeat: int = 5) -> dict:
+    """ imports module in p_repeat fresh interpreters, returns best import time and heavy modules it loaded """
+
+    best = None
+    loaded = []
+    for _ in range(p_repeat):
+        result = subprocess.run([sys.executable, '-c', CHILD_CODE, p_module, p_entry, *HEAVY_MODULES], cwd=ROOT_PATH,
+                                capture_output=True, text=True, check=True)
+        measured = json.loads(result.stdout.strip().splitlines()[-1])
+        best = measured["seconds"] if best is None else min(best, measured["seconds"])
+        loaded = measured["loaded"]
+
+    return {"seconds": best, "loaded": loaded}
+
+
+def run(p_repeat: int = 5) -> dict:
+    """ measures every entry point """
+
+    return {module: measure_import(module, entry, p_repeat) for module, entry in ENTRY_POINTS.items()}
+
+
+def compare(p_results: dict, p_baseline: dict, p_threshold: float) -> list[str]:
+    """ returns descriptions of entry points that got slower than baseline by more than p_threshold (fraction) """
+
+    regressions = slower(p_results, p_baseline, p_threshold)
+    for module, measured in p_results.items():
+        if module not in p_baseline:
+            continue
+        new_heavy = set(measured["loaded"]).difference(p_baseline[module]["loaded"])
+        if new_heavy:
+            regressions.append(f'{module}: loads {", ".join(sorted(new_heavy))}')
+
+    return regressions
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup',
+                                     description='Measures import time of simulation worker entry points.')
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh interpreters per module')
+    parser.add_argument('--save', help='write results as baseline to this file')
+    parser.add_argument('--compare', help='baseline file to compare results against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slow down as fraction of baseline')
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    for module, measured in results.items():
+        loaded = ", ".join(measured["loaded"]) if measured["loaded"] else "none"
+        print(f'{module:32} {measured["seconds"]:.4f}s  heavy modules: {loaded}')
+
+    if args.save:
+        save(args.save, results)
+
+    if args.compare:
+        return report(compare(results, load(args.compare), args.threshold))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import argparse
+import importlib
+import os
+import sys
+import time
+import uuid
+from multiprocessing import set_start_method, freeze_support
+
+from src.utils.Profiling import MODES, MODE_VARIABLE
+
+# modules that must not be loaded by headless run, unless animation is requested
+HEAVY_MODULES = ['PyQt6', 'matplotlib', 'networkx', 'imageio']
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m cli', description='Runs simulation without graphical interface.')
+    parser.add_argument('--settings', help='path to settings file (.json), defaults to application settings')
+    parser.add_argument('--plane', help='path to plane save (.json), random world is generated if not given')
+    parser.add_argument('--population', help='path to saved population, random population is generated if not given')
+    parser.add_argument('--seed', type=int, help='seed of simulation, run with the same seed gives the same results')
+    parser.add_argument('--output', help='directory where simulation folder is created, defaults to application saves')
+    parser.add_argument('--uid', help='name of simulation folder, random if not given')
+    animation = parser.add_mutually_exclusive_group()
+    animation.add_argument('--animation', dest='animation', action='store_true', default=None,
+                           help='save animation regardless of settings')
+    animation.add_argument('--no-animation', dest='animation', action='store_false',
+                           help='do not save animation regardless of settings')
+    parser.add_argument('--resume', help='folder of interrupted simulation, it is continued from its last checkpoint')
+    parser.add_argument('--profile-startup', action='store_true', help='print how long start up took')
+    parser.add_argument('--profile', choices=MODES,
+                        help="profile simulation and processes it starts: 'cprofile' writes .pstats of every generation, "
+                             "'sample' writes collapsed stacks for flame graphs; written to profile folder of simulation")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] = None) -> None:
+    start = time.perf_counter()
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    # paths are read by config at import time, in this and in every process started by simulation
+    if args.settings:
+        os.environ['EVOLUTION_SETTINGS_PATH'] = os.path.abspath(args.settings)
+    if args.resume:
+        # resumed simulation keeps writing to its own folder
+        args.output, args.uid = os.path.split(os.path.abspath(args.resume.rstrip(os.sep)))
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        os.environ['EVOLUTION_OUTPUT_PATH'] = os.path.abspath(args.output)
+    if args.profile:
+        # processes started by simulation inherit profiling too
+        os.environ[MODE_VARIABLE] = args.profile
+
+    # measure every import of simulation modules, so regressions in start up time are visible
+    timings = []
+
+    import_start = time.perf_counter()
+    importlib.import_module('numpy')
+    timings.append(('numpy', time.perf_counter() - import_start))
+
+    import_start = time.perf_counter()
+    from src.saves.PlaneSave import PlaneSave
+    from src.saves.SavesStarter import SavesStarter
+    from src.saves.Settings import Settings
+    timings.append(('src.saves', time.perf_counter() - import_start))
+
+    import_start = time.perf_counter()
+    from src.evolution.Initialization import initialize_simulation
+    timings.append(('src.evolution.Initialization', time.perf_counter() - import_start))
+
+    if not args.settings:
+        # make sure default settings file exists
+        SavesStarter.init()
+    resume_path = None
+    if args.resume:
+        from src.utils.Checkpoint import checkpoint_path, read_checkpoint_meta
+        resume_path = checkpoint_path(os.path.join(args.output, args.uid))
+        # simulation continues with settings it was started with
+        settings = Settings(**read_checkpoint_meta(resume_path)["settings"])
+    else:
+        Settings.read()
+        settings = Settings.settings
+    if settings is None:
+        print(f'Cannot read settings from {os.environ.get("EVOLUTION_SETTINGS_PATH")}')
+        return
+    if args.animation is not None:
+        settings.SAVE_ANIMATION = args.animation
+
+    plane_save = None
+    if args.plane:
+        with open(args.plane, 'r') as f:
+            plane_save = PlaneSave.from_json(f.read())
+
+    if args.seed is not None:
+        # every random stream of simulation is derived from this seed
+        settings.seed = args.seed
+
+    uid = args.uid if args.uid else uuid.uuid4()
+
+    if args.profile_startup:
+        for name, seconds in timings:
+            print(f'startup: import {name} took {seconds:.4f}s')
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f'startup: heavy modules loaded: {", ".join(loaded) if loaded else "none"}')
+        print(f'startup: ready to simulate after {time.perf_counter() - start:.4f}s')
+
+    summary = initialize_simulation(plane_save, uid, args.population, settings, resume_path)
+
+    print(f'Simulation {uid} finished: {summary}')
+
+    return
+
+
+if __name__ == '__main__':
+    freeze_support()
+    set_start_method('spawn')
+    main()
@@ -15,3 +15,24 @@ MAP_DIM = 18 * UNIT
 
 # space between map and stats
 EMPTY_SPACE_WIDTH = 3 * UNIT
+
+# how often (in milliseconds) progress events sent by running simulation are received
+PROGRESS_POLL_INTERVAL = 100
+# how many times per second live view of running simulation is refreshed (0 disables live view)
+LIVE_VIEW_FPS = 25
+
+# the biggest brush (side of square in spaces) of interactive map in new plane creator
+PLANE_MAX_BRUSH_SIZE = 25
+
+# frames per second of animations played in main window
+ANIMATION_PLAYER_FPS = 10
+# decoded frames of recently shown generations are kept in memory up to that many bytes
+ANIMATION_CACHE_BYTES = 256 * 1024 * 1024
+# that many generations after the shown one are decoded in background, so switching to them is immediate
+ANIMATION_PREFETCH_GENERATIONS = 1
+# while shown generation has no animation yet (e.g. it is still rendered), player looks for it that often (ms)
+ANIMATION_RETRY_INTERVAL = 500
+
+# performance panel shows that many latest generations of running simulation
+PERFORMANCE_PANEL_GENERATIONS = 50
+PERFORMANCE_PANEL_HEIGHT = 7 * UNIT
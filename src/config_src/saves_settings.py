@@ -13,7 +13,10 @@ SIMULATION_SAVES_FOLDER_NAME = 'simulations'
 ROOT_FOLDER_PATH = os.path.join(PATH_TO_ROOT, ROOT_FOLDER_NAME)
 
 SAVES_FOLDER_PATH = os.path.join(ROOT_FOLDER_PATH, SAVES_FOLDER_NAME)
-SETTINGS_PATH = os.path.join(ROOT_FOLDER_PATH, SETTINGS_FILE_NAME)
+# environment variables allow command line runs to use other settings file and output directory
+# (they are inherited by every process started by simulation)
+SETTINGS_PATH = os.environ.get('EVOLUTION_SETTINGS_PATH', os.path.join(ROOT_FOLDER_PATH, SETTINGS_FILE_NAME))
 
 PLANE_SAVES_FOLDER_PATH = os.path.join(SAVES_FOLDER_PATH, PLANE_SAVES_FOLDER_NAME)
-SIMULATION_SAVES_FOLDER_PATH = os.path.join(SAVES_FOLDER_PATH, SIMULATION_SAVES_FOLDER_NAME)
+SIMULATION_SAVES_FOLDER_PATH = os.environ.get('EVOLUTION_OUTPUT_PATH',
+                                              os.path.join(SAVES_FOLDER_PATH, SIMULATION_SAVES_FOLDER_NAME))
@@ -52,10 +52,63 @@ PHEROMONE_DECAY_RATE = 0.05
 FORCE_EMISSION_TEST = False
 PHEROMONE_STRENGTH = 1.0
 
+## randomness ##
+# seed of every random stream of simulation, None means random seed (saved with simulation config)
+SEED = None
+
 ## saving simulation ##
+# full state is saved every N generations, so simulation can be resumed (0 disables checkpoints)
+CHECKPOINT_EVERY_N_GENERATIONS = 10
 SAVE_ANIMATION = True
 SAVE_EVOLUTION_STEP = True
 SAVE_GENERATION = True
 SAVE_SELECTION = True
 SAVE_POPULATION = True
 SAVE_CONFIG = True
+# positions, alive flags and food levels of every step, animations can be rendered from it after simulation
+SAVE_TRAJECTORY = False
+# compression of step saves: 'none', 'gzip' or 'lzma'
+SAVE_COMPRESSION = 'none'
+# saved records are collected in memory and written when buffer reaches that many bytes or after that many seconds
+SAVE_BUFFER_BYTES = 64 * 1024
+SAVE_BUFFER_SECONDS = 1.0
+# statistics of generations are committed to stats.sqlite every N generations or after that many seconds
+STATS_COMMIT_EVERY_N_GENERATIONS = 10
+STATS_COMMIT_SECONDS = 1.0
+# phases of simulation loop are timed, living of every specimen is split into sensing, brain evaluation and actions,
+# and sensors, fired actions, blocked moves and emissions are counted; results are saved in stats.sqlite
+INSTRUMENTATION = False
+# memory is measured at the end of every generation (RSS, tracemalloc allocations, bytes of specimen and of its parts)
+# and appended to memory_report.ndjson in folder of simulation, values that keep growing are written to
+# memory_summary.json at the end; tracemalloc slows simulation down considerably
+MEMORY_REPORT = False
+# number of the biggest allocation sites (and the fastest growing ones) in report of every generation
+MEMORY_REPORT_TOP_ALLOCATIONS = 10
+# specimens measured in every generation, bytes of specimen are their average
+MEMORY_REPORT_SAMPLE_SPECIMENS = 50
+# value is flagged as growing when it grew in each of that many generations in a row, by that many bytes together
+MEMORY_GROWTH_GENERATIONS = 3
+MEMORY_GROWTH_MIN_BYTES = 1024 * 1024
+# allocation sites that grew the most in generation are watched for growth, at most that many of them
+MEMORY_GROWTH_WATCHED_SITES = 1000
+
+## rendering animation ##
+# number of render processes, 0 means number of CPUs minus one (left for simulation)
+RENDER_PROCESSES = 0
+# frames waiting for every render process, simulation waits when queue is full
+RENDER_QUEUE_SIZE = 8
+# frame slots in shared memory, 0 means enough for every queued frame and one being drawn by every process
+FRAME_RING_SLOTS = 0
+# while simulation waits for render processes, it checks that often (in seconds) whether they are still running
+RENDER_WAIT_SECONDS = 1.0
+# size of one grid cell on animation frames, in pixels
+ANIMATION_PIXELS_PER_CELL = 10
+# draw pheromone field over animation frames
+ANIMATION_PHEROMONES = False
+# which frames are kept in animation: 'every' step, every 'nth_step', only 'first_last' or 'adaptive'
+# (frame is kept when at least ANIMATION_MIN_CHANGED_CELLS cells changed since the last kept frame)
+ANIMATION_POLICY = 'every'
+ANIMATION_EVERY_N_STEPS = 5
+# animation is saved for every Nth generation and for the last one
+ANIMATION_EVERY_N_GENERATIONS = 1
+ANIMATION_MIN_CHANGED_CELLS = 5
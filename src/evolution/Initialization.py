@@ -1,24 +1,78 @@
 import logging
-import pickle
-import random
 import time
 
 import numpy as np
 
 from src.evolution.Simulation import simulation
-from src.external import grid, population
+from src.external import grid, population, kill_set, move_queue
 from src.population.Specimen import Specimen
 from src.saves.PlaneSave import PlaneSave
 from src.saves.Settings import Settings
+from src.utils import Rng
+from src.utils.Checkpoint import read_checkpoint, restore_checkpoint
+from src.utils.PopulationArchive import (is_population_archive, read_population_archive, convert_legacy_pickle,
+                                         matrix_to_genomes)
+from src.utils.Progress import ProgressReporter
 from src.utils.utils import initialize_genome
 from src.world.Grid import Grid
 from src.world.LocationTypes import Coord
 
 
-def initialize_simulation(map_save: PlaneSave = None, uid=None, population_filepath: str = None):
-    # this function called as process, so settings needs to be read
-    Settings.read()
+def initialize_simulation(map_save: PlaneSave = None, uid=None, population_filepath: str = None,
+                          settings: Settings = None, resume_path: str = None, progress_connection=None) -> dict:
+    # progress events go to sending end of pipe, if simulation was started by GUI
+    progress = ProgressReporter(progress_connection)
+    try:
+        summary = _initialize_simulation(map_save, uid, population_filepath, settings, resume_path, progress)
+    except Exception as e:
+        progress.error(e)
+        raise
+    else:
+        progress.finished(summary)
+    finally:
+        progress.close()
+
+    return summary
+
+
+def _initialize_simulation(map_save: PlaneSave, uid, population_filepath: str, settings: Settings,
+                           resume_path: str, progress: ProgressReporter) -> dict:
+    # resumed simulation continues with state (and settings, unless they were passed) from checkpoint
+    checkpoint = read_checkpoint(resume_path) if resume_path else None
+    if checkpoint and settings is None:
+        settings = Settings(**checkpoint["meta"]["settings"])
+
+    # this function called as process, so settings needs to be read, unless they were passed explicitly
+    if settings is not None:
+        Settings.settings = settings
+    else:
+        Settings.read()
+    # every random stream of simulation starts from one seed, random seed is drawn and saved if none is set
+    seed = Rng.seed(Settings.settings.seed)
+    logging.info(f"Simulation seed: {seed}")
     grid.reload_size()
+    # process may be reused for several simulations, so drop leftovers of the previous one
+    kill_set.clear()
+    move_queue.clear()
+
+    if checkpoint:
+        # world and population are restored together with random streams
+        restore_checkpoint(checkpoint)
+    else:
+        initialize_world(map_save)
+        if population_filepath and population_filepath != "":
+            load_existing_population(population_filepath)
+        else:
+            initialize_random_population()
+    start = time.time()
+    summary = simulation(uid, checkpoint, progress)
+    logging.info(f"Simulation took {time.time() - start}s.")
+
+    return summary
+
+
+def initialize_world(map_save: PlaneSave = None) -> None:
+    """ places barriers and food sources from plane save, or randomly if there is none """
 
     if map_save:
         assert (grid.data == Grid.EMPTY).all()
@@ -32,32 +86,32 @@ def initialize_simulation(map_save: PlaneSave = None, uid=None, population_filep
     else:
         initialize_random_world()
 
-    if population_filepath and population_filepath != "":
-        load_existing_population(population_filepath)
-    else:
-        initialize_random_population()
-    start = time.time()
-    simulation(uid)
-    logging.info(f"Simulation took {time.time() - start}s.")
-
     return
 
 
 def load_existing_population(population_filepath):
+    """
+    Places population from archive (or legacy pickle, which is converted to archive first) at random empty places.
+    Specimens are built anew from genomes, with max energy they had when population was saved.
+    """
     try:
-        with open(population_filepath, "rb") as file:
-            pop = pickle.load(file)
-        assert isinstance(pop, list)
-        assert len(pop) > 1
-        assert pop[0] is None
+        if not is_population_archive(population_filepath):
+            population_filepath = convert_legacy_pickle(population_filepath)
+            logging.info(f"Legacy population converted to: {population_filepath}")
+        archive = read_population_archive(population_filepath)
+        genomes = matrix_to_genomes(archive["genomes"])
+        # energies are ints when they come straight from settings, they are restored as such
+        max_energy = [int(value) if value.is_integer() else value for value in archive["max_energy"].tolist()]
+        assert len(genomes) > 0
         initials = np.argwhere(grid.data == Grid.EMPTY)
         # randomly select sufficient amount of spaces for population
-        selected = initials[np.random.choice(initials.shape[0], size=len(pop) - 1, replace=False)]
+        selected = initials[Rng.stream(Rng.PLACEMENT).choice(initials.shape[0], size=len(genomes), replace=False)]
         population.clear()
         population.append(None)
-        for idx in range(len(pop) - 1):
-            assert isinstance(pop[idx + 1], Specimen)
-            population.append(pop[idx + 1].reset(Coord(selected[idx, 0].item(), selected[idx, 1].item())))
+        for idx, genome in enumerate(genomes):
+            specimen = Specimen(idx + 1, Coord(selected[idx, 0].item(), selected[idx, 1].item()), genome)
+            specimen.max_energy = max_energy[idx]
+            population.append(specimen.reset(specimen.location))
             grid.data[selected[idx][0], selected[idx][1]] = idx + 1
 
         Settings.settings.population_size = len(population) - 1
@@ -68,6 +122,12 @@ def load_existing_population(population_filepath):
         initialize_random_population()
 
 
+def sample(p_places: list[tuple], p_count: int) -> list[tuple]:
+    """ p_count different places chosen at random from world stream """
+
+    return [p_places[idx] for idx in Rng.stream(Rng.WORLD).choice(len(p_places), size=p_count, replace=False)]
+
+
 def initialize_random_world():
     """
     Initializes the world by modifying global grid to place barriers and food sources.
@@ -78,12 +138,13 @@ def initialize_random_world():
     # list of all indexes available in the grid
     all_places = [(row, col) for row in range(grid.size) for col in range(grid.size)]
     # select indexes for barriers and update grid object
-    bar_placement = random.sample(all_places, Settings.settings.BARRIERS_NUMBER)
+    bar_placement = sample(all_places, Settings.settings.BARRIERS_NUMBER)
     grid.set_barriers_at_indexes(bar_placement)
-    # list of available indexes left
-    places_left = list(set(all_places).difference(bar_placement))
+    # list of available indexes left, in the same order every time, so seeded world is always the same
+    taken = set(bar_placement)
+    places_left = [place for place in all_places if place not in taken]
     # select indexes for food sources and update grid object
-    food_placement = random.sample(places_left, Settings.settings.FOOD_SOURCES_NUMBER)
+    food_placement = sample(places_left, Settings.settings.FOOD_SOURCES_NUMBER)
     grid.set_food_sources_at_indexes(food_placement)
 
     return
@@ -98,7 +159,8 @@ def initialize_random_population() -> None:
     # look for empty spaces
     initials = np.argwhere(grid.data == Grid.EMPTY)
     # randomly select sufficient amount of spaces for population
-    selected = initials[np.random.choice(initials.shape[0], size=Settings.settings.population_size, replace=False)]
+    selected = initials[Rng.stream(Rng.PLACEMENT).choice(initials.shape[0], size=Settings.settings.population_size,
+                                                          replace=False)]
 
     for i in range(Settings.settings.population_size):
         # create specimen and add it to population. Save its index (in population list), location (in grid) and
@@ -1,5 +1,4 @@
 import logging
-import random
 
 import numpy as np
 
@@ -7,6 +6,7 @@ from src.external import population
 from src.population.NeuralNetwork import NeuralNetwork
 from src.population.Specimen import Specimen
 from src.saves.Settings import Settings
+from src.utils import Rng
 from src.utils.utils import probability
 
 
@@ -17,7 +17,8 @@ def mutate(p_specimen: Specimen) -> None:
     genome = p_specimen.genome.copy()
 
     # select random genes from genome
-    selected_idx = random.sample(range(len(genome)), Settings.settings.mutate_n_genes)
+    selected_idx = Rng.stream(Rng.MUTATION).choice(len(genome), size=Settings.settings.mutate_n_genes,
+                                                   replace=False).tolist()
     selected = [genome[x] for x in range(len(genome)) if x in selected_idx]
 
     genome = [genome[x] for x in range(len(genome)) if x not in selected_idx]
@@ -33,7 +34,7 @@ def mutate(p_specimen: Specimen) -> None:
         # find index from which bits will be negated
         # since randint includes boundaries, we do from 0 to len - 1
         # but also considering how many bits we want to negate we subtract that number from the end
-        idx = random.randint(0, len(binary) - Settings.settings.mutate_n_bits)
+        idx = int(Rng.stream(Rng.MUTATION).integers(0, len(binary) - Settings.settings.mutate_n_bits, endpoint=True))
         for b in range(idx, idx + Settings.settings.mutate_n_bits):
             binary[b] = '0' if binary[b] == '1' else '1'
         # convert it back to hex
@@ -52,15 +53,17 @@ def mutate(p_specimen: Specimen) -> None:
 def crossover_get_genomes(p_parent_a: Specimen, p_parent_b: Specimen) -> tuple[list, list]:
     # how many genes from parent_a will go to child_a
     # at least one up to GENOME_LENGTH - 1
-    a_2_a_size = np.random.choice(range(Settings.settings.genome_length - 1))
+    a_2_a_size = Rng.stream(Rng.REPRODUCTION).choice(Settings.settings.genome_length - 1)
     # how many genes from parent_b will go to child_a
     # compatible to GENOME_LENGTH
     b_2_a_size = Settings.settings.genome_length - a_2_a_size
 
     # parent_a's genes for child_a indexes
-    a_2_a_genes_idx = np.random.choice(Settings.settings.genome_length, size=a_2_a_size, replace=False)
+    a_2_a_genes_idx = Rng.stream(Rng.REPRODUCTION).choice(Settings.settings.genome_length, size=a_2_a_size,
+                                                          replace=False)
     # parent_b's genes for child_a indexes
-    b_2_a_genes_idx = np.random.choice(Settings.settings.genome_length, size=b_2_a_size, replace=False)
+    b_2_a_genes_idx = Rng.stream(Rng.REPRODUCTION).choice(Settings.settings.genome_length, size=b_2_a_size,
+                                                          replace=False)
 
     # parent_a's genes for child_a
     a_2_a_genes = [p_parent_a.genome[gene_idx] for gene_idx in range(Settings.settings.genome_length) if
@@ -90,7 +93,8 @@ def reproduce(probabilities, selected_idx):
     # add + 1 extra pair if POPULATION_SIZE is odd
     for _ in range(int(Settings.settings.population_size / 2) + 1):
         # randomly select two parents
-        parent_a_idx, parent_b_idx = np.random.choice(selected_idx, size=2, replace=False, p=probabilities)
+        parent_a_idx, parent_b_idx = Rng.stream(Rng.REPRODUCTION).choice(selected_idx, size=2, replace=False,
+                                                                          p=probabilities)
         # cross them and get their children's genomes
         child_a_genome, child_b_genome = crossover_get_genomes(population[parent_a_idx], population[parent_b_idx])
         # add genomes to evaluate them next
@@ -1,11 +1,26 @@
+import logging
+import os
 import time
-from multiprocessing import Process
 
-from src.evolution.Operators import *
-from src.external import move_queue, kill_set, grid
+import numpy as np
+
+import config
+from src.evolution.Operators import mutate, reproduce, evaluate_and_select
+from src.external import move_queue, kill_set, grid, population, instrumentation
 from src.population.Specimen import Specimen
-from src.utils.Plot import *
-from src.utils.Save import SavingHelper, save_stats
+from src.saves.Settings import Settings
+from src.utils import Rng, Profiling
+from src.utils.Checkpoint import write_checkpoint, checkpoint_path
+from src.utils.FrameBuffer import Frame
+from src.utils.Instrumentation import rss_bytes, generation_metrics
+from src.utils.LiveFrame import LiveFrame
+from src.utils.MemoryReport import MemoryTracker
+from src.utils.Progress import ProgressReporter
+from src.utils.Render import RenderPool
+from src.utils.Sampling import FrameSampler
+from src.utils.Save import SavingHelper
+from src.utils.StatsStore import StatsStore
+from src.utils.Trajectory import TrajectoryWriter
 from src.utils.utils import drain_move_queue, drain_kill_set, probability
 from src.world.Grid import Grid
 from src.world.LocationTypes import Coord
@@ -26,7 +41,8 @@ def new_generation_initialize(p_genomes: list) -> int:
     # look for empty spaces
     initials = np.argwhere(grid.data == Grid.EMPTY)
     # randomly select sufficient amount of spaces for population
-    selected = initials[np.random.choice(initials.shape[0], size=Settings.settings.population_size, replace=False)]
+    selected = initials[Rng.stream(Rng.PLACEMENT).choice(initials.shape[0], size=Settings.settings.population_size,
+                                                          replace=False)]
 
     for i in range(Settings.settings.population_size):
         # create specimen and add it to population. Save its index (in population list), location (in grid) and
@@ -39,8 +55,11 @@ def new_generation_initialize(p_genomes: list) -> int:
     return killers_count
 
 
-def simulation(uid) -> None:
-    """ main simulation function """
+def simulation(uid, checkpoint: dict = None, progress: ProgressReporter = None) -> dict:
+    """
+    main simulation function, returns summary of the run; continues from checkpoint if it is given,
+    reports progress of generations to progress reporter if it is given
+    """
 
     # path to saves for current simulation
     sim_folder_path = os.path.join(config.SIMULATION_SAVES_FOLDER_PATH, f'{uid}')
@@ -55,58 +74,147 @@ def simulation(uid) -> None:
 
     # unique ID for current simulation
     logging.info(f"Simulation id: {uid}")
-    # names of frames
-    filenames = []
-    # process' lists to join
-    plot_processes = []
-    gif_processes = []
+
+    # profiling requested by --profile, processes started from now on write their profiles to the same folder
+    profiler = Profiling.active()
+    own_profiler = profiler is None and Profiling.mode() is not None
+    profile_folder = None
+    # process may be reused for several simulations (e.g. sweep), so folder is set for every run and restored after it
+    previous_profile_folder = os.environ.get(Profiling.FOLDER_VARIABLE)
+    if Profiling.mode() is not None:
+        profile_folder = os.path.join(sim_folder_path, 'profile')
+        os.environ[Profiling.FOLDER_VARIABLE] = profile_folder
+    if own_profiler:
+        profiler = Profiling.start('simulation')
+    if profiler is not None:
+        profiler.folder = profile_folder
+
+    render_pool = None
+    sampler = None
+    if Settings.settings.SAVE_ANIMATION:
+        sampler = FrameSampler(Settings.settings)
+        render_pool = RenderPool(sim_frames_folder_path, Settings.settings.dim, Settings.settings.max_food_per_source,
+                                 Settings.settings.population_size)
+        render_pool.start()
+
+    trajectory = None
+    if Settings.settings.SAVE_TRAJECTORY:
+        trajectory = TrajectoryWriter(os.path.join(sim_folder_path, 'trajectory'), Settings.settings.population_size,
+                                      Settings.settings.dim, Settings.settings.max_food_per_source,
+                                      Settings.settings.steps_per_generation)
+
+    # statistics of every generation
+    stats = StatsStore(sim_folder_path)
+    if checkpoint:
+        stats.truncate(checkpoint["meta"]["generation"])
 
     if Settings.settings.SAVE:
-        save_helper = SavingHelper(uid)
+        save_helper = SavingHelper(uid, checkpoint["meta"]["writer_offsets"] if checkpoint else None)
         save_helper.start_writers()
 
     killers_count = 0
     for specimen in population[1:]:
         killers_count += 1 if specimen.is_killer else 0
 
+    # summary of the run, returned to caller (e.g. sweep runner)
+    summary = {
+        "uid": f'{uid}',
+        "generations": 0,
+        "steps": 0,
+        "survived": 0,
+        "selected": 0,
+        "selected_total": 0
+    }
+    first_generation = 0
+    if checkpoint:
+        first_generation = checkpoint["meta"]["generation"]
+        summary.update({key: value for key, value in checkpoint["meta"]["summary"].items() if key != "uid"})
+        logging.info(f"Simulation resumed from generation {first_generation}.")
+    # steps made before resuming are not counted in speed
+    steps_before = summary["steps"]
+    progress = progress or ProgressReporter()
+    progress.started(uid, first_generation, Settings.settings.number_of_generations)
+    # the latest world state for GUI watching simulation, written at most LIVE_VIEW_FPS times per second
+    live_view = None
+    if progress.enabled and config.LIVE_VIEW_FPS:
+        live_view = LiveFrame(Settings.settings.population_size, Settings.settings.dim,
+                              Settings.settings.max_food_per_source)
+        progress.live_view(live_view.description())
+    checkpoints = {
+        "count": 0,
+        "time_total": 0.0,
+        "time_max": 0.0,
+        "bytes": 0
+    }
+    # time spent in phases of every generation, with details of living of specimens if enabled in settings
+    instrumentation.enabled = Settings.settings.instrumentation
+    instrumentation.end_generation()
+    # memory at the end of every generation, if enabled in settings
+    memory = None
+    if Settings.settings.memory_report:
+        memory = MemoryTracker(sim_folder_path)
+        memory.start()
+    sim_start = time.time()
+
     # simulation loop
-    for generation in range(Settings.settings.number_of_generations):
+    for generation in range(first_generation, Settings.settings.number_of_generations):
         logging.info(f"Gen {generation} started.")
         gen_start = time.time()
+        gen_steps_before = summary["steps"]
+        progress.generation_started(generation)
+        # specimens that were alive at the beginning of every step
+        specimen_steps = 0
+        lap = time.perf_counter()
+        animate = Settings.settings.SAVE_ANIMATION and sampler.generation_sampled(generation)
+        # render pool of animated generations, None for others
+        gen_render_pool = render_pool if animate else None
+        if animate:
+            render_pool.begin_generation(generation, grid.barriers, list(grid.food_data.keys()))
+        if live_view is not None:
+            live_view.begin_generation(grid.barriers, list(grid.food_data.keys()))
+        if trajectory is not None:
+            trajectory.begin_generation(generation, grid.barriers, list(grid.food_data.keys()), specimen_positions())
         # add population state frame before actions
-        if Settings.settings.SAVE_ANIMATION:
-            save_path_name = os.path.join(sim_frames_folder_path, f'generation_{generation}_frame_0.png')
-            p = Process(target=plot_world, args=(
-                grid.barriers.copy(), grid.food_data.copy(), population.copy(), save_path_name))
-            p.start()
-            plot_processes.append(p)
-            filenames.append(save_path_name)
+        record_frame(gen_render_pool, sampler, trajectory, live_view, generation, 0, False)
+        lap = instrumentation.lap('render', lap)
+        count_dead = 0
         # every generation
         for step in range(Settings.settings.steps_per_generation):
             # has some time (in form of steps) to do something
 
+            specimen_steps += Settings.settings.population_size - count_dead
             count_dead = population_step()
+            lap = instrumentation.lap('live', lap)
+            summary["steps"] += 1
             if count_dead == Settings.settings.population_size:
+                # last frame shows everyone dead, render process finishes animation right after it
+                record_frame(gen_render_pool, sampler, trajectory, live_view, generation, step + 1, True)
+                lap = instrumentation.lap('render', lap)
                 break
 
             # execute kill actions
             drain_kill_set(kill_set)
+            lap = instrumentation.lap('kill', lap)
             # execute move actions
             drain_move_queue(move_queue)
+            lap = instrumentation.lap('move', lap)
             # spread pheromones
             grid.pheromones.spread()
+            lap = instrumentation.lap('pheromone', lap)
 
             # add population state frame after one generation actions
-            if Settings.settings.SAVE_ANIMATION:
-                save_path_name = os.path.join(sim_frames_folder_path, f'generation_{generation}_frame_{step + 1}.png')
-                p = Process(target=plot_world, args=(
-                    grid.barriers.copy(), grid.food_data.copy(), population.copy(), save_path_name))
-                p.start()
-                plot_processes.append(p)
-                filenames.append(save_path_name)
+            record_frame(gen_render_pool, sampler, trajectory, live_view, generation, step + 1,
+                         step + 1 == Settings.settings.steps_per_generation)
+            lap = instrumentation.lap('render', lap)
 
             if Settings.settings.SAVE_EVOLUTION_STEP:
                 save_helper.save_step(generation, step, count_dead)
+                lap = instrumentation.lap('save', lap)
+
+        # measured before selection, while specimens of generation are still alive
+        if memory is not None:
+            memory.generation_finished(generation, population, memory_sizes(save_helper if Settings.settings.SAVE
+                                                                            else None, render_pool))
 
         probabilities, selected_idx = evaluate_and_select()
         genomes_for_new_population = reproduce(probabilities, selected_idx)
@@ -114,30 +222,64 @@ def simulation(uid) -> None:
         # save survivred, selected and with kill neuron
         survived = Settings.settings.population_size - count_dead
         selected = len(selected_idx)
-        save_stats(uid, generation, survived, selected, killers_count)
-
+        stats.add_generation(generation, survived, selected, killers_count)
+        gen_stats = {"survived": survived, "selected": selected, "killers_count": killers_count}
+        summary["generations"] += 1
+        summary["survived"] = survived
+        summary["selected"] = selected
+        summary["selected_total"] += selected
+
+        lap = time.perf_counter()
         if Settings.settings.SAVE_SELECTION:
             save_helper.save_selection(generation, selected_idx)
 
         if Settings.settings.SAVE_GENERATION:
             save_helper.save_gen(generation)
+        lap = instrumentation.lap('save', lap)
 
-        wait_start = time.time()
-        for p in plot_processes:
-            p.join()
-        logging.info(f"Waited {time.time() - wait_start}s for plot processes.")
-        plot_processes.clear()
         # compose frames into animation
-        if Settings.settings.SAVE_ANIMATION:
-            p = Process(target=to_gif, args=(
-                os.path.join(sim_frames_folder_path, f'generation_{generation}'), filenames.copy()))
-            p.start()
-            gif_processes.append(p)
+        if animate:
+            render_pool.end_generation(generation)
+            logging.info(f"Render queue depth: {render_pool.max_queue_depth} max, "
+                         f"simulation waited {render_pool.blocked_time:.3f}s for render processes so far.")
+        instrumentation.lap('render', lap)
 
-        filenames.clear()
+        if trajectory is not None:
+            trajectory.end_generation()
 
         killers_count = new_generation_initialize(genomes_for_new_population)
-        logging.info(f"Gen {generation} took {time.time() - gen_start}s.")
+
+        # state at the beginning of the next generation
+        every = Settings.settings.checkpoint_every_n_generations
+        if every and (generation + 1) % every == 0 and generation + 1 < Settings.settings.number_of_generations:
+            writer_offsets = save_helper.sync() if Settings.settings.SAVE else {}
+            stats.commit()
+            seconds, size = write_checkpoint(checkpoint_path(sim_folder_path), generation + 1, summary,
+                                             writer_offsets)
+            checkpoints["count"] += 1
+            checkpoints["time_total"] += seconds
+            checkpoints["time_max"] = max(checkpoints["time_max"], seconds)
+            checkpoints["bytes"] = size
+            logging.info(f"Checkpoint before gen {generation + 1} written in {seconds:.4f}s ({size} bytes).")
+
+        gen_time = time.time() - gen_start
+        logging.info(f"Gen {generation} took {gen_time}s.")
+        gen_steps = summary["steps"] - gen_steps_before
+        phases, counts = instrumentation.end_generation()
+        perf = {
+            "time": gen_time,
+            "steps": gen_steps,
+            "steps_per_sec": gen_steps / gen_time if gen_time > 0 else 0.0,
+            "specimen_steps": specimen_steps,
+            "specimen_steps_per_sec": specimen_steps / gen_time if gen_time > 0 else 0.0,
+            "rss": rss_bytes(),
+            "phases": phases
+        }
+        stats.add_metrics(generation, generation_metrics(perf, counts))
+        progress.generation_finished(generation, gen_stats, perf)
+
+        if profiler is not None:
+            profiler.generation_finished(generation)
 
     if Settings.settings.SAVE_POPULATION:
         save_helper.save_pop()
@@ -145,23 +287,117 @@ def simulation(uid) -> None:
     if Settings.settings.SAVE_CONFIG:
         save_helper.save_config()
 
-    wait_start = time.time()
-    for p in gif_processes:
-        p.join()
-    logging.info(f"Waited {time.time() - wait_start}s for gif processes.")
+    if Settings.settings.SAVE_ANIMATION:
+        wait_start = time.time()
+        summary["render"] = render_pool.close()
+        logging.info(f"Waited {time.time() - wait_start}s for render processes.")
+
     if Settings.settings.SAVE:
         save_helper.close_writers()
 
+    stats.close()
+    instrumentation.enabled = False
+
+    if live_view is not None:
+        live_view.close()
+
+    if trajectory is not None:
+        summary["trajectory_bytes"] = trajectory.bytes_written
+
+    if own_profiler:
+        Profiling.stop()
+    if profiler is not None:
+        summary["profile"] = Profiling.profile_folder(profile_folder)
+    if profile_folder is not None:
+        if previous_profile_folder is None:
+            os.environ.pop(Profiling.FOLDER_VARIABLE, None)
+        else:
+            os.environ[Profiling.FOLDER_VARIABLE] = previous_profile_folder
+
+    if memory is not None:
+        memory.stop()
+        memory.write_summary()
+        memory.log_growth()
+        summary["memory_report"] = memory.path
+        summary["memory_summary"] = memory.summary_path
+
+    if checkpoints["count"]:
+        summary["checkpoint"] = checkpoints
+
+    summary["wall_time"] = time.time() - sim_start
+    summary["steps_per_sec"] = (summary["steps"] - steps_before) / summary["wall_time"] if summary["wall_time"] > 0 \
+        else 0.0
+
+    return summary
+
+
+def memory_sizes(save_helper: SavingHelper, render_pool: RenderPool) -> dict[str, int]:
+    """ sizes of things that hold data between generations, watched by memory report """
+
+    sizes = {"population": len(population) - 1}
+    if save_helper is not None:
+        sizes["save_processes"] = len(save_helper.processors)
+        if save_helper.step_writer is not None:
+            sizes["step_buffer_bytes"] = save_helper.step_writer.buffered_bytes
+    if render_pool is not None:
+        sizes["render_jobs_waiting"] = render_pool.jobs_waiting()
+
+    return sizes
+
+
+def record_frame(render_pool: RenderPool, sampler: FrameSampler, trajectory: TrajectoryWriter, live_view: LiveFrame,
+                 generation: int, step: int, last: bool) -> None:
+    """
+    Captures frame once for everything that needs it: trajectory gets every frame,
+    render processes (None if generation is not animated) only frames kept by sampling policy,
+    live view (None if nobody watches) the latest frame, if it was not refreshed too recently.
+    """
+
+    animated = render_pool is not None and sampler.step_sampled(step, last)
+    live = live_view is not None and (last or live_view.due(1 / config.LIVE_VIEW_FPS))
+    if not animated and trajectory is None and not live:
+        return
+
+    frame = capture_frame(generation, step)
+    if trajectory is not None:
+        trajectory.record(frame)
+    if live:
+        live_view.publish(frame)
+    if animated and sampler.keep(frame, last):
+        render_pool.submit(frame)
+
     return
 
 
+def specimen_positions() -> np.ndarray:
+    """ (N, 2) x and y of every specimen """
+
+    positions = np.empty((len(population) - 1, 2), dtype=np.int16)
+    for i, specimen in enumerate(population[1:]):
+        positions[i, 0] = specimen.location.x
+        positions[i, 1] = specimen.location.y
+
+    return positions
+
+
+def capture_frame(generation: int, step: int) -> Frame:
+    """ captures current positions, alive flags, food levels (and pheromones) as frame for render processes """
+
+    positions = specimen_positions()
+    alive = np.fromiter((specimen.alive for specimen in population[1:]), dtype=bool, count=len(population) - 1)
+    food = np.fromiter(grid.food_data.values(), dtype=np.int16, count=len(grid.food_data))
+    pheromones = grid.pheromones.grid.astype(np.float32) if config.ANIMATION_PHEROMONES else None
+
+    return Frame(generation, step, positions, alive, food, pheromones)
+
+
 def population_step() -> int:
     count_dead = 0
     for specimen_idx in range(1, Settings.settings.population_size + 1):
         # if it is alive
         if population[specimen_idx].alive:
             # mutation
-            if probability(Settings.settings.mutation_probability):
+            if probability(Settings.settings.mutation_probability, Rng.MUTATION):
                 mutate(population[specimen_idx])
 
             # let it take some actions
@@ -0,0 +1,179 @@
+import csv
+import dataclasses
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import config
+from src.saves.PlaneSave import PlaneSave
+from src.saves.SavesStarter import SavesStarter
+from src.saves.Settings import Settings
+from src.utils import Rng
+from src.utils.Processes import get_context
+
+# columns of results table, one row per run
+RESULT_COLUMNS = [
+    "run",
+    "uid",
+    "plane",
+    "overrides",
+    "generations",
+    "steps",
+    "survived",
+    "selected",
+    "selected_mean",
+    "wall_time",
+    "steps_per_sec",
+    "error"
+]
+
+
+def expand_grid(p_grid: dict[str, list]) -> list[dict]:
+    """ turns dict of parameter name : list of values into list of all combinations of overrides """
+
+    assert isinstance(p_grid, dict)
+
+    keys = list(p_grid.keys())
+
+    return [dict(zip(keys, values)) for values in itertools.product(*(p_grid[key] for key in keys))]
+
+
+def apply_overrides(p_settings: Settings, p_overrides: dict) -> Settings:
+    """ returns copy of settings with overridden fields, fails on unknown field names """
+
+    unknown = [key for key in p_overrides if key not in Settings.__dataclass_fields__]
+    if unknown:
+        raise ValueError(f'Unknown settings fields: {unknown}')
+
+    return dataclasses.replace(p_settings, **p_overrides)
+
+
+def run_single(p_run: int, p_uid: str, p_settings_json: str, p_plane_path: str = None) -> dict:
+    """ worker entry point, executes one simulation and returns its summary row """
+
+    # imported here, so pool workers pay simulation import cost once, when the first run is submitted to them
+    from src.evolution.Initialization import initialize_simulation
+
+    settings = Settings.from_json(p_settings_json)
+
+    plane_save = None
+    if p_plane_path:
+        with open(p_plane_path, 'r') as f:
+            plane_save = PlaneSave.from_json(f.read())
+
+    summary = initialize_simulation(plane_save, p_uid, None, settings)
+
+    generations = summary.get("generations")
+
+    return {
+        "run": p_run,
+        "uid": p_uid,
+        "plane": p_plane_path or "",
+        "generations": generations,
+        "steps": summary.get("steps"),
+        "survived": summary.get("survived"),
+        "selected": summary.get("selected"),
+        "selected_mean": summary.get("selected_total") / generations if generations else 0.0,
+        "wall_time": summary.get("wall_time"),
+        "steps_per_sec": summary.get("steps_per_sec"),
+        "error": ""
+    }
+
+
+def run_sweep(p_overrides: list[dict], p_plane_files: list[str] = None, p_processes: int = None,
+              p_base_settings: Settings = None) -> str:
+    """
+    Runs every combination of settings overrides and plane files on a process pool.
+    Worker processes are reused between runs. Each finished run appends one row to results table.
+    :param p_overrides: list of dicts with Settings fields to override, one dict per configuration
+    :param p_plane_files: optional list of paths to plane saves, every configuration is run on every plane
+    :param p_processes: size of process pool, defaults to number of CPUs
+    :param p_base_settings: settings to apply overrides on, defaults to settings file
+    :return: path to results table (.csv)
+    """
+
+    assert isinstance(p_overrides, list)
+
+    if p_base_settings is None:
+        Settings.read()
+        p_base_settings = Settings.settings
+
+    planes = p_plane_files if p_plane_files else [None]
+    # validate every configuration before anything is started
+    runs = [(apply_overrides(p_base_settings, overrides), overrides, plane) for overrides in p_overrides for plane in
+            planes]
+    if p_base_settings.seed is not None:
+        # seeded sweep gives every run its own seed derived from base seed, unless run sets seed explicitly
+        runs = [(settings if "seed" in overrides else dataclasses.replace(settings, seed=Rng.worker_seed(
+            p_base_settings.seed, idx)), overrides, plane) for idx, (settings, overrides, plane) in enumerate(runs)]
+
+    sweep_uid = f'sweep_{uuid.uuid4()}'
+    sweep_folder_path = os.path.join(config.SIMULATION_SAVES_FOLDER_PATH, sweep_uid)
+    os.mkdir(sweep_folder_path)
+    results_path = os.path.join(sweep_folder_path, 'results.csv')
+
+    processes = p_processes if p_processes else os.cpu_count()
+    logging.info(f"Sweep {sweep_uid}: {len(runs)} runs on {processes} processes.")
+
+    start = time.time()
+    with open(results_path, 'w', newline='') as file:
+        table = csv.DictWriter(file, fieldnames=RESULT_COLUMNS)
+        table.writeheader()
+
+        # pool workers are not daemonic, so simulations are still allowed to start their own helper processes
+        with ProcessPoolExecutor(max_workers=processes, mp_context=get_context()) as pool:
+            futures = {}
+            for idx, (settings, overrides, plane) in enumerate(runs):
+                # every run of the sweep is stored in the sweep folder
+                uid = os.path.join(sweep_uid, f'run_{idx}')
+                future = pool.submit(run_single, idx, uid, settings.to_json(), plane)
+                futures[future] = (idx, uid, overrides, plane)
+
+            for future in as_completed(futures):
+                idx, uid, overrides, plane = futures[future]
+                try:
+                    row = future.result()
+                except Exception as e:
+                    logging.error(f"Run {idx} failed: {e}")
+                    row = {"run": idx, "uid": uid, "plane": plane or "", "error": repr(e)}
+                row["overrides"] = json.dumps(overrides)
+                table.writerow(row)
+                # flush, so results of finished runs survive the interrupted sweep
+                file.flush()
+
+    logging.info(f"Sweep {sweep_uid} took {time.time() - start}s. Results: {results_path}")
+
+    return results_path
+
+
+def main(argv: list[str]) -> None:
+    """
+    Runs sweep described by json file:
+    {"grid": {"population_size": [50, 100]}, "runs": [{"dim": 30}], "planes": ["path.json"], "processes": 4}
+    "grid" is expanded into all combinations, "runs" are taken as they are, both can be used at once.
+    """
+
+    if len(argv) != 2:
+        print('usage: python -m src.evolution.Sweep <sweep.json>')
+        return
+
+    with open(argv[1], 'r') as f:
+        spec = json.loads(f.read())
+
+    overrides = expand_grid(spec.get("grid", {})) if "grid" in spec else []
+    overrides += spec.get("runs", [])
+
+    logging.basicConfig(level=logging.INFO)
+    SavesStarter.init()
+    print(run_sweep(overrides, spec.get("planes"), spec.get("processes")))
+
+    return
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -1,5 +1,6 @@
 import config
 
+from src.utils.Instrumentation import Instrumentation
 from src.world.Grid import Grid
 
 grid = Grid(config.DIM)
@@ -11,3 +12,6 @@ population = [None]
 kill_set = set()
 
 move_queue = []
+
+# timers and counters of simulation phases, enabled by simulation according to settings
+instrumentation = Instrumentation()
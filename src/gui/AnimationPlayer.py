@@ -0,0 +1,255 @@
+import os
+import queue
+import threading
+from pathlib import Path
+
+import numpy as np
+from PyQt6.QtCore import QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QWidget
+
+import config
+from src.utils.AnimationFrames import FrameCache, load_generation_frames
+
+# shown while frames of generation are not decoded yet or do not exist yet
+PLACEHOLDER_PATH = os.path.join(Path(os.path.realpath(__file__)).parent.parent.absolute().__str__(),
+                                'trying_to_load_animation.png')
+
+
+# plays animations of generations of simulation, frames are decoded in background thread
+class AnimationPlayer(QWidget):
+    # emitted from decoding thread, received in GUI thread: (simulation folder, generation), also when generation
+    # had no frames yet
+    decoded = pyqtSignal(str, int)
+    # shown frame index and number of frames of shown generation
+    frame_changed = pyqtSignal(int, int)
+
+    def __init__(self, parent=None):
+        """ constructor """
+
+        super().__init__(parent)
+
+        # folder of simulation whose generations are played
+        self._folder: str = None
+        # recently decoded generations
+        self._cache = FrameCache(config.ANIMATION_CACHE_BYTES)
+        # shown generation, its frames (None while they are being decoded) and index of shown frame
+        self._generation: int = None
+        self._frames: list[np.ndarray] = None
+        self._index = 0
+        # picture of shown frame, its pixels are kept alive together with it
+        self._image: QImage = None
+        self._placeholder = QImage(PLACEHOLDER_PATH)
+
+        # generations waiting for decoding thread and generations that are still worth decoding
+        self._requests = queue.Queue()
+        self._pending: set[tuple[str, int]] = set()
+        self._wanted: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self._thread.start()
+        self.decoded.connect(self.generation_decoded)
+
+        # advances frames
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, 1000 // max(config.ANIMATION_PLAYER_FPS, 1)))
+        self._timer.timeout.connect(self.next_frame)
+        # asks again for frames of shown generation, until they exist (animation is rendered after generation ends)
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.setInterval(config.ANIMATION_RETRY_INTERVAL)
+        self._retry_timer.timeout.connect(self.retry)
+
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+        return
+
+    def set_simulation(self, p_folder: str) -> None:
+        """ starts playing generations of another simulation, frames of the previous one are dropped """
+
+        self._timer.stop()
+        self._retry_timer.stop()
+        # decoding thread puts frames into cache only if they belong to played simulation, which it checks under lock,
+        # so no frames of the previous simulation get into cache after it is cleared
+        with self._lock:
+            self._folder = p_folder
+            self._cache.clear()
+            self._pending.clear()
+            self._wanted = set()
+        self._generation = None
+        self._frames = None
+        self._show(0)
+
+        return
+
+    def show_generation(self, p_generation: int, p_reload: bool = False) -> None:
+        """
+        Plays generation from its first frame. Frames are decoded in background if they are not cached,
+        the next generations are decoded in advance.
+        :param p_reload: frames are decoded again, e.g. because generation was still simulated when they were decoded
+        """
+
+        if self._folder is None:
+            return
+
+        if p_reload:
+            self._cache.discard(p_generation)
+        self._generation = p_generation
+        self._frames = self._cache.get(p_generation)
+        with self._lock:
+            # decoding of generations that user has already skipped is not finished
+            self._wanted = {(self._folder, generation) for generation in
+                            range(p_generation, p_generation + config.ANIMATION_PREFETCH_GENERATIONS + 1)}
+        if self._frames is None:
+            self._request(p_generation)
+        for generation in range(p_generation + 1, p_generation + config.ANIMATION_PREFETCH_GENERATIONS + 1):
+            if generation not in self._cache:
+                self._request(generation)
+
+        self._show(0)
+        self.play()
+
+        return
+
+    def _request(self, p_generation: int) -> None:
+        """ asks decoding thread for frames of generation, unless it is already working on them """
+
+        key = (self._folder, p_generation)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._requests.put(key)
+
+        return
+
+    def _decode_loop(self) -> None:
+        """ decoding thread, puts frames of requested generations into cache """
+
+        while True:
+            key = self._requests.get()
+            if key is None:
+                return
+            with self._lock:
+                wanted = key in self._wanted
+            frames = None
+            if wanted:
+                try:
+                    frames = load_generation_frames(*key, max(config.MAP_DIM, 1))
+                except Exception as e:
+                    print(e)
+            with self._lock:
+                self._pending.discard(key)
+                # frames of simulation that is not played anymore are dropped
+                if frames is not None and key[0] == self._folder:
+                    self._cache.put(key[1], frames)
+            if wanted:
+                self.decoded.emit(*key)
+
+    def generation_decoded(self, p_folder: str, p_generation: int) -> None:
+        """ happens in GUI thread when frames of generation were decoded, or it turned out there are none yet """
+
+        if p_folder == self._folder and p_generation == self._generation and self._frames is None:
+            self._frames = self._cache.get(p_generation)
+            if self._frames is None:
+                self._retry_timer.start()
+                return
+            self._show(0)
+            self.play()
+
+        return
+
+    def retry(self) -> None:
+        """ looks for frames of shown generation again, if they were not found before """
+
+        if self._generation is not None and self._frames is None:
+            self._request(self._generation)
+
+        return
+
+    def show_picture(self, p_image: QImage) -> None:
+        """ shows still picture instead of animation, until another generation is shown """
+
+        self._timer.stop()
+        self._retry_timer.stop()
+        self._generation = None
+        self._frames = None
+        self._show(0)
+        self._image = p_image
+
+        return
+
+    def _show(self, p_index: int) -> None:
+        """ shows frame of shown generation """
+
+        if self._frames:
+            self._index = min(max(p_index, 0), len(self._frames) - 1)
+            pixels = self._frames[self._index]
+            height, width, _ = pixels.shape
+            self._image = QImage(pixels.data, width, height, pixels.strides[0], QImage.Format.Format_RGB888)
+            self.frame_changed.emit(self._index, len(self._frames))
+        else:
+            self._index = 0
+            self._image = None
+            self.frame_changed.emit(0, 0)
+        self.update()
+
+        return
+
+    def next_frame(self) -> None:
+        """ shows the next frame, animation starts over after the last one """
+
+        if not self._frames:
+            self._timer.stop()
+            return
+        self._show((self._index + 1) % len(self._frames))
+
+        return
+
+    def seek(self, p_index: int) -> None:
+        """ shows given frame of shown generation """
+
+        self._show(p_index)
+
+        return
+
+    def play(self) -> None:
+        if self._frames and len(self._frames) > 1:
+            self._timer.start()
+
+        return
+
+    def pause(self) -> None:
+        self._timer.stop()
+
+        return
+
+    def restart(self) -> None:
+        """ plays shown generation from its first frame """
+
+        if self._generation is not None:
+            self.show_generation(self._generation)
+
+        return
+
+    def stop(self) -> None:
+        """ stops playing and decoding thread """
+
+        self._timer.stop()
+        self._retry_timer.stop()
+        self._requests.put(None)
+
+        return
+
+    def paintEvent(self, event) -> None:
+        """ paints shown frame over the whole widget """
+
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.white)
+        # placeholder is shown only once there is simulation whose animations are awaited
+        image = self._image if self._image is not None or self._folder is None else self._placeholder
+        if image is not None and not image.isNull():
+            painter.drawImage(self.rect(), image)
+        painter.end()
+
+        return
@@ -18,7 +18,7 @@ class HelpWindow(QMainWindow):
 
 <span style="font-size: 15px;"><b>Plane Tab:</b></span>
 <ul>
-    <li><u>Create New Plane:</u> Draw a new plane template and save it.</li>
+    <li><u>Create New Plane:</u> Draw a new plane template and save it. Use the brush (of chosen size) to paint spaces or the rectangle tool to fill an area at once.</li>
     <li><u>Edit Plane:</u> Open and edit existing plane templates. You can save it as a new one.</li>
     <li><u>Load Plane:</u> Load a saved plane template into the simulation.</li>
 </ul>
@@ -35,8 +35,17 @@ class HelpWindow(QMainWindow):
     <li><u>Prev:</u> Go back to the previous generation.</li>
     <li><u>Next:</u> Go to the next generation.</li>
     <li><u>Repeat:</u> Replay the current generation animation.</li>
+    <li><u>Slider:</u> Drag to scrub through frames of the current generation.</li>
 </ul>
-<b>Note:</b> If the animation is not ready, a "<i>Trying to find animation...</i>" message will appear. The animation refreshes only after pressing one of the buttons.<br><br>
+<b>Note:</b> If the animation is not ready, a "<i>Trying to find animation...</i>" message will appear. It is shown as soon as the generation is rendered. The next generation is loaded in the background, so switching to it is immediate. When animations are not saved, generations are drawn from the saved trajectory.<br><br>
+
+<span style="font-size: 15px;"><b>Performance Panel:</b></span>
+<ul>
+    <li><u>Time/gen:</u> Time of every generation. With <b>Instrumentation</b> enabled in parameters, it is split into phases (living, sensing, thinking, acting, kill, move, pheromone, save, render), and sensors, fired actions, blocked moves and emissions are counted in the simulation statistics. Grey is time spent elsewhere.</li>
+    <li><u>Steps/s:</u> Simulation steps (blue) and specimen steps (orange) per second.</li>
+    <li><u>RSS:</u> Memory used by the simulation process. With <b>Memory report</b> enabled in parameters, memory of every generation (the biggest allocations, bytes per specimen) is appended to <i>memory_report.ndjson</i> in the simulation folder, and values that kept growing are written to <i>memory_summary.json</i> when the simulation ends.</li>
+</ul>
+<b>Note:</b> Hover over the panel to see the numbers of the latest generation.<br><br>
 
 <span style="font-size: 15px;"><b>Exit Button:</b></span>
 <ul>
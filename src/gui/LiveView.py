@@ -0,0 +1,98 @@
+from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QWidget
+
+import config
+from src.utils.LiveFrame import LiveFrame
+from src.utils.Plot import render_world
+
+
+# shows the latest world state of running simulation, read from shared memory buffer written by simulation
+class LiveView(QWidget):
+    def __init__(self, parent=None):
+        """ constructor """
+
+        super().__init__(parent)
+
+        # food level drawn with the darkest color, as set in simulation being shown
+        self._max_food = 0
+        # buffer of running simulation, None when there is nothing to show
+        self._frame_buffer: LiveFrame = None
+        # sequence number of frame painted last, the same frame is not painted twice
+        self._painted_sequence = 0
+        # picture of the latest frame, its pixels are kept alive together with it
+        self._image: QImage = None
+        self._pixels = None
+        # generation and step of painted frame
+        self.generation = None
+        self.step = None
+
+        # refresh rate does not depend on speed of simulation
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, 1000 // max(config.LIVE_VIEW_FPS, 1)))
+        self._timer.timeout.connect(self.refresh)
+
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+        return
+
+    def attach(self, p_description: dict) -> None:
+        """ starts showing frames of simulation, which sent description of its buffer """
+
+        self.detach()
+        try:
+            self._frame_buffer = LiveFrame.attach(p_description)
+        except FileNotFoundError:
+            # simulation has already ended and removed its buffer
+            return
+        self._max_food = p_description["max_food"]
+        self._painted_sequence = 0
+        self._timer.start()
+
+        return
+
+    def detach(self) -> None:
+        """ stops reading buffer, the last painted frame stays visible """
+
+        self._timer.stop()
+        if self._frame_buffer is not None:
+            self.refresh()
+            self._frame_buffer.close()
+            self._frame_buffer = None
+
+        return
+
+    def refresh(self) -> None:
+        """ paints the latest frame, if simulation has published a new one """
+
+        if self._frame_buffer is None or self._frame_buffer.sequence == self._painted_sequence:
+            return
+        frame = self._frame_buffer.read()
+        if frame is None:
+            return
+
+        dim = self._frame_buffer.dim
+        # picture is drawn close to widget size, it is only slightly scaled when painted
+        cell_pixels = max(1, min(self.width(), self.height()) // dim)
+        self._pixels = render_world(frame["barriers"], frame["food_positions"], frame["food_levels"],
+                                    frame["positions"], frame["alive"], dim, self._max_food, cell_pixels)
+        height, width, _ = self._pixels.shape
+        self._image = QImage(self._pixels.data, width, height, 3 * width, QImage.Format.Format_RGB888)
+        self._painted_sequence = frame["sequence"]
+        self.generation = frame["generation"]
+        self.step = frame["step"]
+        self.update()
+
+        return
+
+    def paintEvent(self, event) -> None:
+        """ paints picture of the latest frame over the whole widget """
+
+        painter = QPainter(self)
+        if self._image is None:
+            painter.fillRect(self.rect(), Qt.GlobalColor.white)
+        else:
+            painter.drawImage(self.rect(), self._image)
+        painter.end()
+
+        return
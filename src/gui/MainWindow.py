@@ -1,22 +1,28 @@
-import json
 import os
+import sqlite3
 import uuid
 from enum import Enum, auto
 from multiprocessing import Process
-from pathlib import Path
 
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QAction, QMovie, QImage, QPixmap
-from PyQt6.QtWidgets import QMainWindow, QFrame, QFileDialog, QHBoxLayout, QVBoxLayout, QPushButton, QLabel
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QAction, QImage
+from PyQt6.QtWidgets import QMainWindow, QFrame, QFileDialog, QHBoxLayout, QVBoxLayout, QPushButton, QLabel, \
+    QStackedWidget, QCheckBox, QSlider
 
 import config
 from src.evolution.Initialization import initialize_simulation
+from src.gui.AnimationPlayer import AnimationPlayer
 from src.gui.HelpWindow import HelpWindow
+from src.gui.LiveView import LiveView
 from src.gui.NewPlaneCreator import NewPlaneCreator
 from src.gui.ParametersEditor import ParametersEditor
+from src.gui.PerformancePanel import PerformancePanel
 from src.saves.PlaneSave import PlaneSave
 from src.saves.Settings import Settings
 from src.utils.Plot import plot_plane
+from src.utils import Progress
+from src.utils.Processes import start_process, new_pipe
+from src.utils.StatsStore import StatsReader
 
 
 # this enum class describes available actions menus
@@ -62,6 +68,20 @@ class MainWindow(QMainWindow):
         self._this_gen_spec_survived = QLabel('data was not found yet.')
         self._this_gen_spec_selected = QLabel()
         self._this_gen_spec_killers = QLabel()
+        # reader of statistics of current simulation, opened once simulation creates them
+        self._stats: StatsReader = None
+        # progress of running simulation, as reported by it
+        self._simulation_progress = QLabel()
+        # statistics of generations received from running simulation
+        self._generation_stats = {}
+        # charts of time, speed and memory of generations of running simulation
+        self._performance = PerformancePanel()
+        # receiving end of pipe with progress events of running simulation
+        self._progress_receiver = None
+        # timer receiving progress events without blocking window
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(config.PROGRESS_POLL_INTERVAL)
+        self._progress_timer.timeout.connect(self.progress_timer_timeout)
         #
         self._start_simulation_btn_blocked = False
 
@@ -72,10 +92,28 @@ class MainWindow(QMainWindow):
         #
         self.simulation_process: Process = None
 
-        # where to place animations
-        self._map = QLabel()
-        self._map.setStyleSheet('background-color: white')
+        # where to place animations, frames are decoded in background and recent generations are kept in memory
+        self._map = AnimationPlayer()
         self._map.setFixedSize(config.MAP_DIM, config.MAP_DIM)
+        self._map.frame_changed.connect(self.animation_frame_changed)
+        # scrubbing through frames of shown generation, animation is paused while slider is dragged
+        self._frame_slider = QSlider(Qt.Orientation.Horizontal)
+        self._frame_slider.setEnabled(False)
+        self._frame_slider.sliderMoved.connect(self._map.seek)
+        self._frame_slider.sliderPressed.connect(self._map.pause)
+        self._frame_slider.sliderReleased.connect(self._map.play)
+        # indicator of shown frame
+        self._frame_indicator = QLabel()
+        # live view of running simulation, shown instead of animations when live view box is checked
+        self._live_view = LiveView()
+        self._live_view.setFixedSize(config.MAP_DIM, config.MAP_DIM)
+        self._live_view_box = QCheckBox('Live view')
+        self._live_view_box.toggled.connect(self.live_view_box_toggled)
+        # animations and live view take the same place in window
+        self._map_stack = QStackedWidget()
+        self._map_stack.addWidget(self._map)
+        self._map_stack.addWidget(self._live_view)
+        self._map_stack.setFixedSize(config.MAP_DIM, config.MAP_DIM)
         # space with buttons
         self._sidebar = QFrame()
         # root widget in window, it is parent of everything else visible
@@ -212,6 +250,8 @@ class MainWindow(QMainWindow):
         sidebar_layout.addWidget(self._simulation_id)
         #
         sidebar_layout.addWidget(self._progress_indicator)
+        sidebar_layout.addWidget(self._simulation_progress)
+        sidebar_layout.addWidget(self._live_view_box)
         #
         sidebar_layout.addWidget(QLabel('This generation:'))
         sidebar_layout.addWidget(self._this_gen_spec_survived)
@@ -219,8 +259,12 @@ class MainWindow(QMainWindow):
         sidebar_layout.addWidget(self._this_gen_spec_killers)
         #
         sidebar_layout.addLayout(mini_layout)
+        sidebar_layout.addWidget(self._frame_indicator)
+        sidebar_layout.addWidget(self._frame_slider)
         # add submission buttons
         sidebar_layout.addWidget(start_simulation_btn)
+        #
+        sidebar_layout.addWidget(self._performance)
 
         # apply sidebar layout to sidebar object
         self._sidebar.setLayout(sidebar_layout)
@@ -242,7 +286,7 @@ class MainWindow(QMainWindow):
         # set window paddings
         root_layout.setContentsMargins(m, m, m, m)
         # add interactive map
-        root_layout.addWidget(self._map)
+        root_layout.addWidget(self._map_stack)
         # add sidebar
         root_layout.addWidget(self._sidebar)
 
@@ -254,8 +298,10 @@ class MainWindow(QMainWindow):
     def load_population_action_triggered(self):
         """ happens when load population action is triggered """
         try:
-            # save selected population save file
-            self._population_file = QFileDialog.getOpenFileName(directory=config.SIMULATION_SAVES_FOLDER_PATH)[0]
+            # save selected population save file, legacy pickles are converted to archive when simulation starts
+            self._population_file = QFileDialog.getOpenFileName(
+                directory=config.SIMULATION_SAVES_FOLDER_PATH,
+                filter="Population archive (*.npz);;Legacy population (*.pickle);;All files (*)")[0]
         except Exception as e:
             print(e)
 
@@ -345,10 +391,7 @@ class MainWindow(QMainWindow):
             print(e, 1)
 
         try:
-            image = QImage(path)
-            image = image.scaled(config.MAP_DIM, config.MAP_DIM)
-
-            self._map.setPixmap(QPixmap.fromImage(image))
+            self._map.show_picture(QImage(path))
         except Exception as e:
             print(e, 2)
 
@@ -362,37 +405,23 @@ class MainWindow(QMainWindow):
 
         return
 
-    def update_(self):
+    def update_(self, p_reload: bool = False):
         self._progress_indicator.setText(f'Generation: {self._cur_generation_animation + 1}/{Settings.settings.number_of_generations}')
 
         ## ANIMATION
 
-        # path to desired generation animation of current simulation
-        path = os.path.join(config.SIMULATION_SAVES_FOLDER_PATH, f'{self._uid}', 'animation', f'generation_{self._cur_generation_animation}.gif')
-
-        if os.path.exists(path):
-            # if current generation is the last one AND animation for this generation exists
-            if self._cur_generation_animation + 1 == Settings.settings.number_of_generations:
-                # then animation completed! we can unblock starting next simulations
-                self._start_simulation_btn_blocked = False
-        else:
-            path = os.path.join(Path(os.path.realpath(__file__)).parent.parent.absolute().__str__(), 'trying_to_load_animation.png')
-
-        animation = QMovie(path)
-        animation.setScaledSize(QSize(config.MAP_DIM, config.MAP_DIM))
-        self._map.setMovie(animation)
-        animation.start()
+        # frames of cached generation are shown at once, the others are shown once they are decoded
+        self._map.show_generation(self._cur_generation_animation, p_reload)
 
         ## STATISTICS
 
-        path = os.path.join(config.SIMULATION_SAVES_FOLDER_PATH, f'{self._uid}', 'stats', f'gen_{self._cur_generation_animation}.json')
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                x = json.loads(f.read())
-
+        x = self._generation_stats.get(self._cur_generation_animation)
+        if x is None:
+            x = self.generation_stats(self._cur_generation_animation)
+        if x is not None:
             self._this_gen_spec_survived.setText(f'{x['survived']} specimens survived.')
             self._this_gen_spec_selected.setText(f'{x['selected']} specimens were selected.')
-            self._this_gen_spec_killers.setText(f'{x['killers count']} specimens had killer gene.')
+            self._this_gen_spec_killers.setText(f'{x['killers_count']} specimens had killer gene.')
         else:
             self._this_gen_spec_survived.setText(f'data was not found yet.')
             self._this_gen_spec_selected.setText(f'')
@@ -400,6 +429,35 @@ class MainWindow(QMainWindow):
 
         return
 
+    def animation_frame_changed(self, p_index: int, p_count: int) -> None:
+        """ happens every time animation player shows another frame """
+
+        self._frame_slider.setEnabled(p_count > 1)
+        self._frame_slider.setMaximum(max(p_count - 1, 0))
+        if not self._frame_slider.isSliderDown():
+            self._frame_slider.setValue(p_index)
+        self._frame_indicator.setText(f'Frame: {p_index + 1}/{p_count}' if p_count else '')
+
+        return
+
+    def live_view_box_toggled(self, p_checked: bool) -> None:
+        """ switches between animations of finished generations and live view of running simulation """
+
+        self._map_stack.setCurrentWidget(self._live_view if p_checked else self._map)
+
+        return
+
+    def generation_stats(self, p_generation: int) -> dict | None:
+        """ statistics of generation of current simulation, None if they are not saved yet """
+
+        try:
+            if self._stats is None:
+                self._stats = StatsReader(os.path.join(config.SIMULATION_SAVES_FOLDER_PATH, f'{self._uid}'))
+            return self._stats.generation(p_generation)
+        except (FileNotFoundError, sqlite3.Error):
+            # simulation has not created its statistics yet
+            return None
+
     def prev_gif_btn_clicked(self):
         """"""
 
@@ -436,21 +494,82 @@ class MainWindow(QMainWindow):
             self._start_simulation_btn_blocked = True
 
             self._uid = uuid.uuid4()
+            if self._stats is not None:
+                self._stats.close()
+                self._stats = None
+            self._generation_stats = {}
+            self._performance.clear()
+            self._simulation_progress.setText('Simulation starting...')
 
             self._simulation_id.setText(f'Simulation ID: \n{self._uid}')
-
-            self.simulation_process = Process(target=initialize_simulation, args=(
-                self._plane_save, self._uid, self._population_file))
-            self.simulation_process.start()
+            self._map.set_simulation(os.path.join(config.SIMULATION_SAVES_FOLDER_PATH, f'{self._uid}'))
+
+            # simulation sends progress events through pipe, window receives them with timer
+            self._progress_receiver, progress_sender = new_pipe()
+            self.simulation_process = start_process(initialize_simulation, (
+                self._plane_save, self._uid, self._population_file, None, None, progress_sender))
+            # only simulation process keeps sending end, so pipe is closed when it ends
+            progress_sender.close()
+            self._progress_timer.start()
             self._cur_generation_animation = 0
 
             self.update_()
 
         return
 
+    def progress_timer_timeout(self) -> None:
+        """ receives progress events waiting in pipe and updates window with them """
+
+        events, closed = Progress.drain(self._progress_receiver)
+        for kind, data in events:
+            self.progress_event_received(kind, data)
+        if closed:
+            # simulation process ended (also if it ended without sending finished event)
+            self._progress_timer.stop()
+            self._progress_receiver.close()
+            self._progress_receiver = None
+            self._live_view.detach()
+            self._start_simulation_btn_blocked = False
+
+        return
+
+    def progress_event_received(self, p_kind: str, p_data: dict) -> None:
+        """ happens for every progress event sent by simulation """
+
+        match p_kind:
+            case Progress.LIVE_VIEW:
+                # live view is refreshed by its own timer, independently of simulation
+                self._live_view.attach(p_data)
+            case Progress.GENERATION_FINISHED:
+                generation = p_data['generation']
+                self._generation_stats[generation] = p_data['stats']
+                self._performance.add_generation(generation, p_data['perf'])
+                self._simulation_progress.setText(
+                    f'Simulated: {generation + 1}/{Settings.settings.number_of_generations} '
+                    f'({p_data['perf']['steps_per_sec']:.0f} steps/s)')
+                # refresh generation that is just shown, its statistics have arrived and its frames are complete
+                if generation == self._cur_generation_animation:
+                    self.update_(True)
+            case Progress.FINISHED:
+                self._live_view.detach()
+                # animations are finished before simulation ends, so next simulation can be started
+                self._start_simulation_btn_blocked = False
+                self._simulation_progress.setText(
+                    f'Simulation finished in {p_data['summary']['wall_time']:.1f}s.')
+                self.update_()
+            case Progress.ERROR:
+                print(p_data['traceback'])
+                self._simulation_progress.setText(f'Simulation failed: {p_data['message']}')
+
+        return
+
     def closeEvent(self, event) -> None:
         """ executes when close event is triggered """
 
+        self._progress_timer.stop()
+        self._live_view.detach()
+        self._map.stop()
+
         if self._help_window is not None:
             self._help_window.close()
 
@@ -1,9 +1,10 @@
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QMainWindow, QFrame, QHBoxLayout, QVBoxLayout, QDialogButtonBox, QRadioButton, QLabel, \
-    QFileDialog
+    QFileDialog, QSpinBox
 
 import config
 from src.gui.Plane import Plane, MarkType
+from src.gui.PlaneTool import PlaneTool
 from src.saves.PlaneSave import PlaneSave
 
 
@@ -31,6 +32,19 @@ class NewPlaneCreator(QMainWindow):
         self._empty = QRadioButton('Empty')
         # connect method that should be triggered
         self._empty.clicked.connect(self.empty_radio_clicked)
+        # radio button to mark spaces under cursor while mouse button is pressed
+        self._brush = QRadioButton('Brush')
+        # connect method that should be triggered
+        self._brush.clicked.connect(self.brush_radio_clicked)
+        # radio button to mark rectangle between spaces where mouse button was pressed and released
+        self._rectangle = QRadioButton('Rectangle')
+        # connect method that should be triggered
+        self._rectangle.clicked.connect(self.rectangle_radio_clicked)
+        # side of square marked by brush
+        self._brush_size = QSpinBox()
+        self._brush_size.setRange(1, config.PLANE_MAX_BRUSH_SIZE)
+        # connect method that should be triggered
+        self._brush_size.valueChanged.connect(self._map.set_brush_size)
         # container for elements to be positioned as sidebar
         self._sidebar = QFrame()
 
@@ -68,6 +82,22 @@ class NewPlaneCreator(QMainWindow):
 
         return
 
+    def brush_radio_clicked(self) -> None:
+        """ happens when brush corresponding radio button is clicked """
+
+        # send info to interactive map to change tool
+        self._map.set_tool(PlaneTool.BRUSH)
+
+        return
+
+    def rectangle_radio_clicked(self) -> None:
+        """ happens when rectangle corresponding radio button is clicked """
+
+        # send info to interactive map to change tool
+        self._map.set_tool(PlaneTool.RECTANGLE)
+
+        return
+
     def initialise(self):
         # set window title
         self.setWindowTitle('Create new plane')
@@ -96,6 +126,25 @@ class NewPlaneCreator(QMainWindow):
         # apply created layout
         choose_block.setLayout(choose_block_layout)
 
+        # create container for tool radio buttons, so they are exclusive only among themselves
+        tool_block = QFrame()
+        # create their layout
+        tool_block_layout = QVBoxLayout()
+        # change alignment to top
+        tool_block_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        # add descriptive label
+        tool_block_layout.addWidget(QLabel('Tool:'))
+        # add radio buttons
+        tool_block_layout.addWidget(self._brush)
+        tool_block_layout.addWidget(self._rectangle)
+        # add brush size with its label
+        tool_block_layout.addWidget(QLabel('Brush size:'))
+        tool_block_layout.addWidget(self._brush_size)
+        # check default radio button
+        self._brush.setChecked(True)
+        # apply created layout
+        tool_block.setLayout(tool_block_layout)
+
         # what submission buttons to use - save and cancel
         buttons = QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel
         # automatically create container for submission buttons
@@ -111,6 +160,8 @@ class NewPlaneCreator(QMainWindow):
         sidebar_layout.setContentsMargins(0, 0, 0, 0)
         # add radio buttons
         sidebar_layout.addWidget(choose_block)
+        # add tools
+        sidebar_layout.addWidget(tool_block)
         # add submission buttons
         sidebar_layout.addWidget(submission_block)
 
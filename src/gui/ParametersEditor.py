@@ -1,10 +1,12 @@
 from math import ceil
 
 from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QDialogButtonBox, QFrame, QGridLayout, QSpinBox, QLabel, \
-    QDoubleSpinBox, QCheckBox
+    QDoubleSpinBox, QCheckBox, QComboBox
 
 import config
 from src.saves.Settings import Settings
+from src.utils.BufferedWriter import COMPRESSIONS
+from src.utils.Sampling import POLICIES
 
 
 class ParametersEditor(QMainWindow):
@@ -123,6 +125,29 @@ class ParametersEditor(QMainWindow):
         self.save_animation = QCheckBox()
         self.save_animation.setChecked(Settings.settings.SAVE_ANIMATION)
 
+        # input responsible for choosing which frames are kept in animation
+        self.animation_policy = QComboBox()
+        self.animation_policy.addItems(POLICIES)
+        self.animation_policy.setCurrentText(Settings.settings.animation_policy)
+
+        # input responsible for changing step interval of 'nth_step' animation policy
+        self.animation_every_n_steps = QSpinBox()
+        self.animation_every_n_steps.setMinimum(1)
+        self.animation_every_n_steps.setMaximum(1000)
+        self.animation_every_n_steps.setValue(Settings.settings.animation_every_n_steps)
+
+        # input responsible for changing which generations are animated
+        self.animation_every_n_generations = QSpinBox()
+        self.animation_every_n_generations.setMinimum(1)
+        self.animation_every_n_generations.setMaximum(1000)
+        self.animation_every_n_generations.setValue(Settings.settings.animation_every_n_generations)
+
+        # input responsible for changing threshold of 'adaptive' animation policy
+        self.animation_min_changed_cells = QSpinBox()
+        self.animation_min_changed_cells.setMinimum(0)
+        self.animation_min_changed_cells.setMaximum(10000)
+        self.animation_min_changed_cells.setValue(Settings.settings.animation_min_changed_cells)
+
         # input responsible for disabling and enabling saving of animation
         self.save_evolution_step = QCheckBox()
         self.save_evolution_step.setChecked(Settings.settings.SAVE_EVOLUTION_STEP)
@@ -147,6 +172,29 @@ class ParametersEditor(QMainWindow):
         self.save_config = QCheckBox()
         self.save_config.setChecked(Settings.settings.SAVE_CONFIG)
 
+        # input responsible for disabling and enabling saving of trajectory
+        self.save_trajectory = QCheckBox()
+        self.save_trajectory.setChecked(Settings.settings.SAVE_TRAJECTORY)
+
+        # input responsible for changing how often checkpoints are written (0 disables them)
+        self.checkpoint_every_n_generations = QSpinBox()
+        self.checkpoint_every_n_generations.setMinimum(0)
+        self.checkpoint_every_n_generations.setMaximum(1000)
+        self.checkpoint_every_n_generations.setValue(Settings.settings.checkpoint_every_n_generations)
+
+        # input responsible for compression of step saves
+        self.save_compression = QComboBox()
+        self.save_compression.addItems(COMPRESSIONS)
+        self.save_compression.setCurrentText(Settings.settings.save_compression)
+
+        # input responsible for disabling and enabling detailed timers and counters of simulation
+        self.instrumentation = QCheckBox()
+        self.instrumentation.setChecked(Settings.settings.instrumentation)
+
+        # input responsible for disabling and enabling memory report of every generation
+        self.memory_report = QCheckBox()
+        self.memory_report.setChecked(Settings.settings.memory_report)
+
         self._parameters = QFrame()
         self._container = QFrame(self)
 
@@ -263,6 +311,36 @@ class ParametersEditor(QMainWindow):
         parameters_layout.addWidget(QLabel('Save config:'), 14, 6)
         parameters_layout.addWidget(self.save_config, 14, 7)
 
+        # row 15
+        parameters_layout.addWidget(QLabel('Animation frames:'), 15, 0)
+        parameters_layout.addWidget(self.animation_policy, 15, 1)
+
+        parameters_layout.addWidget(QLabel('Animate every Nth step:'), 15, 3)
+        parameters_layout.addWidget(self.animation_every_n_steps, 15, 4)
+
+        parameters_layout.addWidget(QLabel('Animate every Nth generation:'), 15, 6)
+        parameters_layout.addWidget(self.animation_every_n_generations, 15, 7)
+
+        # row 16
+        parameters_layout.addWidget(QLabel('Min changed cells per frame:'), 16, 0)
+        parameters_layout.addWidget(self.animation_min_changed_cells, 16, 1)
+
+        parameters_layout.addWidget(QLabel('Save trajectory:'), 16, 3)
+        parameters_layout.addWidget(self.save_trajectory, 16, 4)
+
+        parameters_layout.addWidget(QLabel('Checkpoint every Nth generation:'), 16, 6)
+        parameters_layout.addWidget(self.checkpoint_every_n_generations, 16, 7)
+
+        # row 17
+        parameters_layout.addWidget(QLabel('Save compression:'), 17, 0)
+        parameters_layout.addWidget(self.save_compression, 17, 1)
+
+        parameters_layout.addWidget(QLabel('Instrumentation:'), 17, 3)
+        parameters_layout.addWidget(self.instrumentation, 17, 4)
+
+        parameters_layout.addWidget(QLabel('Memory report:'), 17, 6)
+        parameters_layout.addWidget(self.memory_report, 17, 7)
+
         self._parameters.setLayout(parameters_layout)
 
         return
@@ -304,12 +382,21 @@ class ParametersEditor(QMainWindow):
         Settings.settings.max_energy_level_supremum = self.max_energy.value()
         Settings.settings.dim = self.grid_dim.value()
         Settings.settings.SAVE_ANIMATION = self.save_animation.isChecked()
+        Settings.settings.animation_policy = self.animation_policy.currentText()
+        Settings.settings.animation_every_n_steps = self.animation_every_n_steps.value()
+        Settings.settings.animation_every_n_generations = self.animation_every_n_generations.value()
+        Settings.settings.animation_min_changed_cells = self.animation_min_changed_cells.value()
         Settings.settings.SAVE_EVOLUTION_STEP = self.save_evolution_step.isChecked()
         Settings.settings.SAVE_GENERATION = self.save_generation.isChecked()
         Settings.settings.SAVE_SELECTION = self.save_selection.isChecked()
         Settings.settings.SAVE_POPULATION = self.save_population.isChecked()
         Settings.settings.enable_kill = self.enable_kill.isChecked()
         Settings.settings.SAVE_CONFIG = self.save_config.isChecked()
+        Settings.settings.SAVE_TRAJECTORY = self.save_trajectory.isChecked()
+        Settings.settings.checkpoint_every_n_generations = self.checkpoint_every_n_generations.value()
+        Settings.settings.save_compression = self.save_compression.currentText()
+        Settings.settings.instrumentation = self.instrumentation.isChecked()
+        Settings.settings.memory_report = self.memory_report.isChecked()
         Settings.settings.food_added_energy = self.food_added_energy.value()
         Settings.settings.energy_per_move = self.energy_per_move.value()
         Settings.settings.min_food_per_source = self.min_food.value()
@@ -0,0 +1,162 @@
+from collections import deque
+
+from PyQt6.QtCore import Qt, QRectF, QPointF
+from PyQt6.QtGui import QPainter, QColor, QPen, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+import config
+
+# colour of every phase on time chart, phases that are not listed get grey
+PHASE_COLORS = {
+    'live': QColor(20, 150, 150),
+    'sense': QColor(70, 130, 180),
+    'think': QColor(100, 180, 230),
+    'act': QColor(30, 80, 140),
+    'move': QColor(60, 170, 90),
+    'kill': QColor(200, 60, 60),
+    'pheromone': QColor(150, 90, 200),
+    'save': QColor(230, 160, 40),
+    'render': QColor(240, 110, 170)
+}
+OTHER_COLOR = QColor(170, 170, 170)
+STEPS_COLOR = QColor(40, 90, 200)
+SPECIMEN_STEPS_COLOR = QColor(230, 120, 30)
+RSS_COLOR = QColor(60, 150, 60)
+FRAME_COLOR = QColor(210, 210, 210)
+# height of chart title in pixels
+TITLE_HEIGHT = 14
+
+
+def _human(p_value: float) -> str:
+    """ short form of number, e.g. 12.3k """
+
+    for unit, size in (('G', 1e9), ('M', 1e6), ('k', 1e3)):
+        if abs(p_value) >= size:
+            return f'{p_value / size:.1f}{unit}'
+
+    return f'{p_value:.0f}'
+
+
+# charts of performance of generations of running simulation, made from perf data of progress events
+class PerformancePanel(QWidget):
+    def __init__(self, parent=None):
+        """ constructor """
+
+        super().__init__(parent)
+
+        # (generation, perf) of the latest generations
+        self._generations = deque(maxlen=config.PERFORMANCE_PANEL_GENERATIONS)
+
+        self.setFixedHeight(config.PERFORMANCE_PANEL_HEIGHT)
+        self.setToolTip('Performance of simulated generations.')
+
+        return
+
+    def add_generation(self, p_generation: int, p_perf: dict) -> None:
+        """ adds performance of generation, the oldest one is dropped when there are too many """
+
+        self._generations.append((p_generation, p_perf))
+
+        # breakdown of the latest generation
+        lines = [f'Generation {p_generation + 1}: {p_perf["time"]:.3f}s']
+        lines += [f'{phase}: {seconds:.3f}s' for phase, seconds in p_perf.get('phases', {}).items()]
+        lines.append(f'steps/s: {p_perf["steps_per_sec"]:.1f}')
+        if 'specimen_steps_per_sec' in p_perf:
+            lines.append(f'specimen steps/s: {p_perf["specimen_steps_per_sec"]:.1f}')
+        if 'rss' in p_perf:
+            lines.append(f'RSS: {p_perf["rss"] / 2 ** 20:.1f} MB')
+        self.setToolTip('\n'.join(lines))
+        self.update()
+
+        return
+
+    def clear(self) -> None:
+        """ removes every generation, e.g. when another simulation starts """
+
+        self._generations.clear()
+        self.setToolTip('Performance of simulated generations.')
+        self.update()
+
+        return
+
+    def _bar_width(self, p_rect: QRectF) -> float:
+        return p_rect.width() / max(self._generations.maxlen, 1)
+
+    def _draw_time(self, p_painter: QPainter, p_rect: QRectF) -> None:
+        """ time of generations as bars split into phases """
+
+        longest = max((perf["time"] for _, perf in self._generations), default=0.0)
+        last = self._generations[-1][1]["time"] if self._generations else 0.0
+        self._draw_title(p_painter, p_rect, f'Time/gen: {last:.2f}s (max {longest:.2f}s)')
+        if longest <= 0:
+            return
+
+        chart = p_rect.adjusted(0, TITLE_HEIGHT, 0, 0)
+        width = self._bar_width(chart)
+        for i, (_, perf) in enumerate(self._generations):
+            x = chart.left() + i * width
+            bottom = chart.bottom()
+            phases = dict(perf.get('phases', {}))
+            # time out of measured phases, e.g. selection and reproduction
+            phases['other'] = max(perf["time"] - sum(phases.values()), 0.0)
+            for phase, seconds in phases.items():
+                height = chart.height() * seconds / longest
+                p_painter.fillRect(QRectF(x, bottom - height, max(width - 1, 1), height),
+                                   PHASE_COLORS.get(phase, OTHER_COLOR))
+                bottom -= height
+
+        return
+
+    def _draw_lines(self, p_painter: QPainter, p_rect: QRectF, p_title: str, p_series: list) -> None:
+        """ every series (key in perf, colour) is drawn as line scaled to its own maximum """
+
+        self._draw_title(p_painter, p_rect, p_title)
+        chart = p_rect.adjusted(0, TITLE_HEIGHT, 0, 0)
+        width = self._bar_width(chart)
+        for key, color in p_series:
+            values = [perf.get(key, 0.0) for _, perf in self._generations]
+            highest = max(values, default=0.0)
+            if highest <= 0:
+                continue
+            points = [QPointF(chart.left() + (i + 0.5) * width, chart.bottom() - chart.height() * value / highest)
+                      for i, value in enumerate(values)]
+            p_painter.setPen(QPen(color, 1.5))
+            p_painter.drawPolyline(QPolygonF(points))
+
+        return
+
+    @staticmethod
+    def _draw_title(p_painter: QPainter, p_rect: QRectF, p_title: str) -> None:
+        """ title above chart and frame around it """
+
+        p_painter.setPen(Qt.GlobalColor.black)
+        p_painter.drawText(QRectF(p_rect.left(), p_rect.top(), p_rect.width(), TITLE_HEIGHT),
+                           Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, p_title)
+        p_painter.setPen(FRAME_COLOR)
+        p_painter.drawRect(p_rect.adjusted(0, TITLE_HEIGHT, -1, 0))
+
+        return
+
+    def paintEvent(self, event) -> None:
+        """ paints three charts: time split into phases, speed and memory """
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        font = painter.font()
+        font.setPixelSize(TITLE_HEIGHT - 3)
+        painter.setFont(font)
+        painter.fillRect(self.rect(), Qt.GlobalColor.white)
+
+        height = self.height() / 3
+        rects = [QRectF(0, i * height, self.width(), height - 4) for i in range(3)]
+        last = self._generations[-1][1] if self._generations else {}
+
+        self._draw_time(painter, rects[0])
+        self._draw_lines(painter, rects[1], f'Steps/s: {_human(last.get("steps_per_sec", 0))}, '
+                                            f'spec. {_human(last.get("specimen_steps_per_sec", 0))}',
+                         [('steps_per_sec', STEPS_COLOR), ('specimen_steps_per_sec', SPECIMEN_STEPS_COLOR)])
+        self._draw_lines(painter, rects[2], f'RSS: {last.get("rss", 0) / 2 ** 20:.1f} MB',
+                         [('rss', RSS_COLOR)])
+        painter.end()
+
+        return
@@ -1,16 +1,22 @@
 import math
 
-from PyQt6.QtWidgets import QFrame
+import numpy as np
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QImage, QPainter, QPen
+from PyQt6.QtWidgets import QWidget
 
 import config
 from src.gui.MarkType import MarkType
-from src.gui.Square import Square
+from src.gui.PlaneTool import PlaneTool
 from src.saves.PlaneSave import PlaneSave
 from src.saves.Settings import Settings
 
+# colour of every mark type, indexed by its value: empty is lightblue, barrier is black, food is green
+MARK_COLORS = np.array([[173, 216, 230], [0, 0, 0], [0, 128, 0]], dtype=np.uint8)
 
-# interactive map
-class Plane(QFrame):
+
+# interactive map, marks are kept in array and painted as one picture
+class Plane(QWidget):
     def __init__(self, p_map_save: PlaneSave = None):
         """ constructor, takes optional parameter p_map_save which places default spaces on map """
 
@@ -19,68 +25,163 @@ class Plane(QFrame):
 
         self._dim = Settings.settings.dim if p_map_save is None else p_map_save.dim
 
-        # track marked spaces on map
-        self._grid: list[list[Square | None]] = [[None for j in range(self._dim)] for i in range(self._dim)]
+        # mark type value of every space on map, indexed [x, y]
+        self._marks = np.full((self._dim, self._dim), MarkType.EMPTY.value, dtype=np.uint8)
 
         # if new plane creator was opened to edit existing plane
         if p_map_save is not None:
-            # go through barriers:
-            for barrier in p_map_save.barrier_positions:
-                # place it on map
-                self._grid[barrier[0]][barrier[1]] = Square(self, barrier[0], barrier[1], MarkType.BARRIER, self._dim)
+            # place barriers and food on map
+            self._mark_positions(p_map_save.barrier_positions, MarkType.BARRIER)
+            self._mark_positions(p_map_save.food_positions, MarkType.FOOD)
 
-            # go through food:
-            for food in p_map_save.food_positions:
-                # place it on map
-                self._grid[food[0]][food[1]] = Square(self, food[0], food[1], MarkType.FOOD, self._dim)
+        # picture of map, one pixel per space, rows are y and columns are x
+        # QImage uses memory of pixels array, so marked slices are recoloured in place
+        self._pixels = np.ascontiguousarray(MARK_COLORS[self._marks.T])
+        self._image = QImage(self._pixels.data, self._dim, self._dim, 3 * self._dim, QImage.Format.Format_RGB888)
 
-        # remember currently placing mark type
+        # remember currently placing mark type, tool and brush size
         self._cur_mark = MarkType.BARRIER
+        self._tool = PlaneTool.BRUSH
+        self._brush_size = 1
+        # space where mouse button was pressed (rectangle) or which was marked last (brush), None when not drawing
+        self._anchor: tuple[int, int] | None = None
+        # space under cursor while rectangle is being drawn
+        self._cursor: tuple[int, int] | None = None
 
         # set map's size
         self.setFixedSize(config.MAP_DIM, config.MAP_DIM)
-        # set map's background color
-        self.setStyleSheet('background-color: lightblue')
+        # whole map is painted, there is no background to be drawn first
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
 
         return
 
-    def draw(self, p_x, p_y) -> None:
-        try:
-            # if position is in bounds of map
-            if 0 <= p_x < config.MAP_DIM and 0 <= p_y < config.MAP_DIM:
-                # calculate indexes of grid to be marked
-                x = math.floor(p_x / Settings.SPACE_DIM(self._dim))
-                y = math.floor(p_y / Settings.SPACE_DIM(self._dim))
+    def _mark_positions(self, p_positions: list, p_mark: MarkType) -> None:
+        """ marks every (x, y) position from list """
 
-                # mark grid
-                self._grid[x][y] = Square(self, x, y, self._cur_mark, self._dim)
-        except Exception as e:
-            print(e)
+        positions = np.asarray(p_positions, dtype=np.int64).reshape(-1, 2)
+        self._marks[positions[:, 0], positions[:, 1]] = p_mark.value
 
         return
 
-    def mouseReleaseEvent(self, e) -> None:
-        """ event is called every time mouse button is released """
+    def cell(self, p_x: float, p_y: float) -> tuple[int, int]:
+        """ space of map under given point of widget, points outside of map give the nearest space """
+
+        x = math.floor(p_x / Settings.SPACE_DIM(self._dim))
+        y = math.floor(p_y / Settings.SPACE_DIM(self._dim))
+
+        return min(max(x, 0), self._dim - 1), min(max(y, 0), self._dim - 1)
+
+    def fill(self, p_x0: int, p_y0: int, p_x1: int, p_y1: int) -> None:
+        """ marks rectangle of spaces with corners (p_x0, p_y0) and (p_x1, p_y1), both included """
+
+        # corners can be given in any order and can be outside of map
+        x0, x1 = max(min(p_x0, p_x1), 0), min(max(p_x0, p_x1) + 1, self._dim)
+        y0, y1 = max(min(p_y0, p_y1), 0), min(max(p_y0, p_y1) + 1, self._dim)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        self._marks[x0:x1, y0:y1] = self._cur_mark.value
+        # recolour only changed part of picture
+        self._pixels[y0:y1, x0:x1] = MARK_COLORS[self._cur_mark.value]
+
+        # repaint only changed part of widget
+        space = Settings.SPACE_DIM(self._dim)
+        self.update(QRect(math.floor(x0 * space), math.floor(y0 * space),
+                          math.ceil((x1 - x0) * space) + 1, math.ceil((y1 - y0) * space) + 1))
+
+        return
+
+    def brush(self, p_x: int, p_y: int) -> None:
+        """ marks square of brush size centered at given space """
 
-        # draw square based on cursor current position
-        self.draw(e.pos().x(), e.pos().y())
+        half = (self._brush_size - 1) // 2
+        self.fill(p_x - half, p_y - half, p_x - half + self._brush_size - 1, p_y - half + self._brush_size - 1)
+
+        return
+
+    def stroke(self, p_from: tuple[int, int], p_to: tuple[int, int]) -> None:
+        """ marks spaces with brush along line between two spaces, so fast mouse moves do not leave gaps """
+
+        steps = max(abs(p_to[0] - p_from[0]), abs(p_to[1] - p_from[1]))
+        # spaces closer than brush size to the previous one are already covered
+        count = steps // self._brush_size + 1
+        xs = np.rint(np.linspace(p_from[0], p_to[0], count + 1)).astype(int)
+        ys = np.rint(np.linspace(p_from[1], p_to[1], count + 1)).astype(int)
+        for x, y in zip(xs[1:], ys[1:]):
+            self.brush(int(x), int(y))
+
+        return
+
+    def mousePressEvent(self, e) -> None:
+        """ event is called every time mouse button is pressed """
+
+        self._anchor = self.cell(e.position().x(), e.position().y())
+        self._cursor = self._anchor
+        if self._tool == PlaneTool.BRUSH:
+            self.brush(*self._anchor)
+        else:
+            self.update()
 
         # use derived method
-        super().mouseReleaseEvent(e)
+        super().mousePressEvent(e)
 
         return
 
     def mouseMoveEvent(self, e) -> None:
         """ event is called every time mouse moves (while either mouse button is pressed down) """
 
-        # draw square based on cursor current position
-        self.draw(e.pos().x(), e.pos().y())
+        if self._anchor is not None:
+            cell = self.cell(e.position().x(), e.position().y())
+            if self._tool == PlaneTool.BRUSH:
+                # continue line from the previous space
+                self.stroke(self._anchor, cell)
+                self._anchor = cell
+            elif cell != self._cursor:
+                # show outline of rectangle to be marked
+                self._cursor = cell
+                self.update()
 
         # use derived method
         super().mouseMoveEvent(e)
 
         return
 
+    def mouseReleaseEvent(self, e) -> None:
+        """ event is called every time mouse button is released """
+
+        if self._anchor is not None:
+            cell = self.cell(e.position().x(), e.position().y())
+            if self._tool == PlaneTool.BRUSH:
+                self.stroke(self._anchor, cell)
+            else:
+                self.fill(*self._anchor, *cell)
+            self._anchor = None
+            self._cursor = None
+            self.update()
+
+        # use derived method
+        super().mouseReleaseEvent(e)
+
+        return
+
+    def paintEvent(self, event) -> None:
+        """ paints picture of map scaled to the whole widget and outline of rectangle being drawn """
+
+        painter = QPainter(self)
+        painter.drawImage(self.rect(), self._image)
+
+        if self._tool == PlaneTool.RECTANGLE and self._anchor is not None:
+            space = Settings.SPACE_DIM(self._dim)
+            x0, x1 = sorted((self._anchor[0], self._cursor[0]))
+            y0, y1 = sorted((self._anchor[1], self._cursor[1]))
+            painter.setPen(QPen(Qt.GlobalColor.red, 1, Qt.PenStyle.DashLine))
+            painter.drawRect(round(x0 * space), round(y0 * space),
+                             round((x1 - x0 + 1) * space) - 1, round((y1 - y0 + 1) * space) - 1)
+
+        painter.end()
+
+        return
+
     def set_cur_mark(self, cur_mark: MarkType) -> None:
         """ changes currently placing object type """
 
@@ -91,27 +192,28 @@ class Plane(QFrame):
 
         return
 
+    def set_tool(self, p_tool: PlaneTool) -> None:
+        """ changes tool used to mark spaces """
+
+        assert isinstance(p_tool, PlaneTool)
+
+        self._tool = p_tool
+
+        return
+
+    def set_brush_size(self, p_size: int) -> None:
+        """ changes side of square marked by brush """
+
+        self._brush_size = min(max(int(p_size), 1), self._dim)
+
+        return
+
     def get_marked_data(self) -> PlaneSave:
         """ returns positions of places of barriers and food sources """
 
-        # stores barriers positions
-        barrier_positions = []
-        # stores food positions
-        food_positions = []
-
-        # go through the grid
-        for x in range(self._dim):
-            for y in range(self._dim):
-                # if cell is not None, then it is marked space
-                if self._grid[x][y] is not None:
-                    # if its type is barrier
-                    if self._grid[x][y].mark_type == MarkType.BARRIER:
-                        # add to barriers positions list
-                        barrier_positions.append((x, y))
-                    # if its type is food
-                    elif self._grid[x][y].mark_type == MarkType.FOOD:
-                        # add to food positions list
-                        food_positions.append((x, y))
+        # np.argwhere gives positions ordered by x first and then y, same as going through grid row by row
+        barrier_positions = list(map(tuple, np.argwhere(self._marks == MarkType.BARRIER.value).tolist()))
+        food_positions = list(map(tuple, np.argwhere(self._marks == MarkType.FOOD.value).tolist()))
 
         res = PlaneSave(self._dim, barrier_positions, food_positions)
 
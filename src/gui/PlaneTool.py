@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+# enum for tools used to mark spaces on interactive map
+class PlaneTool(Enum):
+    BRUSH = 0
+    RECTANGLE = 1
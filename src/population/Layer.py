@@ -1,9 +1,10 @@
-from typing import Callable
-
-import networkx as nx
+from typing import Callable, TYPE_CHECKING
 
 from src.population.SensorActionEnums import NeuronType, ActionType, SensorType
 
+if TYPE_CHECKING:
+    import networkx as nx
+
 
 def execute_connections(inputs: dict[int, float], links: list[tuple[int, float]]) -> float:
     """
@@ -130,7 +131,7 @@ class Layer:
 
         return marked_backward
 
-    def _make_graph(self, graph: nx.MultiDiGraph, types: list[NeuronType], step: int):
+    def _make_graph(self, graph: 'nx.MultiDiGraph', types: list[NeuronType], step: int):
         for target, links in self._connections.items():
             target_name = get_node_name(target, types[step + 1])
             graph.add_node(target_name, n_type=types[step + 1].name)
@@ -268,6 +269,9 @@ class DirectConnections(__ActivationLayer):
         return used
 
     def to_graph(self):
+        # networkx is needed only for visualisation, so it is not loaded with every neural network
+        import networkx as nx
+
         types = [NeuronType.SENSOR, NeuronType.INNER, NeuronType.INNER, NeuronType.ACTION]
         graph = self._next_layer._make_graph(nx.MultiDiGraph(), types, 0)
 
@@ -1,5 +1,7 @@
+import time
 from math import tanh
 
+from src.external import instrumentation
 from src.population.Layer import Layer, LateralConnections, DirectConnections
 from src.population.Sensor import Sensor
 from src.population.SensorActionEnums import SensorType, ActionType, NeuronType
@@ -89,7 +91,21 @@ class NeuralNetwork:
         return
 
     def run(self) -> dict[ActionType, float]:
+        if not instrumentation.enabled:
+            return self.evaluate(self.sensors.sense())
+
+        # sensing is timed apart from evaluation of brain, and sensors are counted
+        lap = time.perf_counter()
         sensors_values = self.sensors.sense()
+        instrumentation.lap('sense', lap)
+        for sensor in sensors_values:
+            instrumentation.sensors[sensor] += 1
+
+        return self.evaluate(sensors_values)
+
+    def evaluate(self, sensors_values: dict) -> dict[ActionType, float]:
+        """ values of actions for given values of sensors """
+
         action_results = self.layers.run(sensors_values)
 
         return {ActionType(idx): value for idx, value in action_results.items()}
@@ -1,9 +1,8 @@
-import random
-
 from config import NEIGHBOURHOOD_RADIUS
 from src.external import grid
 from src.external import population
 from src.population.SensorActionEnums import SensorType
+from src.utils import Rng
 from src.utils.utils import squeeze
 from src.world.LocationTypes import Conversions, Direction
 
@@ -36,7 +35,7 @@ class Sensor:
     @staticmethod
     def _get_random():
         """get random value"""
-        return random.uniform(-1, 1)
+        return float(Rng.stream(Rng.BEHAVIOUR).uniform(-1, 1))
 
     def _get_loc_x(self):
         """get location x"""
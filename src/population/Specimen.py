@@ -1,12 +1,11 @@
-import random
+import time
 
 import config
-from src.external import move_queue, grid, kill_set
+from src.external import move_queue, grid, kill_set, instrumentation
 from src.population.NeuralNetwork import NeuralNetwork
 from src.population.SensorActionEnums import ActionType
 from src.saves.Settings import Settings
-from src.utils.Plot import visualize_neural_network
-from src.utils.utils import squeeze, response_curve, probability
+from src.utils.utils import squeeze, response_curve, probability, random_sign
 from src.world.LocationTypes import Direction, Conversions, Coord
 
 max_long_probe_dist = 32
@@ -85,6 +84,15 @@ class Specimen:
         if not self.alive:
             return
 
+        if instrumentation.enabled:
+            # the same, timed
+            lap = time.perf_counter()
+            actions = self.think()
+            lap = instrumentation.lap('think', lap)
+            self.act(actions)
+            instrumentation.lap('act', lap)
+            return
+
         actions = self.think()
         self.act(actions)
 
@@ -103,28 +111,34 @@ class Specimen:
         self._move(p_move)
 
     def _execute_actions(self, p_actions):
-        """Executes non-move actions"""
+        """Executes non-move actions, every action returns whether it took effect"""
         for key, value in p_actions.items():
             method_name = f"_{key.name.lower()}"
             method = getattr(self, method_name, None)
             if method:
-                method(value)
+                fired = method(value)
+                if fired and instrumentation.enabled:
+                    instrumentation.actions[key.value] += 1
 
     def _set_responsiveness(self, value):
         self.responsiveness = response_curve(value)
+        return True
 
     def _set_oscillator_period(self, value):
         if not self.oscillator:
-            return  # no osc sensor
+            return False  # no osc sensor
         period = squeeze(value)
 
         if 0.016 <= period:
             self.oscillator.set_frequency(1 / period)
+            return True
+        return False
 
     def _set_longprobe_dist(self, value):
         level = squeeze(value)
         level = 1 + level * max_long_probe_dist
         self.long_probe_dist = int(level)
+        return True
 
     def _emit_pheromone(self, value):
         emit_threshold = 0.1
@@ -132,12 +146,18 @@ class Specimen:
 
         if level > emit_threshold and probability(level) or config.FORCE_EMISSION_TEST:
             grid.pheromones.emit(self.location.x, self.location.y, self.last_movement_direction)
+            if instrumentation.enabled:
+                instrumentation.emissions += 1
+            return True
+        return False
 
     def _kill(self, value):
         kill_threshold = 0.5
 
         level = squeeze(value * self.responsiveness)
 
+        # kill takes effect when there is someone to be killed next to specimen
+        killed = False
         if level > kill_threshold and probability(level):
             for x in range(self.location.x - 1, self.location.x + 2):
                 for y in range(self.location.y - 1, self.location.y + 2):
@@ -146,6 +166,8 @@ class Specimen:
                     if grid.in_bounds_xy(x, y) and grid.is_occupied_at_xy(x, y):
                         specimen_idx = grid.at_xy(x, y)
                         kill_set.add(specimen_idx)
+                        killed = True
+        return killed
 
     def _move(self, p_move):
         """Accumulates movements from `p_move` into a path and queues the movement"""
@@ -163,6 +185,8 @@ class Specimen:
                 step = method(last_move_offset)
                 if isinstance(step, Coord):
                     path.append(step)
+                    if instrumentation.enabled:
+                        instrumentation.actions[key.value] += 1
 
         # if there are any steps
         if path:
@@ -171,11 +195,11 @@ class Specimen:
 
     @staticmethod
     def _move_x(_):
-        return Coord(random.choice([1, -1]), 0)
+        return Coord(random_sign(), 0)
 
     @staticmethod
     def _move_y(_):
-        return Coord(0, random.choice([1, -1]))
+        return Coord(0, random_sign())
 
     @staticmethod
     def _move_east(_):
@@ -214,6 +238,9 @@ class Specimen:
         return Conversions.direction_as_normalized_coord(Direction.random())
 
     def plot_brain_graph(self):
+        # plotting libraries are heavy, load them only when they are really used
+        from src.utils.Plot import visualize_neural_network
+
         visualize_neural_network(self.brain.layers.to_graph())
 
     def __str__(self):
@@ -27,6 +27,10 @@ class Settings:
     dim: int = config.DIM
 
     SAVE_ANIMATION: bool = config.SAVE_ANIMATION
+    animation_policy: str = config.ANIMATION_POLICY
+    animation_every_n_steps: int = config.ANIMATION_EVERY_N_STEPS
+    animation_every_n_generations: int = config.ANIMATION_EVERY_N_GENERATIONS
+    animation_min_changed_cells: int = config.ANIMATION_MIN_CHANGED_CELLS
     SAVE_EVOLUTION_STEP: bool = config.SAVE_EVOLUTION_STEP
     SAVE_GENERATION: bool = config.SAVE_GENERATION
 
@@ -34,6 +38,11 @@ class Settings:
     SAVE_POPULATION: bool = config.SAVE_POPULATION
 
     SAVE_CONFIG: bool = config.SAVE_CONFIG
+    SAVE_TRAJECTORY: bool = config.SAVE_TRAJECTORY
+    save_compression: str = config.SAVE_COMPRESSION
+    instrumentation: bool = config.INSTRUMENTATION
+    memory_report: bool = config.MEMORY_REPORT
+    checkpoint_every_n_generations: int = config.CHECKPOINT_EVERY_N_GENERATIONS
 
     min_food_per_source: int = config.FOOD_PER_SOURCE_MIN
     max_food_per_source: int = config.FOOD_PER_SOURCE_MAX
@@ -41,6 +50,8 @@ class Settings:
     food_added_energy: int = config.FOOD_ADDED_ENERGY
     energy_per_move: int = config.ENERGY_PER_ONE_UNIT_OF_MOVE
 
+    seed: int | None = config.SEED
+
     settings: ClassVar['Settings'] = None
 
     @property
@@ -0,0 +1,124 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.utils.Trajectory import TrajectoryReader, trajectory_path
+
+
+def animation_path(p_simulation_folder: str, p_generation: int) -> str:
+    return os.path.join(p_simulation_folder, 'animation', f'generation_{p_generation}.gif')
+
+
+def _fit(p_image: np.ndarray, p_max_size: int) -> np.ndarray:
+    """ scales picture down (without smoothing) so its longer side is at most p_max_size pixels """
+    from PIL import Image
+
+    height, width = p_image.shape[:2]
+    if p_max_size is None or max(height, width) <= p_max_size:
+        return np.ascontiguousarray(p_image)
+    scale = p_max_size / max(height, width)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    return np.asarray(Image.fromarray(p_image).resize(size, Image.Resampling.NEAREST))
+
+
+def decode_animation(p_path: str, p_max_size: int = None) -> list[np.ndarray]:
+    """ every frame of GIF animation as (H, W, 3) uint8 picture """
+    from PIL import Image, ImageSequence
+
+    with Image.open(p_path) as animation:
+        return [_fit(np.asarray(frame.convert('RGB')), p_max_size) for frame in ImageSequence.Iterator(animation)]
+
+
+def render_trajectory(p_path: str, p_max_size: int = None) -> list[np.ndarray]:
+    """ every step of trajectory file rendered as (H, W, 3) uint8 picture, cells are as big as p_max_size allows """
+    from src.utils.Plot import render_world
+
+    trajectory = TrajectoryReader(p_path)
+    cell_pixels = 10 if p_max_size is None else max(1, p_max_size // trajectory.dim)
+
+    return [render_world(trajectory.barriers, trajectory.food_positions, frame.food, frame.positions, frame.alive,
+                         trajectory.dim, trajectory.max_food, cell_pixels) for frame in trajectory.frames()]
+
+
+def load_generation_frames(p_simulation_folder: str, p_generation: int, p_max_size: int = None) \
+        -> list[np.ndarray] | None:
+    """
+    Frames of generation of simulation: decoded animation, or rendered trajectory when animation was not saved.
+    None if generation has neither of them (yet). Trajectory of generation being simulated gives steps made so far.
+    """
+
+    # animation is published under its final name only when it is complete
+    path = animation_path(p_simulation_folder, p_generation)
+    if os.path.exists(path):
+        return decode_animation(path, p_max_size)
+
+    path = trajectory_path(os.path.join(p_simulation_folder, 'trajectory'), p_generation)
+    if os.path.exists(path):
+        try:
+            frames = render_trajectory(path, p_max_size)
+        except ValueError:
+            # trajectory of generation that is still being simulated
+            return None
+        return frames if frames else None
+
+    return None
+
+
+class FrameCache:
+    """
+    Decoded frames of recently shown generations, the least recently used generations are dropped when frames
+    take more than p_max_bytes. The most recently added generation is always kept, however big it is.
+    Used by GUI thread and decoding thread at the same time.
+    """
+
+    def __init__(self, p_max_bytes: int):
+        self.max_bytes = p_max_bytes
+        self.bytes = 0
+        self._frames: OrderedDict[int, list[np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(p_frames: list[np.ndarray]) -> int:
+        return sum(frame.nbytes for frame in p_frames)
+
+    def get(self, p_generation: int) -> list[np.ndarray] | None:
+        with self._lock:
+            frames = self._frames.get(p_generation)
+            if frames is not None:
+                self._frames.move_to_end(p_generation)
+            return frames
+
+    def __contains__(self, p_generation: int) -> bool:
+        with self._lock:
+            return p_generation in self._frames
+
+    def put(self, p_generation: int, p_frames: list[np.ndarray]) -> None:
+        with self._lock:
+            if p_generation in self._frames:
+                self.bytes -= self._size(self._frames.pop(p_generation))
+            self._frames[p_generation] = p_frames
+            self.bytes += self._size(p_frames)
+            while self.bytes > self.max_bytes and len(self._frames) > 1:
+                _, dropped = self._frames.popitem(last=False)
+                self.bytes -= self._size(dropped)
+
+    def discard(self, p_generation: int) -> None:
+        """ drops frames of generation, e.g. when they were decoded before generation was complete """
+
+        with self._lock:
+            if p_generation in self._frames:
+                self.bytes -= self._size(self._frames.pop(p_generation))
+
+    def generations(self) -> list[int]:
+        """ cached generations, from the least to the most recently used """
+
+        with self._lock:
+            return list(self._frames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self.bytes = 0
@@ -0,0 +1,114 @@
+import atexit
+import gzip
+import json
+import lzma
+import os
+import time
+from typing import Iterator
+
+import config
+
+# compression of save files and extension added to file name for it
+COMPRESSIONS = {
+    'none': '',
+    'gzip': '.gz',
+    'lzma': '.xz'
+}
+RECORDS_EXTENSION = '.ndjson'
+
+
+def records_filename(p_name: str, p_compression: str = 'none') -> str:
+    """ file name of records saved under p_name, e.g. saved_STEP.ndjson.gz """
+
+    return f'{p_name}{RECORDS_EXTENSION}{COMPRESSIONS[p_compression]}'
+
+
+class BufferedWriter:
+    """
+    Appends records (dicts or already encoded json strings) to file kept open for the whole simulation,
+    one record per line (newline-delimited json). Records are collected in memory and written together when
+    p_max_bytes are buffered or p_max_seconds passed since last write, on flush() and on close().
+    With compression every written batch is separate gzip member / xz stream, so file is readable up to the last
+    written batch even if process dies, and its size after flush() is a valid offset to resume from.
+    """
+
+    def __init__(self, p_path: str, p_compression: str = 'none', p_max_bytes: int = config.SAVE_BUFFER_BYTES,
+                 p_max_seconds: float = config.SAVE_BUFFER_SECONDS, p_offset: int = None):
+        assert p_compression in COMPRESSIONS, f"Unknown compression: {p_compression}"
+        self.path = p_path
+        self.compression = p_compression
+        self.max_bytes = p_max_bytes
+        self.max_seconds = p_max_seconds
+        self._file = open(p_path, 'ab')
+        if p_offset is not None:
+            # records written after checkpoint simulation is resumed from are dropped
+            self._file.truncate(p_offset)
+            # position of file opened for appending is not moved by truncate
+            self._file.seek(0, os.SEEK_END)
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_write = time.monotonic()
+        self.writes = 0
+        # buffered records are written even if simulation ends with exception
+        atexit.register(self.close)
+
+    def write(self, p_record: dict | str) -> None:
+        line = (p_record if isinstance(p_record, str) else json.dumps(p_record)) + '\n'
+        self._buffer.append(line)
+        self._buffered_bytes += len(line)
+        if self._buffered_bytes >= self.max_bytes or time.monotonic() - self._last_write >= self.max_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        """ writes buffered records to file """
+
+        if self._buffer:
+            data = ''.join(self._buffer).encode('utf-8')
+            if self.compression == 'gzip':
+                data = gzip.compress(data)
+            elif self.compression == 'lzma':
+                data = lzma.compress(data)
+            self._file.write(data)
+            self._buffer = []
+            self._buffered_bytes = 0
+            self.writes += 1
+        self._file.flush()
+        self._last_write = time.monotonic()
+
+    def tell(self) -> int:
+        """ size of file with everything written so far """
+
+        self.flush()
+
+        return self._file.tell()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        atexit.unregister(self.close)
+
+    @property
+    def buffered_bytes(self) -> int:
+        """ bytes of records waiting in memory to be written """
+        return self._buffered_bytes
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+
+def read_records(p_path: str) -> Iterator[dict]:
+    """ reads records saved by BufferedWriter, compression is recognised by file extension """
+
+    if p_path.endswith(COMPRESSIONS['gzip']):
+        file = gzip.open(p_path, 'rt', encoding='utf-8')
+    elif p_path.endswith(COMPRESSIONS['lzma']):
+        file = lzma.open(p_path, 'rt', encoding='utf-8')
+    else:
+        file = open(p_path, 'r', encoding='utf-8')
+    with file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
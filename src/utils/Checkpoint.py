@@ -0,0 +1,129 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from src.external import grid, population
+from src.population.Specimen import Specimen
+from src.saves.Settings import Settings
+from src.utils import Rng
+from src.utils.PopulationArchive import genomes_to_matrix, matrix_to_genomes
+from src.world.LocationTypes import Coord, Direction, Compass
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_FILENAME = 'checkpoint.npz'
+
+
+def checkpoint_path(p_sim_folder_path: str) -> str:
+    return os.path.join(p_sim_folder_path, CHECKPOINT_FILENAME)
+
+
+def _number(p_value: float) -> int | float:
+    """ energies are ints when they come straight from settings, they are restored as such """
+
+    return int(p_value) if float(p_value).is_integer() else float(p_value)
+
+
+def write_checkpoint(p_path: str, p_generation: int, p_summary: dict, p_writer_offsets: dict) -> tuple[float, int]:
+    """
+    Saves everything needed to continue simulation from the beginning of p_generation: settings, world, population,
+    random streams, summary so far and sizes of save files. File is written under temporary name and then replaces
+    previous checkpoint, so there is always one complete checkpoint, even if process dies while writing.
+    :return: (seconds taken, size in bytes)
+    """
+
+    start = time.time()
+
+    specimens = population[1:]
+    meta = {
+        "version": CHECKPOINT_VERSION,
+        "generation": p_generation,
+        "settings": Settings.settings.__dict__,
+        "rng": Rng.get_state(),
+        "summary": p_summary,
+        "writer_offsets": p_writer_offsets
+    }
+    arrays = {
+        "meta": np.array(json.dumps(meta)),
+        # world
+        "grid": grid.data,
+        "barriers": np.array(grid.barriers, dtype=np.int16).reshape(-1, 2),
+        "food_positions": np.array(list(grid.food_data.keys()), dtype=np.int16).reshape(-1, 2),
+        "food_levels": np.array(list(grid.food_data.values()), dtype=np.int32),
+        "pheromones": grid.pheromones.grid,
+        # population
+        "genomes": genomes_to_matrix([specimen.genome for specimen in specimens]),
+        "locations": np.array([(specimen.location.x, specimen.location.y) for specimen in specimens], dtype=np.int16),
+        "birth_locations": np.array([(specimen.birth_location.x, specimen.birth_location.y) for specimen in specimens],
+                                    dtype=np.int16),
+        "energy": np.array([specimen.energy for specimen in specimens], dtype=np.float64),
+        "max_energy": np.array([specimen.max_energy for specimen in specimens], dtype=np.float64),
+        "alive": np.array([specimen.alive for specimen in specimens], dtype=bool),
+        "age": np.array([specimen.age for specimen in specimens], dtype=np.int32),
+        "direction": np.array([specimen.last_movement_direction.as_int() for specimen in specimens], dtype=np.int8),
+        "last_movement": np.array([(specimen.last_movement.x, specimen.last_movement.y) for specimen in specimens],
+                                  dtype=np.int16)
+    }
+
+    tmp_path = f'{p_path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        np.savez(file, **arrays)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, p_path)
+
+    return time.time() - start, os.path.getsize(p_path)
+
+
+def read_checkpoint_meta(p_path: str) -> dict:
+    """ reads only description of checkpoint (settings, generation, ...), without world and population """
+
+    with np.load(p_path) as data:
+        return json.loads(str(data["meta"]))
+
+
+def read_checkpoint(p_path: str) -> dict:
+    """ loads checkpoint file into dict of arrays, with "meta" decoded """
+
+    with np.load(p_path) as data:
+        checkpoint = {key: data[key] for key in data.files}
+    checkpoint["meta"] = json.loads(str(checkpoint["meta"]))
+
+    if checkpoint["meta"]["version"] != CHECKPOINT_VERSION:
+        raise ValueError(f'Unsupported checkpoint version: {checkpoint["meta"]["version"]}')
+
+    return checkpoint
+
+
+def restore_checkpoint(p_checkpoint: dict) -> None:
+    """ restores world, population and random streams saved in checkpoint, settings must be already restored """
+
+    grid.reload_size()
+    grid.data = p_checkpoint["grid"].copy()
+    grid.barriers = [tuple(barrier) for barrier in p_checkpoint["barriers"].tolist()]
+    grid.food_data = {tuple(position): level for position, level in
+                      zip(p_checkpoint["food_positions"].tolist(), p_checkpoint["food_levels"].tolist())}
+    grid.pheromones.grid = p_checkpoint["pheromones"].copy()
+
+    genomes = matrix_to_genomes(p_checkpoint["genomes"])
+    population.clear()
+    population.append(None)
+    for i in range(len(genomes)):
+        x, y = p_checkpoint["birth_locations"][i].tolist()
+        specimen = Specimen(i + 1, Coord(x, y), genomes[i])
+        x, y = p_checkpoint["locations"][i].tolist()
+        specimen.location = Coord(x, y)
+        specimen.energy = _number(p_checkpoint["energy"][i])
+        specimen.max_energy = _number(p_checkpoint["max_energy"][i])
+        specimen.alive = bool(p_checkpoint["alive"][i])
+        specimen.age = int(p_checkpoint["age"][i])
+        specimen.last_movement_direction = Direction(Compass(int(p_checkpoint["direction"][i])))
+        x, y = p_checkpoint["last_movement"][i].tolist()
+        specimen.last_movement = Coord(x, y)
+        population.append(specimen)
+
+    # creating specimens draws random numbers, so streams are restored last
+    Rng.set_state(p_checkpoint["meta"]["rng"])
+
+    return
@@ -0,0 +1,152 @@
+import queue
+import time
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import config
+from src.utils.Processes import new_queue
+
+
+@dataclass
+# compact description of world state at one step, cheap to send to render process
+class Frame:
+    generation: int
+    step: int
+    # (N, 2) x and y of every specimen
+    positions: np.ndarray
+    # (N,) whether specimen is alive
+    alive: np.ndarray
+    # (K,) food level of every food source, in order of food positions sent with generation
+    food: np.ndarray
+    # (dim, dim) pheromone field, only when it is drawn on animation
+    pheromones: np.ndarray = None
+    submitted_at: float = field(default_factory=time.time)
+
+
+# description of frame stored at the beginning of every slot
+SLOT_HEADER = np.dtype([
+    ('generation', '<i4'),
+    ('step', '<i4'),
+    ('food_count', '<i4'),
+    ('has_pheromones', '<i4'),
+    ('submitted_at', '<f8')
+])
+
+
+def _align(p_offset: int, p_alignment: int = 8) -> int:
+    return (p_offset + p_alignment - 1) // p_alignment * p_alignment
+
+
+class FrameRing:
+    """
+    Fixed number of frame slots in shared memory, used to pass frames from simulation to render processes.
+    Simulation takes free slot, copies frame's arrays into it and sends only slot index. Render process reads frame
+    straight from shared memory and gives slot back when frame is encoded. Taking a slot waits when all are in use.
+    Slots are sized for the whole simulation: population size, food sources (at most dim * dim) and pheromone field.
+    """
+
+    def __init__(self, p_population_size: int, p_dim: int, p_slots: int, p_pheromones: bool = False):
+        self.population_size = p_population_size
+        self.dim = p_dim
+        self.slots = p_slots
+        self.pheromones = p_pheromones
+
+        # layout of one slot
+        self._positions_offset = _align(SLOT_HEADER.itemsize)
+        self._alive_offset = _align(self._positions_offset + p_population_size * 2 * np.dtype(np.int16).itemsize)
+        self._food_offset = _align(self._alive_offset + p_population_size)
+        self._pheromones_offset = _align(self._food_offset + p_dim * p_dim * np.dtype(np.int16).itemsize)
+        end = self._pheromones_offset + (p_dim * p_dim * np.dtype(np.float32).itemsize if p_pheromones else 0)
+        self.slot_size = _align(end, 64)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slot_size * p_slots)
+        self._free = new_queue()
+        for slot in range(p_slots):
+            self._free.put(slot)
+
+        return
+
+    def __getstate__(self) -> dict:
+        # shared memory is attached by name in render process, it is owned (and unlinked) by simulation process
+        state = self.__dict__.copy()
+        state['_shm'] = self._shm.name
+        return state
+
+    def __setstate__(self, p_state: dict) -> None:
+        self.__dict__.update(p_state)
+        self._shm = shared_memory.SharedMemory(name=p_state['_shm'], track=False)
+
+        return
+
+    def _view(self, p_slot: int, p_offset: int, p_dtype, p_shape) -> np.ndarray:
+        return np.ndarray(p_shape, dtype=p_dtype, buffer=self._shm.buf, offset=p_slot * self.slot_size + p_offset)
+
+    def acquire(self, p_check=None) -> int:
+        """
+        Returns index of free slot, waits until one is released if all are in use.
+        While waiting p_check is called every RENDER_WAIT_SECONDS, it raises when no slot can be released anymore.
+        """
+
+        while True:
+            try:
+                return self._free.get(timeout=config.RENDER_WAIT_SECONDS)
+            except queue.Empty:
+                if p_check is not None:
+                    p_check()
+
+    def release(self, p_slot: int) -> None:
+        """ gives slot back, so it can be filled with next frame """
+
+        self._free.put(p_slot)
+
+        return
+
+    def write(self, p_slot: int, p_frame: Frame) -> None:
+        """ copies frame into slot """
+
+        pop_size = len(p_frame.positions)
+        food_count = len(p_frame.food)
+        assert pop_size == self.population_size
+        assert food_count <= self.dim * self.dim
+
+        header = self._view(p_slot, 0, SLOT_HEADER, ())
+        header['generation'] = p_frame.generation
+        header['step'] = p_frame.step
+        header['food_count'] = food_count
+        header['has_pheromones'] = self.pheromones and p_frame.pheromones is not None
+        header['submitted_at'] = p_frame.submitted_at
+
+        self._view(p_slot, self._positions_offset, np.int16, (pop_size, 2))[:] = p_frame.positions
+        self._view(p_slot, self._alive_offset, np.bool_, (pop_size,))[:] = p_frame.alive
+        self._view(p_slot, self._food_offset, np.int16, (food_count,))[:] = p_frame.food
+        if header['has_pheromones']:
+            self._view(p_slot, self._pheromones_offset, np.float32, (self.dim, self.dim))[:] = p_frame.pheromones
+
+        return
+
+    def read(self, p_slot: int) -> Frame:
+        """ returns frame stored in slot, its arrays are views of shared memory valid until slot is released """
+
+        header = self._view(p_slot, 0, SLOT_HEADER, ())
+        food_count = int(header['food_count'])
+
+        pheromones = None
+        if header['has_pheromones']:
+            pheromones = self._view(p_slot, self._pheromones_offset, np.float32, (self.dim, self.dim))
+
+        return Frame(int(header['generation']), int(header['step']),
+                     self._view(p_slot, self._positions_offset, np.int16, (self.population_size, 2)),
+                     self._view(p_slot, self._alive_offset, np.bool_, (self.population_size,)),
+                     self._view(p_slot, self._food_offset, np.int16, (food_count,)),
+                     pheromones, float(header['submitted_at']))
+
+    def close(self, p_unlink: bool = False) -> None:
+        """ detaches from shared memory, owner also removes it """
+
+        self._shm.close()
+        if p_unlink:
+            self._shm.unlink()
+
+        return
@@ -0,0 +1,168 @@
+import os
+
+import numpy as np
+
+from src.utils.PopulationArchive import genomes_to_matrix
+
+# every file of store starts with magic and version
+STORE_MAGIC = b'EVGEN\x00'
+STORE_VERSION = 1
+HEADER_SIZE = 8
+DATA_EXTENSION = '.bin'
+INDEX_EXTENSION = '.idx'
+
+# kinds of snapshots: whole generation and specimens selected for reproduction
+GENERATION = 0
+SELECTION = 1
+
+# one index entry per snapshot, data block of snapshot starts at offset in data file
+INDEX_DTYPE = np.dtype([
+    ('generation', '<u4'),
+    ('kind', 'u1'),
+    ('count', '<u4'),
+    ('genome_length', '<u4'),
+    ('offset', '<u8')
+])
+# flags of specimens, bit-packed in data block in this order
+FLAGS = ('alive', 'is_killer')
+
+
+def _header() -> bytes:
+    return STORE_MAGIC + STORE_VERSION.to_bytes(2, 'little')
+
+
+def _check_header(p_header: bytes, p_path: str) -> None:
+    if p_header[:len(STORE_MAGIC)] != STORE_MAGIC:
+        raise ValueError(f"Not a generation store file: {p_path}")
+    version = int.from_bytes(p_header[len(STORE_MAGIC):HEADER_SIZE], 'little')
+    if version != STORE_VERSION:
+        raise ValueError(f"Unsupported generation store version: {version}")
+
+
+def _block_layout(p_count: int, p_genome_length: int) -> list[tuple[str, np.dtype, tuple]]:
+    """ (name, dtype, shape) of arrays in data block of one snapshot, in order they are written """
+
+    return [
+        ('index', np.dtype('<u4'), (p_count,)),
+        ('genomes', np.dtype('<u4'), (p_count, p_genome_length)),
+        ('energy', np.dtype('<f4'), (p_count,)),
+        ('max_energy', np.dtype('<f4'), (p_count,)),
+        ('flags', np.dtype('u1'), (len(FLAGS), (p_count + 7) // 8))
+    ]
+
+
+def store_filenames(p_name: str) -> tuple[str, str]:
+    """ (data file name, index file name) of store saved under p_name """
+
+    return f'{p_name}{DATA_EXTENSION}', f'{p_name}{INDEX_EXTENSION}'
+
+
+class GenerationStore:
+    """
+    Appends snapshots of population (or its selected part) to one data file of columnar blocks:
+    specimen indexes, uint32 genome matrix, float32 energies and bit-packed flags.
+    Every block gets fixed-size entry in index file, so any snapshot can be read without going through others.
+    Both files are append-only, their sizes (offsets()) are valid state to resume simulation from.
+    """
+
+    def __init__(self, p_folder_path: str, p_name: str, p_offsets: dict = None):
+        self.data_filename, self.index_filename = store_filenames(p_name)
+        self._data = self._open(os.path.join(p_folder_path, self.data_filename), (p_offsets or {}).get(
+            self.data_filename))
+        self._index = self._open(os.path.join(p_folder_path, self.index_filename), (p_offsets or {}).get(
+            self.index_filename))
+        self.bytes_written = 0
+
+    @staticmethod
+    def _open(p_path: str, p_offset: int = None):
+        file = open(p_path, 'ab')
+        if p_offset is not None:
+            # snapshots appended after checkpoint simulation is resumed from are dropped
+            file.truncate(p_offset)
+            # position of file opened for appending is not moved by truncate
+            file.seek(0, os.SEEK_END)
+        if file.tell() == 0:
+            file.write(_header())
+
+        return file
+
+    def append(self, p_generation: int, p_kind: int, p_specimens: list) -> None:
+        """ appends snapshot of p_specimens (Specimen objects, None is skipped) """
+
+        specimens = [specimen for specimen in p_specimens if specimen]
+        genomes = genomes_to_matrix([specimen.genome for specimen in specimens])
+        genome_length = genomes.shape[1] if specimens else 0
+        columns = {
+            'index': np.array([specimen.index for specimen in specimens], dtype='<u4'),
+            'genomes': genomes.astype('<u4'),
+            'energy': np.array([specimen.energy for specimen in specimens], dtype='<f4'),
+            'max_energy': np.array([specimen.max_energy for specimen in specimens], dtype='<f4'),
+            'flags': np.packbits(np.array([[getattr(specimen, flag) for specimen in specimens] for flag in FLAGS],
+                                          dtype=bool).reshape(len(FLAGS), len(specimens)), axis=1)
+        }
+        # blocks start at multiples of 8 bytes, so columns can be viewed in place
+        padding = -self._data.tell() % 8
+        self._data.write(b'\x00' * padding)
+        offset = self._data.tell()
+        for name, dtype, shape in _block_layout(len(specimens), genome_length):
+            self._data.write(np.ascontiguousarray(columns[name], dtype=dtype).reshape(shape).tobytes())
+        entry = np.array([(p_generation, p_kind, len(specimens), genome_length, offset)], dtype=INDEX_DTYPE)
+        # index entry is written after data, so it never points past the end of data file
+        self._data.flush()
+        self._index.write(entry.tobytes())
+        self._index.flush()
+        self.bytes_written += self._data.tell() - offset + padding + INDEX_DTYPE.itemsize
+
+    def offsets(self) -> dict:
+        """ sizes of data and index file """
+
+        self._data.flush()
+        self._index.flush()
+
+        return {self.data_filename: self._data.tell(), self.index_filename: self._index.tell()}
+
+    def close(self) -> None:
+        self._data.close()
+        self._index.close()
+
+
+class GenerationReader:
+    """ reads snapshots saved by GenerationStore, data file is memory-mapped and columns are views into it """
+
+    def __init__(self, p_folder_path: str, p_name: str):
+        data_filename, index_filename = store_filenames(p_name)
+        data_path = os.path.join(p_folder_path, data_filename)
+        index_path = os.path.join(p_folder_path, index_filename)
+        with open(index_path, 'rb') as file:
+            _check_header(file.read(HEADER_SIZE), index_path)
+            self.index = np.fromfile(file, dtype=INDEX_DTYPE)
+        with open(data_path, 'rb') as file:
+            _check_header(file.read(HEADER_SIZE), data_path)
+        self._data = np.memmap(data_path, dtype=np.uint8, mode='r')
+
+    def generations(self, p_kind: int = GENERATION) -> list[int]:
+        return self.index['generation'][self.index['kind'] == p_kind].tolist()
+
+    def snapshot(self, p_generation: int, p_kind: int = GENERATION) -> dict:
+        """
+        Columns of snapshot: index, genomes, energy, max_energy, adaptation_value and one bool array per flag.
+        Snapshot saved last wins, if generation was saved more than once.
+        """
+
+        found = np.nonzero((self.index['generation'] == p_generation) & (self.index['kind'] == p_kind))[0]
+        if not found.size:
+            raise KeyError(f"No snapshot of generation {p_generation} (kind {p_kind})")
+        entry = self.index[found[-1]]
+        count = int(entry['count'])
+        position = int(entry['offset'])
+        snapshot = {'generation': p_generation}
+        for name, dtype, shape in _block_layout(count, int(entry['genome_length'])):
+            size = dtype.itemsize * int(np.prod(shape))
+            snapshot[name] = self._data[position:position + size].view(dtype).reshape(shape)
+            position += size
+        flags = np.unpackbits(snapshot.pop('flags'), axis=1, count=count).astype(bool)
+        for row, flag in enumerate(FLAGS):
+            snapshot[flag] = flags[row]
+        snapshot['adaptation_value'] = snapshot['energy'] * 0.25 + snapshot['max_energy'] * 0.75
+
+        return snapshot
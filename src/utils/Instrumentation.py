@@ -0,0 +1,97 @@
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+
+from src.population.SensorActionEnums import SensorType, ActionType
+
+# phases of simulation step, in order in which they happen
+# sense, think and act are parts of living of every specimen, live is the rest of living (ageing, energy, mutation),
+# think is evaluation of brain without sensing
+PHASES = ('live', 'sense', 'think', 'act', 'kill', 'move', 'pheromone', 'save', 'render')
+# phases measured inside of living
+SPECIMEN_PHASES = ('sense', 'think', 'act')
+
+
+def rss_bytes() -> int:
+    """ resident set size of this process, peak resident set size where current one cannot be read """
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is in kilobytes, on macOS in bytes
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Instrumentation:
+    """
+    Wall time spent in phases of simulation during one generation, measured with monotonic clock, and counters of
+    sensor evaluations, fired actions, blocked moves and pheromone emissions.
+    Phases are measured as laps: every lap ends when the next one starts, so there is one clock read per phase.
+    Living of every specimen is split into sensing, brain evaluation and actions.
+    When disabled, laps do not read clock and hot path only checks enabled flag.
+    """
+
+    def __init__(self, p_enabled: bool = False):
+        self.enabled = p_enabled
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        # evaluations of sensors and fired actions by their type value
+        self.sensors = defaultdict(int)
+        self.actions = defaultdict(int)
+        self.blocked_moves = 0
+        self.emissions = 0
+
+    def lap(self, p_phase: str, p_start: float) -> float:
+        """ adds time since p_start to phase, returns the current time, which starts the next lap """
+
+        if not self.enabled:
+            return p_start
+
+        now = time.perf_counter()
+        self.phases[p_phase] += now - p_start
+
+        return now
+
+    def counts(self) -> dict[str, int]:
+        """ counters named as metrics, e.g. sensor.LOC_X, action.MOVE_X, blocked_moves """
+
+        counts = {f'sensor.{SensorType(sensor).name}': count for sensor, count in sorted(self.sensors.items())}
+        counts.update({f'action.{ActionType(action).name}': count for action, count in sorted(self.actions.items())})
+        if self.enabled:
+            counts['blocked_moves'] = self.blocked_moves
+            counts['emissions'] = self.emissions
+
+        return counts
+
+    def end_generation(self) -> tuple[dict[str, float], dict[str, int]]:
+        """ seconds spent in every phase and counters since the previous generation ended, both are reset """
+
+        phases = {}
+        if self.enabled:
+            phases = self.phases
+            # phases of specimens were measured inside of living, sensing inside of thinking
+            phases['live'] = max(phases['live'] - phases['think'] - phases['act'], 0.0)
+            phases['think'] = max(phases['think'] - phases['sense'], 0.0)
+        counts = self.counts()
+
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.sensors.clear()
+        self.actions.clear()
+        self.blocked_moves = 0
+        self.emissions = 0
+
+        return phases, counts
+
+
+def generation_metrics(p_perf: dict, p_counts: dict[str, int]) -> dict[str, float]:
+    """ performance of generation as metrics of stats store: time.<phase>, count.<counter>, speed and memory """
+
+    metrics = {f'time.{phase}': seconds for phase, seconds in p_perf["phases"].items()}
+    metrics.update({f'count.{name}': count for name, count in p_counts.items()})
+    for key in ('time', 'steps_per_sec', 'specimen_steps_per_sec', 'rss'):
+        metrics[f'perf.{key}'] = p_perf[key]
+
+    return metrics
@@ -0,0 +1,148 @@
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.utils.FrameBuffer import Frame, _align
+
+# beginning of live frame buffer: sequence number (odd while frame is being written) and description of frame
+LIVE_HEADER = np.dtype([
+    ('sequence', '<u8'),
+    ('generation', '<i4'),
+    ('step', '<i4'),
+    ('barrier_count', '<i4'),
+    ('food_count', '<i4'),
+    ('published_at', '<f8')
+])
+# reader gives up after that many tries to read frame that is not being written at the same time
+READ_ATTEMPTS = 100
+
+
+class LiveFrame:
+    """
+    The latest world state in shared memory, written by simulation and read by GUI while simulation runs.
+    There is only one frame, writer overwrites it and never waits for readers. Sequence number in header works as
+    seqlock: it is odd while frame is written, reader copies frame and uses it only if sequence was even and did not
+    change in the meantime.
+    Simulation creates buffer (p_name None) and sends its description() to GUI, which attaches to it by name.
+    """
+
+    def __init__(self, p_population_size: int, p_dim: int, p_max_food: int = 0, p_name: str = None):
+        self.population_size = p_population_size
+        self.dim = p_dim
+        # food level of full food source, readers shade food on this scale
+        self.max_food = p_max_food
+
+        # layout of buffer, barriers and food sources are at most dim * dim
+        cells = p_dim * p_dim
+        self._positions_offset = _align(LIVE_HEADER.itemsize)
+        self._alive_offset = _align(self._positions_offset + p_population_size * 2 * np.dtype(np.int16).itemsize)
+        self._barriers_offset = _align(self._alive_offset + p_population_size)
+        self._food_positions_offset = _align(self._barriers_offset + cells * 2 * np.dtype(np.int16).itemsize)
+        self._food_offset = _align(self._food_positions_offset + cells * 2 * np.dtype(np.int16).itemsize)
+        size = self._food_offset + cells * np.dtype(np.int16).itemsize
+
+        self.owner = p_name is None
+        if self.owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            # attached buffer is owned (and removed) by simulation process
+            self._shm = shared_memory.SharedMemory(name=p_name, track=False)
+        self._header = np.ndarray((), dtype=LIVE_HEADER, buffer=self._shm.buf)
+        self._last_publish = 0.0
+
+        return
+
+    def description(self) -> dict:
+        """ everything needed to attach to buffer from another process """
+
+        return {"name": self._shm.name, "population_size": self.population_size, "dim": self.dim,
+                "max_food": self.max_food}
+
+    @staticmethod
+    def attach(p_description: dict) -> 'LiveFrame':
+        return LiveFrame(p_description["population_size"], p_description["dim"], p_description["max_food"],
+                         p_description["name"])
+
+    def _view(self, p_offset: int, p_dtype, p_shape) -> np.ndarray:
+        return np.ndarray(p_shape, dtype=p_dtype, buffer=self._shm.buf, offset=p_offset)
+
+    def _begin_write(self) -> None:
+        self._header['sequence'] += 1
+
+    def _end_write(self) -> None:
+        self._header['published_at'] = time.time()
+        self._header['sequence'] += 1
+
+    def begin_generation(self, p_barriers: list, p_food_positions: list) -> None:
+        """ writes world layout, which does not change during generation """
+
+        barriers = np.asarray(p_barriers, dtype=np.int16).reshape(-1, 2)
+        food_positions = np.asarray(p_food_positions, dtype=np.int16).reshape(-1, 2)
+        self._begin_write()
+        self._header['barrier_count'] = len(barriers)
+        self._header['food_count'] = len(food_positions)
+        self._view(self._barriers_offset, np.int16, barriers.shape)[:] = barriers
+        self._view(self._food_positions_offset, np.int16, food_positions.shape)[:] = food_positions
+        self._end_write()
+
+    def due(self, p_interval: float) -> bool:
+        """ whether at least p_interval seconds passed since frame was published, so simulation is not slowed down """
+
+        return time.monotonic() - self._last_publish >= p_interval
+
+    def publish(self, p_frame: Frame) -> None:
+        """ overwrites frame with the newer one """
+
+        assert len(p_frame.positions) == self.population_size
+        self._begin_write()
+        self._header['generation'] = p_frame.generation
+        self._header['step'] = p_frame.step
+        self._view(self._positions_offset, np.int16, (self.population_size, 2))[:] = p_frame.positions
+        self._view(self._alive_offset, np.bool_, (self.population_size,))[:] = p_frame.alive
+        food_count = min(len(p_frame.food), int(self._header['food_count']))
+        self._view(self._food_offset, np.int16, (food_count,))[:] = p_frame.food[:food_count]
+        self._end_write()
+        self._last_publish = time.monotonic()
+
+    @property
+    def sequence(self) -> int:
+        return int(self._header['sequence'])
+
+    def read(self) -> dict | None:
+        """
+        Copy of the latest frame: generation, step, sequence, barriers, food_positions, food_levels, positions, alive.
+        None if nothing was published yet or frame could not be read between writes.
+        """
+
+        for _ in range(READ_ATTEMPTS):
+            sequence = int(self._header['sequence'])
+            if sequence == 0:
+                return None
+            if sequence % 2:
+                continue
+            barrier_count = int(self._header['barrier_count'])
+            food_count = int(self._header['food_count'])
+            frame = {
+                "generation": int(self._header['generation']),
+                "step": int(self._header['step']),
+                "sequence": sequence,
+                "barriers": self._view(self._barriers_offset, np.int16, (barrier_count, 2)).copy(),
+                "food_positions": self._view(self._food_positions_offset, np.int16, (food_count, 2)).copy(),
+                "food_levels": self._view(self._food_offset, np.int16, (food_count,)).copy(),
+                "positions": self._view(self._positions_offset, np.int16, (self.population_size, 2)).copy(),
+                "alive": self._view(self._alive_offset, np.bool_, (self.population_size,)).copy()
+            }
+            if int(self._header['sequence']) == sequence:
+                return frame
+
+        return None
+
+    def close(self) -> None:
+        """ detaches from shared memory, owner also removes it """
+
+        # views of buffer have to be dropped before it can be closed
+        self._header = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
@@ -0,0 +1,271 @@
+import gc
+import json
+import logging
+import os
+import sys
+import tracemalloc
+from collections import deque, Counter
+from enum import Enum
+from types import ModuleType, FunctionType, BuiltinFunctionType, MethodType
+
+import config
+from src.utils.Instrumentation import rss_bytes
+
+# objects shared by every specimen, they are not counted in sizes of specimens
+_SHARED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, Enum, bool)
+# classes whose living instances are counted, more of them than specimens means previous populations are kept alive
+COUNTED_CLASSES = ('Specimen', 'NeuralNetwork', 'Sensor', 'Oscillator')
+# files in folder of simulation: record of every generation (one json per line) and growth flags of the whole run
+REPORT_FILENAME = 'memory_report.ndjson'
+SUMMARY_FILENAME = 'memory_summary.json'
+# memory allocated by these files (tracker itself and importing) is left out of report
+_IGNORED_FILES = frozenset((tracemalloc.__file__, __file__, '<frozen importlib._bootstrap>',
+                            '<frozen importlib._bootstrap_external>'))
+# parts of specimen, in order in which they are measured: every object is counted in the first part it is reached from
+COMPONENTS = ('oscillator', 'sensor', 'layers', 'brain', 'genome', 'specimen')
+
+
+def deep_size(p_object, p_seen: set[int], p_excluded: set[int] = frozenset()) -> int:
+    """
+    Bytes taken by object and everything it references (containers, attributes and slots of instances).
+    Objects in p_seen are not counted again, counted objects are added to it. Objects in p_excluded and objects
+    shared by every specimen (classes, functions, modules, enum members) are not followed.
+    """
+
+    size = 0
+    stack = [p_object]
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in p_seen or id(obj) in p_excluded or isinstance(obj, _SHARED_TYPES):
+            continue
+        p_seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif not isinstance(obj, (str, bytes, int, float)):
+            attributes = getattr(obj, '__dict__', None)
+            if attributes is not None:
+                # names of attributes are shared by every instance of class
+                p_seen.add(id(attributes))
+                size += sys.getsizeof(attributes)
+                stack.extend(attributes.values())
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, '__slots__', ()):
+                    stack.append(getattr(obj, slot, None))
+
+    return size
+
+
+def specimen_components(p_specimen) -> dict[str, int]:
+    """ estimated bytes of every part of specimen, see COMPONENTS """
+
+    brain = p_specimen.brain
+    parts = {
+        'oscillator': p_specimen.oscillator,
+        'sensor': brain.sensors,
+        'layers': brain.layers,
+        'brain': brain,
+        'genome': p_specimen.genome,
+        'specimen': p_specimen
+    }
+    roots = {id(part) for part in parts.values() if part is not None}
+    seen = set()
+
+    return {name: deep_size(part, seen, roots - {id(part)}) for name, part in parts.items()}
+
+
+def specimen_sizes(p_population: list, p_sample: int = config.MEMORY_REPORT_SAMPLE_SPECIMENS) -> dict[str, float]:
+    """
+    Average bytes of every part of specimen and of the whole specimen, measured on at most p_sample specimens
+    spread evenly over population (index 0 is empty).
+    """
+
+    specimens = [specimen for specimen in p_population[1:] if specimen is not None]
+    if not specimens:
+        return {}
+    sampled = specimens[::max(1, len(specimens) // max(p_sample, 1))][:max(p_sample, 1)]
+
+    totals = Counter()
+    for specimen in sampled:
+        totals.update(specimen_components(specimen))
+    sizes = {name: totals[name] / len(sampled) for name in COMPONENTS}
+    sizes['total'] = sum(sizes.values())
+    sizes['population'] = sizes['total'] * len(specimens)
+
+    return sizes
+
+
+def object_counts(p_classes: tuple[str, ...] = COUNTED_CLASSES) -> dict[str, int]:
+    """ living instances of classes with given names, garbage should be collected before """
+
+    counts = dict.fromkeys(p_classes, 0)
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in counts:
+            counts[name] += 1
+
+    return counts
+
+
+class MemoryTracker:
+    """
+    Memory of simulation at the end of every generation: RSS, memory traced by tracemalloc with its top allocations
+    and their growth since the previous generation, estimated bytes of specimen and its parts, living instances of
+    simulation classes and sizes given by simulation (e.g. queues of writers).
+    Value (RSS, traced memory, allocation site, ...) that grew in each of the last p_growth_generations generations,
+    by at least p_growth_bytes bytes together (by at least one for counts), is flagged as growing. Only allocation
+    sites that grew the most in generation (at most p_watched_sites of them) are watched.
+    Record of every generation is appended to REPORT_FILENAME as soon as it is measured, so it is available also if
+    simulation dies. Growth flags are written to SUMMARY_FILENAME when tracking finishes.
+    """
+
+    def __init__(self, p_folder_path: str, p_top: int = config.MEMORY_REPORT_TOP_ALLOCATIONS,
+                 p_growth_generations: int = config.MEMORY_GROWTH_GENERATIONS,
+                 p_growth_bytes: int = config.MEMORY_GROWTH_MIN_BYTES,
+                 p_watched_sites: int = config.MEMORY_GROWTH_WATCHED_SITES):
+        self.path = os.path.join(p_folder_path, REPORT_FILENAME)
+        self.summary_path = os.path.join(p_folder_path, SUMMARY_FILENAME)
+        self.top = p_top
+        self.growth_generations = max(p_growth_generations, 1)
+        self.growth_bytes = p_growth_bytes
+        self.watched_sites = p_watched_sites
+        self.generations = 0
+        self.peak_rss = 0
+        # flagged values by name: generation when they were flagged first, the latest one and their growth then
+        self.growing: dict[str, dict] = {}
+        # (generation, value) of the latest generations of every observed value
+        self._history: dict[str, deque] = {}
+        # (bytes, count) of every allocation site at the end of the previous generation
+        self._previous: dict[str, tuple[int, int]] = {}
+        # tracemalloc is stopped at the end only if tracker started it
+        self._started = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        self._previous = self._allocations()
+
+        return
+
+    def stop(self) -> None:
+        self._previous = {}
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+        return
+
+    @staticmethod
+    def _allocations() -> dict[str, tuple[int, int]]:
+        """
+        (bytes, count) of memory allocated at every site ('file:line') and not freed yet, from the biggest.
+        Statistics are filtered instead of traces of snapshot, as it is much faster.
+        """
+
+        allocations = {}
+        for stat in tracemalloc.take_snapshot().statistics('lineno'):
+            frame = stat.traceback[0]
+            if frame.filename not in _IGNORED_FILES:
+                allocations[f'{frame.filename}:{frame.lineno}'] = (stat.size, stat.count)
+
+        return allocations
+
+    def _observe(self, p_name: str, p_generation: int, p_value: float, p_min_growth: float) -> None:
+        """ adds value of generation to history of p_name, flags it if it keeps growing """
+
+        history = self._history.setdefault(p_name, deque(maxlen=self.growth_generations + 1))
+        history.append((p_generation, p_value))
+        if len(history) <= self.growth_generations:
+            return
+
+        values = [value for _, value in history]
+        growth = values[-1] - values[0]
+        if all(a < b for a, b in zip(values, values[1:])) and growth >= p_min_growth:
+            flag = self.growing.setdefault(p_name, {"first_generation": p_generation})
+            flag.update({"generation": p_generation, "since_generation": history[0][0], "growth": growth,
+                         "value": p_value})
+
+        return
+
+    def generation_finished(self, p_generation: int, p_population: list, p_sizes: dict[str, int] = None) -> dict:
+        """
+        Measures memory at the end of generation, updates growth flags and writes report.
+        :param p_sizes: other values worth watching, e.g. {"step_buffer_bytes": 100}
+        """
+
+        # specimens are in reference cycles (brain refers to its specimen), previous populations are freed only by
+        # garbage collector, so objects kept alive by mistake are told apart from garbage after collecting it
+        garbage = gc.collect()
+        allocations = self._allocations()
+        # growth of every site since the previous generation, from the biggest
+        growth = sorted(((location, size - self._previous.get(location, (0, 0))[0],
+                          count - self._previous.get(location, (0, 0))[1])
+                         for location, (size, count) in allocations.items()), key=lambda site: -site[1])
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        record = {
+            "generation": p_generation,
+            "rss": rss_bytes(),
+            "traced": traced,
+            "traced_peak": traced_peak,
+            "specimen_bytes": specimen_sizes(p_population),
+            "objects": object_counts(),
+            "garbage": garbage,
+            "sizes": dict(p_sizes or {}),
+            "top_allocations": [{"location": location, "bytes": size, "count": count}
+                                for location, (size, count) in list(allocations.items())[:self.top]],
+            "top_growth": [{"location": location, "bytes": size, "count": count}
+                           for location, size, count in growth[:self.top] if size > 0]
+        }
+        self._previous = allocations
+
+        self._observe('rss', p_generation, record["rss"], self.growth_bytes)
+        self._observe('traced', p_generation, traced, self.growth_bytes)
+        for name, count in record["objects"].items():
+            self._observe(f'objects.{name}', p_generation, count, 1)
+        for name, value in record["sizes"].items():
+            self._observe(f'sizes.{name}', p_generation, value, self.growth_bytes if name.endswith('bytes') else 1)
+        # allocation sites are watched by their growth, not size, as slow leak is rarely among the biggest. Site that
+        # did not grow can not be flagged in next generations before it grows again, so its history is dropped
+        watched = {f'allocation.{location}': allocations[location][0]
+                   for location, size, _ in growth[:self.watched_sites] if size > 0}
+        for name in [name for name in self._history if name.startswith('allocation.') and name not in watched]:
+            del self._history[name]
+        for name, size in watched.items():
+            self._observe(name, p_generation, size, self.growth_bytes)
+
+        self.generations += 1
+        self.peak_rss = max(self.peak_rss, record["rss"])
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+        return record
+
+    def summary(self) -> dict:
+        return {
+            "generations": self.generations,
+            "peak_rss": self.peak_rss,
+            "growth_generations": self.growth_generations,
+            "growth_min_bytes": self.growth_bytes,
+            "growing": self.growing
+        }
+
+    def write_summary(self) -> None:
+        with open(self.summary_path, 'w') as f:
+            json.dump(self.summary(), f, indent=1)
+
+        return
+
+    def log_growth(self) -> None:
+        """ warns about values flagged as growing """
+
+        for name, flag in self.growing.items():
+            logging.warning(f"Memory: {name} grew by {flag['growth']} in generations {flag['since_generation']}-"
+                            f"{flag['generation']} (first flagged in generation {flag['first_generation']}).")
+
+        return
@@ -1,30 +1,46 @@
 import os
+from typing import TYPE_CHECKING
 
-import imageio.v2 as imageio
-import matplotlib as mpl
-import matplotlib.colors as mcolors
-import matplotlib.pyplot as plt
-import networkx as nx
 import numpy as np
 
-import config
 from src.saves.Settings import Settings
 
+if TYPE_CHECKING:
+    import networkx as nx
+
+# matplotlib, networkx and imageio are imported inside functions that use them. Module is imported by every process
+# started by simulation, and most of them never plot anything, so they should not pay for loading those libraries
+
 type_to_color = {
     "SENSOR": "lightgreen",
     "INNER": "lightblue",
     "ACTION": "orange",
 }
 BARRIER_COLOR = 'black'
-SPECIMEN_COLOR = {
-    True: 'red',
-    False: "grey"
+
+# colors of world frames (RGB)
+BACKGROUND_RGB = (255, 255, 255)
+GRID_LINE_RGB = (190, 190, 190)
+BARRIER_RGB = (0, 0, 0)
+# alive specimens are red, dead are grey
+SPECIMEN_RGB = {
+    True: (255, 0, 0),
+    False: (128, 128, 128)
 }
-food_cmap = plt.cm.Greens
+PHEROMONE_RGB = (60, 100, 255)
+# opacity of pheromone overlay at the highest pheromone level
+PHEROMONE_OPACITY = 0.6
+# anchor colors of matplotlib 'Greens' colormap, evenly spaced on [0; 1]
+FOOD_CMAP_ANCHORS = np.array([
+    (247, 252, 245), (229, 245, 224), (199, 233, 192), (161, 217, 155), (116, 196, 118),
+    (65, 171, 93), (35, 139, 69), (0, 109, 44), (0, 68, 27)
+], dtype=np.float64)
 
 
+def visualize_neural_network(graph: 'nx.MultiDiGraph'):
+    import matplotlib.pyplot as plt
+    import networkx as nx
 
-def visualize_neural_network(graph: nx.MultiDiGraph):
     node_colors = [type_to_color.get(data['n_type']) for node, data in graph.nodes(data=True)]
     edge_labels = nx.get_edge_attributes(graph, 'weight')
     edge_colors = ["red" if data['weight'] >= 0 else "blue" for _, _, data in graph.edges(data=True)]
@@ -43,42 +59,103 @@ def visualize_neural_network(graph: nx.MultiDiGraph):
     plt.close()
 
 
-def plot_world(barriers, food_data, pop, save_path_name: str):
-    # 'cause is used in process, Settings object needs to be read again
-    Settings.read()
-    norm = mcolors.Normalize(vmin=0, vmax=Settings.settings.max_food_per_source)
-
-    fig, ax = plt.subplots(figsize=(10, 10))
-    ax.clear()
-    ax.set_xticks(np.arange(-0.5, Settings.settings.dim, 1))
-    ax.set_yticks(np.arange(-0.5, Settings.settings.dim, 1))
-    ax.set_xticklabels([])
-    ax.set_yticklabels([])
-    ax.grid(color='gray', linestyle='-', linewidth=0.5)
-    ax.set_xlim(-0.5, Settings.settings.dim - 0.5)
-    ax.set_ylim(-0.5, Settings.settings.dim - 0.5)
-    ax.margins(0)
-
-    for loc in barriers:
-        ax.add_patch(plt.Rectangle((loc[0] - 0.5, loc[1] - 0.5), 1, 1, color=BARRIER_COLOR))
-
-    for loc in food_data:
-        food_level = food_data.get(loc)
-        food_color = food_cmap(norm(food_level))
-        ax.add_patch(plt.Rectangle((loc[0] - 0.5, loc[1] - 0.5), 1, 1, color=food_color))
-
-    for specimen in pop[1:]:
-        ax.add_patch(plt.Circle((specimen.location.x, specimen.location.y), 0.5, color=SPECIMEN_COLOR.get(specimen.alive)))
-
-    plt.tight_layout()
-    plt.subplots_adjust(left=0.01, right=0.99, top=0.99, bottom=0.01)
-    plt.savefig(save_path_name)
-    plt.close()
+def food_colors(p_levels: np.ndarray, p_max_food: int) -> np.ndarray:
+    """ maps food levels to (K, 3) uint8 colors of food colormap, same as matplotlib 'Greens' normalized to max food """
+
+    values = np.clip(np.asarray(p_levels, dtype=np.float64) / max(p_max_food, 1), 0, 1)
+    anchors = np.linspace(0, 1, len(FOOD_CMAP_ANCHORS))
+    channels = [np.interp(values, anchors, FOOD_CMAP_ANCHORS[:, c]) for c in range(3)]
+
+    return np.rint(np.stack(channels, axis=-1)).astype(np.uint8)
+
+
+def _disk_mask(p_cell_pixels: int) -> np.ndarray:
+    """ mask of circle inscribed in square cell of given size in pixels """
+
+    centers = np.arange(p_cell_pixels) + 0.5 - p_cell_pixels / 2
+    return centers[:, None] ** 2 + centers[None, :] ** 2 <= (p_cell_pixels / 2) ** 2
+
+
+def render_world(barriers, food_positions, food_levels, positions, alive, dim: int, max_food: int,
+                 cell_pixels: int = 10, pheromones: np.ndarray = None) -> np.ndarray:
+    """
+    Paints world state straight into RGB picture, without matplotlib.
+    Colors are the same as on plane plots: x grows to the right, y grows upwards.
+    :param barriers: barriers' (x, y) positions
+    :param food_positions: food sources' (x, y) positions
+    :param food_levels: food level of every food source
+    :param positions: (N, 2) specimens' (x, y) positions
+    :param alive: (N,) specimens' alive flags
+    :param dim: grid dimension
+    :param max_food: food level drawn with the darkest color
+    :param cell_pixels: size of one grid cell in pixels
+    :param pheromones: optional (dim, dim) pheromone field indexed [x, y], drawn as blue overlay
+    :return: (dim * cell_pixels, dim * cell_pixels, 3) uint8 array
+    """
+
+    # colors of cells, indexed [x, y]
+    cells = np.empty((dim, dim, 3), dtype=np.uint8)
+    cells[:] = BACKGROUND_RGB
+    barrier_cells = np.zeros((dim, dim), dtype=bool)
+
+    # food sources are painted over barriers
+    if len(barriers):
+        bars = np.asarray(barriers, dtype=np.intp).reshape(-1, 2)
+        cells[bars[:, 0], bars[:, 1]] = BARRIER_RGB
+        barrier_cells[bars[:, 0], bars[:, 1]] = True
+
+    if len(food_positions):
+        food = np.asarray(food_positions, dtype=np.intp).reshape(-1, 2)
+        cells[food[:, 0], food[:, 1]] = food_colors(food_levels, max_food)
+        barrier_cells[food[:, 0], food[:, 1]] = False
+
+    if pheromones is not None:
+        # overlay gets stronger with pheromone level, barriers are not covered
+        opacity = np.clip(pheromones[:dim, :dim] / max(float(pheromones.max()), 1e-9), 0, 1) * PHEROMONE_OPACITY
+        opacity[barrier_cells] = 0
+        opacity = opacity[..., None]
+        cells = np.rint(cells * (1 - opacity) + np.array(PHEROMONE_RGB) * opacity).astype(np.uint8)
+
+    # picture rows go from top (largest y) to bottom, columns are x
+    cells = cells.transpose(1, 0, 2)[::-1]
+
+    image = np.repeat(np.repeat(cells, cell_pixels, axis=0), cell_pixels, axis=1)
+    # view of the picture where [row, :, column, :] is the block of pixels of one cell
+    blocks = image.reshape(dim, cell_pixels, dim, cell_pixels, 3)
+
+    if cell_pixels >= 4:
+        # grid lines on top and left edge of every cell, like matplotlib grid they are drawn over cells
+        blocks[:, 0, :, :] = GRID_LINE_RGB
+        blocks[:, :, :, 0] = GRID_LINE_RGB
+
+    positions = np.asarray(positions, dtype=np.intp).reshape(-1, 2)
+    alive = np.asarray(alive, dtype=bool)
+    disk = _disk_mask(cell_pixels)[None, :, :, None]
+    # dead specimens first, so alive ones are always visible
+    for is_alive in (False, True):
+        selected = positions[alive == is_alive]
+        if len(selected):
+            rows = dim - 1 - selected[:, 1]
+            cols = selected[:, 0]
+            blocks[rows, :, cols, :] = np.where(disk, SPECIMEN_RGB[is_alive], blocks[rows, :, cols, :])
+
+    return image
+
+
+def plot_world(barriers, food_positions, food_levels, positions, alive, save_path_name: str, dim: int,
+               max_food: int, cell_pixels: int = 10, pheromones: np.ndarray = None):
+    """ draws world state (barriers, food sources with their levels and specimens) and saves it as picture """
+    import imageio.v2 as imageio
+
+    imageio.imwrite(save_path_name, render_world(barriers, food_positions, food_levels, positions, alive, dim, max_food,
+                                                 cell_pixels, pheromones))
 
     return
 
 
 def plot_plane(barriers, food_data, save_path_name: str):
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(10, 10))
     ax.clear()
     ax.set_xlim(-0.5, Settings.settings.dim - 0.5)
@@ -99,25 +176,10 @@ def plot_plane(barriers, food_data, save_path_name: str):
     return
 
 
-def to_gif(p_target_name: str, p_filenames: list[str]) -> None:
-    """ composes pictures of specified filenames into one animated .gif file """
-
-    assert isinstance(p_target_name, str)
-    assert isinstance(p_filenames, list)
-    for filename in p_filenames:
-        assert isinstance(filename, str)
-
-    with imageio.get_writer(f'{p_target_name}.gif', mode='I') as writer:
-        for filename in p_filenames:
-            image = imageio.imread(filename)
-            writer.append_data(image)
-            os.remove(filename)
-
-    return
-
-
 def make_simple_plot(p_matrix: np.array, p_folder_name: str, p_plot_name: str) -> str:
     """ creates color map of passed matrix and saves it in specified folder with specified name """
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
 
     assert isinstance(p_matrix, np.ndarray)
     assert isinstance(p_folder_name, str)
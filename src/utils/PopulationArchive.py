@@ -0,0 +1,109 @@
+import json
+import os
+import pickle
+import time
+import zipfile
+
+import numpy as np
+
+ARCHIVE_VERSION = 1
+ARCHIVE_EXTENSION = '.npz'
+
+
+def genomes_to_matrix(p_genomes: list[list[str]]) -> np.ndarray:
+    """
+    Genomes (lists of 8-digit hexadecimal genes) of equal length as (count, genome length) uint32 matrix.
+    All genes are decoded at once, so it stays fast for big populations.
+    """
+
+    if not p_genomes:
+        return np.zeros((0, 0), dtype=np.uint32)
+    length = len(p_genomes[0])
+    assert all(len(genome) == length for genome in p_genomes), "genomes of different lengths"
+    data = bytes.fromhex(''.join(gene for genome in p_genomes for gene in genome))
+
+    return np.frombuffer(data, dtype='>u4').astype(np.uint32).reshape(len(p_genomes), length)
+
+
+def matrix_to_genomes(p_matrix: np.ndarray) -> list[list[str]]:
+    """ reverse of genomes_to_matrix, every row is encoded back to list of 8-digit hexadecimal genes """
+
+    # whole matrix as one hexadecimal string, cut into 8-character genes by numpy
+    text = p_matrix.astype('>u4').tobytes().hex().encode('ascii')
+
+    return np.frombuffer(text, dtype='S8').astype('U8').reshape(p_matrix.shape).tolist()
+
+
+def write_population_archive(p_path: str, p_genomes: np.ndarray, p_energy: np.ndarray, p_max_energy: np.ndarray,
+                             p_meta: dict = None) -> int:
+    """
+    Saves population as uncompressed npz archive: genome matrix, energy and max energy arrays and json metadata.
+    File is written under temporary name and then replaces previous one.
+    :return: size of archive in bytes
+    """
+
+    assert p_genomes.ndim == 2 and p_genomes.shape[0] == p_energy.shape[0] == p_max_energy.shape[0]
+    meta = {
+        "version": ARCHIVE_VERSION,
+        "population_size": int(p_genomes.shape[0]),
+        "genome_length": int(p_genomes.shape[1]),
+        "created": time.time()
+    }
+    meta.update(p_meta or {})
+
+    tmp_path = f'{p_path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        np.savez(file, meta=np.array(json.dumps(meta)), genomes=p_genomes.astype(np.uint32),
+                 energy=p_energy.astype(np.float64), max_energy=p_max_energy.astype(np.float64))
+    os.replace(tmp_path, p_path)
+
+    return os.path.getsize(p_path)
+
+
+def population_arrays(p_population: list) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ (genomes, energy, max energy) of population list, index 0 (None) is skipped """
+
+    specimens = [specimen for specimen in p_population if specimen]
+
+    return (genomes_to_matrix([specimen.genome for specimen in specimens]),
+            np.array([specimen.energy for specimen in specimens], dtype=np.float64),
+            np.array([specimen.max_energy for specimen in specimens], dtype=np.float64))
+
+
+def is_population_archive(p_path: str) -> bool:
+    """ npz archives are zip files, anything else is treated as legacy pickle """
+
+    return zipfile.is_zipfile(p_path)
+
+
+def read_population_archive(p_path: str) -> dict:
+    """ reads archive into dict with meta, genomes, energy and max_energy """
+
+    with np.load(p_path) as data:
+        meta = json.loads(data["meta"].item())
+        if meta.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported population archive version: {meta.get('version')}")
+        archive = {"meta": meta, "genomes": data["genomes"], "energy": data["energy"],
+                   "max_energy": data["max_energy"]}
+    assert archive["genomes"].shape == (meta["population_size"], meta["genome_length"])
+
+    return archive
+
+
+def convert_legacy_pickle(p_path: str, p_archive_path: str = None) -> str:
+    """
+    Converts pickled population list (None at index 0, then Specimen objects) into population archive.
+    Old saves hold the same list pickled several times, only the first one is read.
+    :return: path of written archive, by default next to pickle with npz extension
+    """
+
+    with open(p_path, "rb") as file:
+        pop = pickle.load(file)
+    assert isinstance(pop, list)
+    assert len(pop) > 1
+    assert pop[0] is None
+
+    archive_path = p_archive_path or os.path.splitext(p_path)[0] + ARCHIVE_EXTENSION
+    write_population_archive(archive_path, *population_arrays(pop), {"converted_from": os.path.basename(p_path)})
+
+    return archive_path
@@ -0,0 +1,74 @@
+import logging
+import multiprocessing
+import os
+import time
+from multiprocessing.context import BaseContext
+
+from src.saves.Settings import Settings
+from src.utils import Profiling
+
+# modules imported once by forkserver, every process forked from it starts with them already loaded
+PRELOAD_MODULES = ['src.evolution.Simulation', 'src.utils.Save', 'src.utils.Plot']
+# libraries used by render processes are preloaded only if animation is saved
+ANIMATION_PRELOAD_MODULES = ['imageio.v2']
+
+# context used to start every process of simulation, created with first use
+_context: BaseContext = None
+
+
+def get_context() -> BaseContext:
+    """
+    Returns multiprocessing context used to start processes.
+    It is forkserver with preloaded simulation modules on platforms that support it, spawn otherwise.
+    """
+    global _context
+
+    if _context is None:
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            _context = multiprocessing.get_context('forkserver')
+            preload = PRELOAD_MODULES.copy()
+            if Settings.settings is not None and Settings.settings.SAVE_ANIMATION:
+                preload += ANIMATION_PRELOAD_MODULES
+            _context.set_forkserver_preload(preload)
+        else:
+            _context = multiprocessing.get_context('spawn')
+        logging.debug(f"Processes are started with {_context.get_start_method()} method.")
+
+    return _context
+
+
+def _timed_target(p_target, p_launched_at: float, p_args: tuple, p_profiling: dict[str, str]):
+    """
+    runs in started process, logs time from launch to the moment target starts doing its work;
+    profiles target if profiling was requested in process that started it
+    """
+
+    logging.info(f"Process {p_target.__name__} started working {time.time() - p_launched_at:.4f}s after launch.")
+
+    # forkserver does not pass environment of parent on, so profiling variables are passed explicitly
+    os.environ.update(p_profiling)
+    if Profiling.mode() is not None:
+        return Profiling.run_profiled(p_target, p_args)
+
+    return p_target(*p_args)
+
+
+def start_process(p_target, p_args: tuple = ()) -> multiprocessing.Process:
+    """ starts process executing p_target(*p_args) and returns it """
+
+    p = get_context().Process(target=_timed_target, args=(p_target, time.time(), p_args, Profiling.environment()))
+    p.start()
+
+    return p
+
+
+def new_queue(p_maxsize: int = 0) -> multiprocessing.Queue:
+    """ returns queue that can be passed to processes started by start_process, bounded if p_maxsize > 0 """
+
+    return get_context().Queue(p_maxsize)
+
+
+def new_pipe() -> tuple:
+    """ returns (receiving, sending) ends of one-way pipe, sending end can be passed to processes started by start_process """
+
+    return get_context().Pipe(duplex=False)
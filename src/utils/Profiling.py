@@ -0,0 +1,183 @@
+import cProfile
+import logging
+import os
+import signal
+from collections import Counter
+
+# profiling modes: deterministic profiler or sampling profiler writing collapsed stacks (input of flame graphs)
+CPROFILE = 'cprofile'
+SAMPLE = 'sample'
+MODES = (CPROFILE, SAMPLE)
+# profiling is requested through environment, so processes started by simulation are profiled as well
+MODE_VARIABLE = 'EVOLUTION_PROFILE'
+FOLDER_VARIABLE = 'EVOLUTION_PROFILE_FOLDER'
+# seconds of CPU time between samples of sampling profiler
+SAMPLE_INTERVAL = 0.005
+
+# profiler of this process, None when it is not profiled
+_active: 'Profiler' = None
+
+
+def mode() -> str | None:
+    """ profiling mode requested for this process, None if it should not be profiled """
+
+    requested = os.environ.get(MODE_VARIABLE)
+
+    return requested if requested in MODES else None
+
+
+def environment() -> dict[str, str]:
+    """ profiling variables of this process, to be passed on to processes it starts """
+
+    return {name: os.environ[name] for name in (MODE_VARIABLE, FOLDER_VARIABLE) if name in os.environ}
+
+
+def profile_folder(p_folder: str = None) -> str:
+    """ folder where profiles are written (p_folder if it is given), created if it does not exist """
+    import config
+
+    folder = p_folder or os.environ.get(FOLDER_VARIABLE) or os.path.join(config.SIMULATION_SAVES_FOLDER_PATH,
+                                                                         'profile')
+    os.makedirs(folder, exist_ok=True)
+
+    return folder
+
+
+class SamplingProfiler:
+    """
+    Every SAMPLE_INTERVAL seconds of CPU time, SIGPROF interrupts process and stack of main thread is counted.
+    Stacks are written in collapsed format: frames from the outermost separated by ';' and number of samples.
+    Uses only standard library, works where SIGPROF exists (not on Windows).
+    """
+
+    def __init__(self, p_interval: float = SAMPLE_INTERVAL):
+        self.interval = p_interval
+        self.samples = Counter()
+        self._previous_handler = None
+
+    @staticmethod
+    def available() -> bool:
+        return hasattr(signal, 'SIGPROF') and hasattr(signal, 'setitimer')
+
+    def _sample(self, p_signal, p_frame) -> None:
+        stack = []
+        while p_frame is not None:
+            code = p_frame.f_code
+            stack.append(f'{os.path.basename(code.co_filename)}:{code.co_qualname}'.replace(' ', '_'))
+            p_frame = p_frame.f_back
+        self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+    def write(self, p_path: str) -> None:
+        with open(p_path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class Profiler:
+    """
+    Profiles one process in given mode. Results are written to profile folder as <name>_<pid>.pstats or
+    <name>_<pid>.collapsed. With cProfile, simulation also writes generation_<n>.pstats after every generation,
+    then process file holds only what happened outside of generations.
+    """
+
+    def __init__(self, p_mode: str, p_name: str):
+        assert p_mode in MODES
+        self.mode = p_mode
+        self.name = f'{p_name}_{os.getpid()}'
+        self._profile = cProfile.Profile() if p_mode == CPROFILE else None
+        self._sampler = SamplingProfiler() if p_mode == SAMPLE else None
+        self.running = False
+        # folder of simulation that is profiled, folder from environment is used while it is None
+        self.folder: str = None
+
+    def start(self) -> None:
+        if self._sampler is not None:
+            if not SamplingProfiler.available():
+                logging.warning("Sampling profiler needs SIGPROF, which this platform does not have.")
+                return
+            self._sampler.start()
+        else:
+            self._profile.enable()
+        self.running = True
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        if self._sampler is not None:
+            self._sampler.stop()
+        else:
+            self._profile.disable()
+        self.running = False
+
+    def generation_finished(self, p_generation: int) -> str | None:
+        """ with cProfile, writes profile of generation and starts profiling the next one from scratch """
+
+        if self._profile is None or not self.running:
+            return None
+
+        self._profile.disable()
+        path = os.path.join(profile_folder(self.folder), f'generation_{p_generation}.pstats')
+        self._profile.dump_stats(path)
+        self._profile.clear()
+        self._profile.enable()
+
+        return path
+
+    def write(self) -> str:
+        """ writes profile of process, returns its path """
+
+        if self._sampler is not None:
+            path = os.path.join(profile_folder(self.folder), f'{self.name}.collapsed')
+            self._sampler.write(path)
+        else:
+            path = os.path.join(profile_folder(self.folder), f'{self.name}.pstats')
+            self._profile.dump_stats(path)
+        logging.info(f"Profile of {self.name} written to {path}.")
+
+        return path
+
+
+def active() -> Profiler | None:
+    return _active
+
+
+def start(p_name: str) -> Profiler:
+    """ starts profiling this process in requested mode """
+    global _active
+
+    assert _active is None
+    _active = Profiler(mode(), p_name)
+    _active.start()
+
+    return _active
+
+
+def stop() -> str | None:
+    """ stops profiling this process and writes its profile, returns its path """
+    global _active
+
+    if _active is None:
+        return None
+    _active.stop()
+    path = _active.write()
+    _active = None
+
+    return path
+
+
+def run_profiled(p_target, p_args: tuple):
+    """ runs p_target(*p_args) profiled in requested mode, profile is written also if target fails """
+
+    start(p_target.__name__)
+    try:
+        return p_target(*p_args)
+    finally:
+        stop()
@@ -0,0 +1,78 @@
+import logging
+import time
+import traceback
+from multiprocessing.connection import Connection
+
+# kinds of progress events sent by simulation process
+STARTED = 'started'
+GENERATION_STARTED = 'generation_started'
+GENERATION_FINISHED = 'generation_finished'
+LIVE_VIEW = 'live_view'
+FINISHED = 'finished'
+ERROR = 'error'
+
+
+class ProgressReporter:
+    """
+    Sends progress events of simulation as (kind, data dict) tuples through sending end of pipe.
+    Without connection (simulation not started by GUI) events are dropped, so simulation can always report.
+    When receiving side goes away, reporting stops and simulation continues.
+    """
+
+    def __init__(self, p_connection: Connection = None):
+        self._connection = p_connection
+
+    @property
+    def enabled(self) -> bool:
+        return self._connection is not None
+
+    def send(self, p_kind: str, **p_data) -> None:
+        if self._connection is None:
+            return
+        try:
+            self._connection.send((p_kind, {"time": time.time(), **p_data}))
+        except (BrokenPipeError, EOFError, OSError):
+            logging.info("Progress receiver closed, progress is no longer reported.")
+            self._connection = None
+
+    def started(self, p_uid, p_first_generation: int, p_generations: int) -> None:
+        self.send(STARTED, uid=f'{p_uid}', first_generation=p_first_generation, generations=p_generations)
+
+    def generation_started(self, p_generation: int) -> None:
+        self.send(GENERATION_STARTED, generation=p_generation)
+
+    def generation_finished(self, p_generation: int, p_stats: dict, p_perf: dict) -> None:
+        self.send(GENERATION_FINISHED, generation=p_generation, stats=p_stats, perf=p_perf)
+
+    def live_view(self, p_description: dict) -> None:
+        """ shared memory buffer with the latest world state, GUI can attach to it """
+
+        self.send(LIVE_VIEW, **p_description)
+
+    def finished(self, p_summary: dict) -> None:
+        self.send(FINISHED, summary=p_summary)
+
+    def error(self, p_exception: BaseException) -> None:
+        self.send(ERROR, message=repr(p_exception),
+                  traceback=''.join(traceback.format_exception(p_exception)))
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def drain(p_connection: Connection) -> tuple[list[tuple[str, dict]], bool]:
+    """
+    Receives every event waiting in receiving end of pipe without blocking.
+    :return: (events, True if sending side is closed and no more events will come)
+    """
+
+    events = []
+    try:
+        while p_connection.poll():
+            events.append(p_connection.recv())
+    except (EOFError, OSError):
+        return events, True
+
+    return events, False
@@ -0,0 +1,278 @@
+import logging
+import os
+import queue
+import time
+
+import numpy as np
+
+import config
+from src.utils.FrameBuffer import Frame, FrameRing
+from src.utils.Processes import new_queue, start_process
+
+
+class AnimationSink:
+    """
+    Animation of one generation, written frame by frame as frames are rendered, without pictures on disk.
+    It is written under temporary name and moved to generation_{n}.gif when closed, so readers never see unfinished file.
+    """
+
+    def __init__(self, p_folder_path: str, p_generation: int):
+        self.path = os.path.join(p_folder_path, f'generation_{p_generation}.gif')
+        self._tmp_path = os.path.join(p_folder_path, f'generation_{p_generation}.tmp.gif')
+        self._writer = None
+        self.frames = 0
+        self.closed = False
+
+    def append(self, p_image: np.ndarray) -> None:
+        """ encodes (H, W, 3) uint8 picture as next frame of animation """
+        import imageio.v2 as imageio
+
+        assert not self.closed
+
+        if self._writer is None:
+            self._writer = imageio.get_writer(self._tmp_path, format='GIF', mode='I')
+        self._writer.append_data(p_image)
+        self.frames += 1
+
+        return
+
+    def close(self) -> None:
+        """ finishes animation and publishes it under its final name """
+
+        if self.closed:
+            return
+        self.closed = True
+
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._tmp_path, self.path)
+
+        return
+
+
+def render_worker(p_jobs, p_reports, p_ring: FrameRing, p_folder_path: str, p_dim: int, p_max_food: int) -> None:
+    """
+    Render process loop. Receives jobs from its own queue:
+     - ('begin', generation, barriers, food_positions) - new generation's animation starts
+     - ('frame', slot) - frame in slot of shared ring to be drawn, slot is released as soon as frame is encoded,
+       animation is closed early on frame where every specimen is dead
+     - ('end', generation) - all frames of generation were sent, animation is closed if it is still open
+     - None - no more jobs
+    After every generation reports (generation, frames count, mean latency, max latency, render time).
+    """
+    from src.utils.Plot import render_world
+
+    barriers = []
+    food_positions = []
+    sink = None
+    latencies = []
+    render_time = 0.0
+
+    while True:
+        job = p_jobs.get()
+        if job is None:
+            return
+
+        match job[0]:
+            case 'begin':
+                _, generation, barriers, food_positions = job
+                sink = AnimationSink(p_folder_path, generation)
+                latencies = []
+                render_time = 0.0
+            case 'frame':
+                slot = job[1]
+                if sink.closed:
+                    # animation already ended, nothing more can happen in this generation
+                    p_ring.release(slot)
+                    continue
+                start = time.time()
+                frame = p_ring.read(slot)
+                image = render_world(barriers, food_positions, frame.food, frame.positions, frame.alive, p_dim,
+                                     p_max_food, config.ANIMATION_PIXELS_PER_CELL, frame.pheromones)
+                all_dead = not frame.alive.any()
+                submitted_at = frame.submitted_at
+                # views of shared memory are dropped before slot is reused
+                del frame
+                p_ring.release(slot)
+                sink.append(image)
+                if all_dead:
+                    sink.close()
+                render_time += time.time() - start
+                # time from capturing frame in simulation to having it encoded
+                latencies.append(time.time() - submitted_at)
+            case 'end':
+                generation = job[1]
+                sink.close()
+                p_reports.put((generation, len(latencies), float(np.mean(latencies)) if latencies else 0.0,
+                               max(latencies, default=0.0), render_time))
+
+
+class RenderPool:
+    """
+    Fixed number of render processes, each with bounded queue of jobs.
+    All frames of one generation go to the same process, so they are drawn and composed in order.
+    Frames are passed through shared memory ring, queues carry only slot indexes.
+    When no slot is free simulation waits (backpressure), so rendering never starts more work than CPUs can handle.
+    """
+
+    def __init__(self, p_folder_path: str, p_dim: int, p_max_food: int, p_population_size: int, p_size: int = None,
+                 p_queue_size: int = None):
+        self.size = p_size or config.RENDER_PROCESSES or max(1, os.cpu_count() - 1)
+        self.queue_size = p_queue_size or config.RENDER_QUEUE_SIZE
+        self._folder_path = p_folder_path
+        self._dim = p_dim
+        self._max_food = p_max_food
+        self._population_size = p_population_size
+        self._jobs = [new_queue(self.queue_size) for _ in range(self.size)]
+        self._reports = new_queue()
+        self._processes = []
+        self._ring: FrameRing = None
+        # after close starts render processes finish one by one, only failed ones are errors then
+        self._closing = False
+
+        # statistics
+        self.frames_submitted = 0
+        self.generations_ended = 0
+        self.blocked_time = 0.0
+        self.max_queue_depth = 0
+        self.generations_done = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.render_time = 0.0
+
+        return
+
+    def start(self) -> None:
+        # every queued frame and one frame being drawn by every process has its slot
+        slots = config.FRAME_RING_SLOTS or self.size * (self.queue_size + 1)
+        self._ring = FrameRing(self._population_size, self._dim, slots, config.ANIMATION_PHEROMONES)
+        self._processes = [start_process(render_worker, (jobs, self._reports, self._ring, self._folder_path,
+                                                         self._dim, self._max_food)) for jobs in self._jobs]
+
+        return
+
+    def _check_processes(self) -> None:
+        """
+        Called while simulation waits for render processes. Raises when any of them died, as its slots and jobs would
+        never be released, other processes are stopped and shared memory removed first.
+        """
+
+        for p in self._processes:
+            if p.exitcode is None or (self._closing and p.exitcode == 0):
+                continue
+            for other in self._processes:
+                if other.is_alive():
+                    other.terminate()
+                other.join()
+            self._ring.close(True)
+            raise RuntimeError(f"Render process {p.name} (pid {p.pid}) exited with code {p.exitcode}, "
+                               f"animation can not be rendered.")
+
+        return
+
+    def _jobs_of(self, p_generation: int):
+        return self._jobs[p_generation % self.size]
+
+    def _put(self, p_jobs, p_job) -> None:
+        """ puts job into queue, waits if it is full (as long as render processes are running) """
+
+        try:
+            p_jobs.put_nowait(p_job)
+        except queue.Full:
+            start = time.time()
+            while True:
+                try:
+                    p_jobs.put(p_job, timeout=config.RENDER_WAIT_SECONDS)
+                    break
+                except queue.Full:
+                    self._check_processes()
+            self.blocked_time += time.time() - start
+
+        return
+
+    def begin_generation(self, p_generation: int, p_barriers: list, p_food_positions: list) -> None:
+        self._put(self._jobs_of(p_generation), ('begin', p_generation, p_barriers, p_food_positions))
+
+        return
+
+    def submit(self, p_frame: Frame) -> None:
+        start = time.time()
+        slot = self._ring.acquire(self._check_processes)
+        self.blocked_time += time.time() - start
+        self._ring.write(slot, p_frame)
+
+        jobs = self._jobs_of(p_frame.generation)
+        self._put(jobs, ('frame', slot))
+        self.frames_submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth(jobs))
+
+        return
+
+    def end_generation(self, p_generation: int) -> None:
+        self._put(self._jobs_of(p_generation), ('end', p_generation))
+        self.generations_ended += 1
+        self.collect_reports()
+
+        return
+
+    @staticmethod
+    def queue_depth(p_jobs) -> int:
+        try:
+            return p_jobs.qsize()
+        except NotImplementedError:
+            # not available on macOS
+            return 0
+
+    def jobs_waiting(self) -> int:
+        """ jobs waiting in queues of every render process """
+
+        return sum(self.queue_depth(jobs) for jobs in self._jobs)
+
+    def collect_reports(self, p_wait: bool = False) -> None:
+        """ reads reports of finished generations, if p_wait waits for all of them """
+
+        while self.generations_done < self.generations_ended:
+            try:
+                if p_wait:
+                    report = self._reports.get(timeout=config.RENDER_WAIT_SECONDS)
+                else:
+                    report = self._reports.get_nowait()
+            except queue.Empty:
+                if not p_wait:
+                    return
+                self._check_processes()
+                continue
+            generation, frames, latency_mean, latency_max, render_time = report
+            self.generations_done += 1
+            self.latency_sum += latency_mean * frames
+            self.latency_max = max(self.latency_max, latency_max)
+            self.render_time += render_time
+            logging.info(f"Gen {generation} rendered: {frames} frames, latency mean {latency_mean:.3f}s, "
+                         f"max {latency_max:.3f}s, render time {render_time:.3f}s.")
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames_submitted,
+            "max_queue_depth": self.max_queue_depth,
+            "blocked_time": self.blocked_time,
+            "latency_mean": self.latency_sum / self.frames_submitted if self.frames_submitted else 0.0,
+            "latency_max": self.latency_max,
+            "render_time": self.render_time
+        }
+
+    def close(self) -> dict:
+        """ waits for all jobs to be finished, returns statistics """
+
+        self._closing = True
+        for jobs in self._jobs:
+            self._put(jobs, None)
+        # reports are read before joining, so no render process waits for its report to be consumed
+        self.collect_reports(True)
+        for p in self._processes:
+            p.join()
+        self._ring.close(True)
+
+        stats = self.stats()
+        logging.info(f"Render pool: {stats}")
+
+        return stats
@@ -0,0 +1,118 @@
+import argparse
+import glob
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import config
+from src.utils.Processes import get_context
+from src.utils.Trajectory import TrajectoryReader, trajectory_path
+
+
+def parse_generations(p_spec: str, p_available: list[int]) -> list[int]:
+    """ turns '0,3-5,9' into list of generations, 'all' means every generation with trajectory """
+
+    if p_spec == 'all':
+        return p_available
+
+    generations = []
+    for part in p_spec.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            generations += list(range(int(first), int(last) + 1))
+        else:
+            generations.append(int(part))
+
+    return [generation for generation in generations if generation in p_available]
+
+
+def available_generations(p_trajectory_folder: str) -> list[int]:
+    """ generations that have trajectory file in folder """
+
+    pattern = re.compile(r'generation_(\d+)\.traj$')
+    matches = (pattern.search(path) for path in glob.glob(os.path.join(p_trajectory_folder, '*.traj')))
+
+    return sorted(int(match.group(1)) for match in matches if match)
+
+
+def replay_generation(p_trajectory_folder: str, p_output_folder: str, p_generation: int, p_start: int = 0,
+                      p_stop: int = None, p_cell_pixels: int = None, p_zoom: tuple = None) -> tuple:
+    """
+    Renders animation of one generation from its trajectory file.
+    :param p_zoom: optional (x0, y0, x1, y1) cells range (inclusive) to show, whole world otherwise
+    :return: (generation, frames, seconds)
+    """
+    from src.utils.Plot import render_world
+    from src.utils.Render import AnimationSink
+
+    start = time.time()
+    cell_pixels = p_cell_pixels or config.ANIMATION_PIXELS_PER_CELL
+    trajectory = TrajectoryReader(trajectory_path(p_trajectory_folder, p_generation))
+    dim = trajectory.dim
+
+    sink = AnimationSink(p_output_folder, p_generation)
+    for frame in trajectory.frames(p_start, p_stop):
+        image = render_world(trajectory.barriers, trajectory.food_positions, frame.food, frame.positions, frame.alive,
+                             dim, trajectory.max_food, cell_pixels)
+        if p_zoom is not None:
+            x0, y0, x1, y1 = p_zoom
+            # picture rows start from the top of the world
+            image = image[(dim - 1 - y1) * cell_pixels:(dim - y0) * cell_pixels,
+                          x0 * cell_pixels:(x1 + 1) * cell_pixels]
+        sink.append(image)
+    sink.close()
+
+    return p_generation, sink.frames, time.time() - start
+
+
+def replay(p_simulation_folder: str, p_generations: str = 'all', p_start: int = 0, p_stop: int = None,
+           p_cell_pixels: int = None, p_zoom: tuple = None, p_output_folder: str = None,
+           p_processes: int = None) -> str:
+    """
+    Renders animations of chosen generations of finished simulation, in parallel.
+    :return: folder with rendered animations
+    """
+
+    trajectory_folder = os.path.join(p_simulation_folder, 'trajectory')
+    generations = parse_generations(p_generations, available_generations(trajectory_folder))
+    output_folder = p_output_folder or os.path.join(p_simulation_folder, 'replay')
+    os.makedirs(output_folder, exist_ok=True)
+
+    processes = p_processes or os.cpu_count()
+    logging.info(f"Replaying {len(generations)} generations on {processes} processes.")
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=get_context()) as pool:
+        futures = [pool.submit(replay_generation, trajectory_folder, output_folder, generation, p_start, p_stop,
+                               p_cell_pixels, p_zoom) for generation in generations]
+        for future in as_completed(futures):
+            generation, frames, seconds = future.result()
+            logging.info(f"Gen {generation} replayed: {frames} frames in {seconds:.3f}s.")
+
+    return output_folder
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog='python -m src.utils.Replay',
+                                     description='Renders animations from trajectory saved by simulation.')
+    parser.add_argument('simulation', help='folder of simulation')
+    parser.add_argument('--generations', default='all', help="generations to render, e.g. '0,3-5' (default: all)")
+    parser.add_argument('--start', type=int, default=0, help='first step to render')
+    parser.add_argument('--stop', type=int, help='step to stop rendering at (exclusive)')
+    parser.add_argument('--pixels', type=int, help='size of one cell in pixels')
+    parser.add_argument('--zoom', type=int, nargs=4, metavar=('X0', 'Y0', 'X1', 'Y1'), help='cells range to show')
+    parser.add_argument('--output', help='folder for animations (default: replay folder of simulation)')
+    parser.add_argument('--processes', type=int, help='number of render processes (default: number of CPUs)')
+    args = parser.parse_args(argv[1:])
+
+    logging.basicConfig(level=logging.INFO)
+    print(replay(args.simulation, args.generations, args.start, args.stop, args.pixels,
+                 tuple(args.zoom) if args.zoom else None, args.output, args.processes))
+
+    return
+
+
+if __name__ == '__main__':
+    main(sys.argv)
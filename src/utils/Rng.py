@@ -0,0 +1,72 @@
+import numpy as np
+
+# independent random streams, one per part of simulation, so changing how one part draws numbers
+# does not change what the others get
+WORLD = 'world'
+GENOME = 'genome'
+PLACEMENT = 'placement'
+BEHAVIOUR = 'behaviour'
+MUTATION = 'mutation'
+REPRODUCTION = 'reproduction'
+# order matters, streams are spawned from seed in this order
+STREAMS = [WORLD, GENOME, PLACEMENT, BEHAVIOUR, MUTATION, REPRODUCTION]
+
+# seed of current simulation and its streams, created with first use if seed was not set
+_seed: int = None
+_streams: dict[str, np.random.Generator] = {}
+
+
+def seed(p_seed: int = None) -> int:
+    """ (re)creates every stream from seed, random seed is drawn if none is given; returns used seed """
+    global _seed, _streams
+
+    if p_seed is None:
+        # 63 bits, so seed fits into json number of every reader
+        p_seed = int(np.random.SeedSequence().entropy % (2 ** 63))
+
+    _seed = int(p_seed)
+    children = np.random.SeedSequence(_seed).spawn(len(STREAMS))
+    _streams = {name: np.random.Generator(np.random.PCG64(child)) for name, child in zip(STREAMS, children)}
+
+    return _seed
+
+
+def get_seed() -> int:
+    if _seed is None:
+        seed()
+
+    return _seed
+
+
+def stream(p_name: str) -> np.random.Generator:
+    """ returns random stream of given part of simulation """
+
+    if not _streams:
+        seed()
+
+    return _streams[p_name]
+
+
+def worker_seed(p_seed: int, p_worker: int) -> int:
+    """ seed of p_worker-th run started from p_seed, independent of seeds of other workers """
+
+    return int(np.random.SeedSequence(p_seed, spawn_key=(p_worker,)).generate_state(2, np.uint64)[0] % (2 ** 63))
+
+
+def get_state() -> dict:
+    """ seed and current state of every stream, json serializable """
+
+    return {
+        "seed": get_seed(),
+        "streams": {name: generator.bit_generator.state for name, generator in _streams.items()}
+    }
+
+
+def set_state(p_state: dict) -> None:
+    """ restores seed and streams saved by get_state """
+
+    seed(p_state["seed"])
+    for name, state in p_state["streams"].items():
+        _streams[name].bit_generator.state = state
+
+    return
@@ -0,0 +1,73 @@
+import numpy as np
+
+from src.saves.Settings import Settings
+from src.utils.FrameBuffer import Frame
+
+# names of frame sampling policies
+EVERY = 'every'
+NTH_STEP = 'nth_step'
+FIRST_LAST = 'first_last'
+ADAPTIVE = 'adaptive'
+POLICIES = [EVERY, NTH_STEP, FIRST_LAST, ADAPTIVE]
+
+
+def changed_cells(p_previous: Frame, p_current: Frame) -> int:
+    """ counts cells that look different on two frames of the same generation """
+
+    moved = np.any(p_previous.positions != p_current.positions, axis=1)
+    died = p_previous.alive != p_current.alive
+    # moved specimen changes two cells, the one it left and the one it entered
+    return 2 * int(np.count_nonzero(moved)) + int(np.count_nonzero(died & ~moved)) + int(
+        np.count_nonzero(p_previous.food != p_current.food))
+
+
+class FrameSampler:
+    """
+    Decides which generations are animated and which of their frames are kept.
+    First and last frame of animated generation are always kept, so animation starts and ends with real world state.
+    """
+
+    def __init__(self, p_settings: Settings):
+        if p_settings.animation_policy not in POLICIES:
+            raise ValueError(f'Unknown animation policy: {p_settings.animation_policy}')
+
+        self.policy = p_settings.animation_policy
+        self.every_n_steps = max(1, p_settings.animation_every_n_steps)
+        self.every_n_generations = max(1, p_settings.animation_every_n_generations)
+        self.min_changed_cells = p_settings.animation_min_changed_cells
+        self.number_of_generations = p_settings.number_of_generations
+        # last frame kept in current generation, used by adaptive policy
+        self._last_kept: Frame = None
+
+        return
+
+    def generation_sampled(self, p_generation: int) -> bool:
+        """ whether generation is animated, every Nth generation and the last one are """
+
+        self._last_kept = None
+
+        return p_generation % self.every_n_generations == 0 or p_generation == self.number_of_generations - 1
+
+    def step_sampled(self, p_step: int, p_last: bool) -> bool:
+        """ whether frame of step has to be captured at all, unsampled steps cost nothing """
+
+        if p_step == 0 or p_last:
+            return True
+
+        if self.policy == NTH_STEP:
+            return p_step % self.every_n_steps == 0
+        if self.policy == FIRST_LAST:
+            return False
+
+        return True
+
+    def keep(self, p_frame: Frame, p_last: bool) -> bool:
+        """ whether captured frame goes to animation, adaptive policy drops frames where too little changed """
+
+        if self.policy == ADAPTIVE and not p_last and self._last_kept is not None:
+            if changed_cells(self._last_kept, p_frame) < self.min_changed_cells:
+                return False
+
+        self._last_kept = p_frame
+
+        return True
@@ -1,17 +1,18 @@
 import json
 import logging
 import os
-import pickle
 import time
 from enum import Enum, auto
-from multiprocessing import Process, Queue
-
-import numpy as np
 
 import config
 from src.config_src import simulation_settings
 from src.external import population
 from src.saves.Settings import Settings
+from src.utils import Rng
+from src.utils.BufferedWriter import BufferedWriter, records_filename
+from src.utils.GenerationStore import GenerationStore, GENERATION, SELECTION
+from src.utils.PopulationArchive import population_arrays, write_population_archive
+from src.utils.Processes import start_process
 
 
 class SaveType(Enum):
@@ -34,60 +35,7 @@ class SaveType(Enum):
                 False
 
 
-def writer(dest_filename, data_queue, uid):
-    logging.debug(f"Process writer started for: {dest_filename}")
-    started = False
-
-    # path to saves for current simulation
-    sim_folder_path = os.path.join(config.SIMULATION_SAVES_FOLDER_PATH, f'{uid}')
-    # create saves directory for current simulation
-    if not os.path.exists(sim_folder_path):
-        os.mkdir(sim_folder_path)
-
-    filepath = os.path.join(sim_folder_path, dest_filename)
-
-    while True:
-        line = data_queue.get()
-        with open(filepath, "a") as file:
-            if line is None:
-                logging.debug("closing writer...")
-                file.write("]")
-                return
-            logging.debug(f"Process tries writing item: {line}")
-            if not started:
-                file.write("[" + line)
-                started = True
-            else:
-                file.write("," + line)
-
-
-def process_pop(gen, pop, selected, queue):
-    logging.debug("Process pop started")
-
-    if selected is not None:
-        pop = np.array(pop)[selected]
-    to_write = {
-        "gen": gen
-    }
-
-    for specimen in pop:
-        if specimen:
-            to_write[specimen.index] = {
-                "energy": specimen.energy,
-                "max_energy": specimen.max_energy,
-                "adaptation_value": specimen.energy * 0.25 + specimen.max_energy * 0.75,
-                "genome": specimen.genome,
-                "alive": specimen.alive,
-                "is_killer": specimen.is_killer
-            }
-
-    logging.debug(f"Process pop wrote: {to_write}")
-    queue.put(json.dumps(to_write))
-
-    return
-
-
-def pickle_pop(pop, filename, uid):
+def save_population_archive(genomes, energy, max_energy, filename, uid):
     logging.info("Process pop started")
 
     # path to saves for current simulation
@@ -97,18 +45,14 @@ def pickle_pop(pop, filename, uid):
         os.mkdir(sim_folder_path)
 
     filepath = os.path.join(sim_folder_path, filename)
-
-    with open(filepath, "wb") as file:
-        for specimen in pop:
-            if specimen:
-                pickle.dump(pop, file)
+    write_population_archive(filepath, genomes, energy, max_energy, {"uid": f'{uid}'})
 
     logging.debug(f"Process pop wrote.")
 
     return
 
 
-def write_json_config(config_dict, parameters, filename, uid):
+def write_json_config(config_dict, parameters, filename, uid, rng_state=None):
     logging.info("Process config started")
 
     # path to saves for current simulation
@@ -120,104 +64,115 @@ def write_json_config(config_dict, parameters, filename, uid):
     filepath = os.path.join(sim_folder_path, filename)
 
     with open(filepath, "w") as file:
-        file.write(json.dumps({"config": config_dict, "parameters": parameters}))
+        content = {"config": config_dict, "parameters": parameters}
+        if rng_state is not None:
+            # seed and state of random streams, simulation can be repeated with the same seed
+            content["rng"] = rng_state
+        file.write(json.dumps(content))
 
     logging.debug(f"Process config wrote.")
 
     return
 
 
-def save_stats(uid, gen: int, survived: int, selected: int, killers_count: int):
-    line_to_write = {
-        "survived": survived,
-        "selected": selected,
-        "killers count": killers_count
-    }
-    stats_folder_path = os.path.join(config.SIMULATION_SAVES_FOLDER_PATH, f'{uid}', 'stats')
-    # create saves directory for current simulation
-    if not os.path.exists(stats_folder_path):
-        os.mkdir(stats_folder_path)
-
-    filepath = os.path.join(stats_folder_path, f"gen_{gen}.json")
-
-    with open(filepath, "w") as file:
-        file.write(json.dumps(line_to_write))
-
-    return
+# name of store with snapshots of generations and selections
+SNAPSHOTS_NAME = "saved_SNAPSHOTS"
 
 
 class SavingHelper:
-    def __init__(self, simulation_uid):
-        self.queues = {member: Queue() for member in SaveType if member.is_enabled()}
-        self.writing_processes = dict()
-        self.writing_processes = {member: Process(target=writer, args=(
-            f"saved_{member.name}.json", self.queues.get(member), simulation_uid)) for member in
-                                  SaveType if member.is_enabled()}
+    def __init__(self, simulation_uid, writer_offsets: dict = None):
+        # steps, generations and selections are appended by simulation process itself
+        self.step_writer = None
+        self.snapshots = None
         self.processors = []
         self.uid = simulation_uid
+        self.compression = Settings.settings.save_compression
+        # sizes of save files at checkpoint, simulation is resumed from
+        self.writer_offsets = writer_offsets or {}
 
         return
 
+    def filename(self, member: SaveType) -> str:
+        return records_filename(f"saved_{member.name}", self.compression)
+
     def start_writers(self):
         logging.debug("Started writers")
 
-        for _, p in self.writing_processes.items():
-            p.start()
+        sim_folder_path = os.path.join(config.SIMULATION_SAVES_FOLDER_PATH, f'{self.uid}')
+        if not os.path.exists(sim_folder_path):
+            os.mkdir(sim_folder_path)
+        if SaveType.STEP.is_enabled():
+            filename = self.filename(SaveType.STEP)
+            self.step_writer = BufferedWriter(os.path.join(sim_folder_path, filename), self.compression,
+                                              p_offset=self.writer_offsets.get(filename))
+        if SaveType.GEN.is_enabled() or SaveType.SELECTION.is_enabled():
+            self.snapshots = GenerationStore(sim_folder_path, SNAPSHOTS_NAME, self.writer_offsets)
 
         return
 
+    def sync(self) -> dict:
+        """ waits until everything saved so far is written, returns sizes of save files """
+
+        for p in self.processors:
+            p.join()
+        self.processors = []
+        offsets = {}
+        if self.step_writer is not None:
+            offsets[self.filename(SaveType.STEP)] = self.step_writer.tell()
+        if self.snapshots is not None:
+            offsets.update(self.snapshots.offsets())
+
+        return offsets
+
     def close_writers(self):
         logging.debug("Started closing saver")
 
         start = time.time()
+        if self.step_writer is not None:
+            self.step_writer.close()
+        if self.snapshots is not None:
+            self.snapshots.close()
         for p in self.processors:
             p.join()
-        for _, q in self.queues.items():
-            q.put(None)
-        for _, p in self.writing_processes.items():
-            p.join()
 
         logging.debug(f"Closed writers, waited: {time.time() - start}s.")
 
         return
 
     def save_step(self, gen, step, dead_count):
-        line_to_write = {
+        self.step_writer.write({
             "gen": gen,
             "step": step,
             "dead count": dead_count
-        }
-        self.queues.get(SaveType.STEP).put(json.dumps(line_to_write))
+        })
 
         return
 
     def save_selection(self, gen, selected_idx):
-        p = Process(target=process_pop, args=(
-            gen, population.copy(), selected_idx, self.queues.get(SaveType.SELECTION)))
-        p.start()
-        self.processors.append(p)
+        self.snapshots.append(gen, SELECTION, [population[idx] for idx in selected_idx])
 
         return
 
     def save_gen(self, gen):
-        p = Process(target=process_pop, args=(gen, population.copy(), None, self.queues.get(SaveType.GEN)))
-        p.start()
-        self.processors.append(p)
+        self.snapshots.append(gen, GENERATION, population)
 
         return
 
     def save_pop(self):
-        p = Process(target=pickle_pop, args=(population.copy(), f"saved_{SaveType.POP.name}.pickle", self.uid))
-        p.start()
+        # only arrays are sent to process, not Specimen objects with their brains
+        p = start_process(save_population_archive, (*population_arrays(population), f"saved_{SaveType.POP.name}.npz",
+                                                    self.uid))
         self.processors.append(p)
 
         return
 
     def save_config(self):
         config_dict = {key: value for key, value in vars(simulation_settings).items() if not key.startswith('__')}
-        p = Process(target=write_json_config, args=(
-            config_dict.copy(), Settings.settings.__dict__.copy(), f"saved_{SaveType.CONFIG.name}.json", self.uid))
-        p.start()
+        parameters = Settings.settings.__dict__.copy()
+        # seed actually used, also when it was drawn at random
+        parameters["seed"] = Rng.get_seed()
+        p = start_process(write_json_config, (
+            config_dict.copy(), parameters, f"saved_{SaveType.CONFIG.name}.json", self.uid, Rng.get_state()))
         self.processors.append(p)
 
         return
@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import time
+
+import config
+
+STATS_FILENAME = 'stats.sqlite'
+# columns of per generation statistics, in order they are stored
+GENERATION_COLUMNS = ('survived', 'selected', 'killers_count')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS generations (
+    generation INTEGER PRIMARY KEY,
+    survived INTEGER NOT NULL,
+    selected INTEGER NOT NULL,
+    killers_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    generation INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (generation, name)
+);
+'''
+
+
+def stats_path(p_sim_folder_path: str) -> str:
+    return os.path.join(p_sim_folder_path, STATS_FILENAME)
+
+
+class StatsStore:
+    """
+    Statistics of every generation of one simulation in SQLite database in simulation folder.
+    Rows are committed together every p_commit_generations generations or p_commit_seconds seconds, database is in
+    WAL mode, so readers (GUI, analysis) see every commit without blocking simulation.
+    """
+
+    def __init__(self, p_sim_folder_path: str, p_commit_generations: int = config.STATS_COMMIT_EVERY_N_GENERATIONS,
+                 p_commit_seconds: float = config.STATS_COMMIT_SECONDS):
+        self.path = stats_path(p_sim_folder_path)
+        self.commit_generations = p_commit_generations
+        self.commit_seconds = p_commit_seconds
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        # WAL database stays consistent with NORMAL, only the last commits can be lost when system crashes
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(SCHEMA)
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self.commits = 0
+
+    def truncate(self, p_generation: int) -> None:
+        """ removes statistics of p_generation and later ones (written after checkpoint simulation is resumed from) """
+
+        self._connection.execute('DELETE FROM generations WHERE generation >= ?', (p_generation,))
+        self._connection.execute('DELETE FROM metrics WHERE generation >= ?', (p_generation,))
+        self.commit()
+
+    def add_generation(self, p_generation: int, p_survived: int, p_selected: int, p_killers_count: int) -> None:
+        self._connection.execute('INSERT OR REPLACE INTO generations VALUES (?, ?, ?, ?)',
+                                 (p_generation, p_survived, p_selected, p_killers_count))
+        self._pending += 1
+        if self._pending >= self.commit_generations or time.monotonic() - self._last_commit >= self.commit_seconds:
+            self.commit()
+
+    def add_metrics(self, p_generation: int, p_metrics: dict[str, float]) -> None:
+        """ named numeric values of generation, committed together with its statistics """
+
+        self._connection.executemany('INSERT OR REPLACE INTO metrics VALUES (?, ?, ?)',
+                                     [(p_generation, name, float(value)) for name, value in p_metrics.items()])
+
+    def commit(self) -> None:
+        self._connection.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self.commits += 1
+
+    def close(self) -> None:
+        self.commit()
+        self._connection.close()
+
+
+class StatsReader:
+    """ read-only queries of statistics saved by StatsStore, connection is kept open between queries """
+
+    def __init__(self, p_sim_folder_path: str):
+        path = stats_path(p_sim_folder_path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self._connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+
+    @staticmethod
+    def _as_dict(p_row: tuple) -> dict:
+        return {'generation': p_row[0], **dict(zip(GENERATION_COLUMNS, p_row[1:]))}
+
+    def generation(self, p_generation: int) -> dict | None:
+        """ statistics of one generation, None if it is not saved (yet) """
+
+        row = self._connection.execute('SELECT * FROM generations WHERE generation = ?', (p_generation,)).fetchone()
+
+        return self._as_dict(row) if row else None
+
+    def generations(self, p_start: int = 0, p_stop: int = None) -> list[dict]:
+        """ statistics of saved generations from p_start to p_stop (exclusive, None means all) """
+
+        rows = self._connection.execute(
+            'SELECT * FROM generations WHERE generation >= ? AND generation < ? ORDER BY generation',
+            (p_start, p_stop if p_stop is not None else 2 ** 62)).fetchall()
+
+        return [self._as_dict(row) for row in rows]
+
+    def last_generation(self) -> int | None:
+        return self._connection.execute('SELECT MAX(generation) FROM generations').fetchone()[0]
+
+    def metrics(self, p_name: str, p_start: int = 0, p_stop: int = None) -> list[tuple[int, float]]:
+        """ (generation, value) of metric p_name in generations from p_start to p_stop (exclusive) """
+
+        return self._connection.execute(
+            'SELECT generation, value FROM metrics WHERE name = ? AND generation >= ? AND generation < ? '
+            'ORDER BY generation', (p_name, p_start, p_stop if p_stop is not None else 2 ** 62)).fetchall()
+
+    def metric_names(self) -> list[str]:
+        return [row[0] for row in self._connection.execute('SELECT DISTINCT name FROM metrics ORDER BY name')]
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,166 @@
+import os
+
+import numpy as np
+
+from src.utils.FrameBuffer import Frame
+
+# first bytes of every trajectory file
+MAGIC = b'EVTRAJ'
+VERSION = 1
+
+# beginning of trajectory file, followed by barriers (B, 2), food positions (K, 2), start positions (N, 2) as int16
+# and by fixed size records of steps
+HEADER = np.dtype([
+    ('magic', 'S6'),
+    ('version', '<u2'),
+    ('generation', '<i4'),
+    ('population_size', '<i4'),
+    ('dim', '<i4'),
+    ('max_food', '<i4'),
+    ('capacity', '<i4'),
+    ('steps', '<i4'),
+    ('barriers', '<i4'),
+    ('food_sources', '<i4')
+])
+
+
+def record_dtype(p_population_size: int, p_food_sources: int) -> np.dtype:
+    """ one step: moves since previous step, alive flags packed into bits and food levels """
+
+    return np.dtype([
+        ('delta', 'i1', (p_population_size, 2)),
+        ('alive', 'u1', ((p_population_size + 7) // 8,)),
+        ('food', '<i2', (p_food_sources,))
+    ])
+
+
+def trajectory_path(p_folder_path: str, p_generation: int) -> str:
+    return os.path.join(p_folder_path, f'generation_{p_generation}.traj')
+
+
+class TrajectoryWriter:
+    """
+    Writes what happened in every step of generation to memory-mapped file, one file per generation.
+    Positions are stored as moves since previous step, so one step of N specimens takes 2N bytes plus alive bits
+    and food levels. From these files any generation can be rendered after simulation (see Replay).
+    """
+
+    def __init__(self, p_folder_path: str, p_population_size: int, p_dim: int, p_max_food: int,
+                 p_steps_per_generation: int):
+        self.folder_path = p_folder_path
+        self.population_size = p_population_size
+        self.dim = p_dim
+        self.max_food = p_max_food
+        # frame before first step and frame after every step
+        self.capacity = p_steps_per_generation + 1
+        self.bytes_written = 0
+
+        if not os.path.exists(p_folder_path):
+            os.mkdir(p_folder_path)
+
+        self._file: np.memmap = None
+        self._header = None
+        self._records = None
+        self._last_positions = None
+
+        return
+
+    def begin_generation(self, p_generation: int, p_barriers: list, p_food_positions: list,
+                         p_positions: np.ndarray) -> None:
+        """ creates file of generation, with world layout and positions before the first step """
+
+        barriers = np.asarray(p_barriers, dtype=np.int16).reshape(-1, 2)
+        food_positions = np.asarray(p_food_positions, dtype=np.int16).reshape(-1, 2)
+        layout_size = (len(barriers) + len(food_positions) + self.population_size) * 2 * 2
+        records = record_dtype(self.population_size, len(food_positions))
+        size = HEADER.itemsize + layout_size + records.itemsize * self.capacity
+
+        self._file = np.memmap(trajectory_path(self.folder_path, p_generation), dtype=np.uint8, mode='w+',
+                               shape=(size,))
+        self._header = self._file[:HEADER.itemsize].view(HEADER)
+        self._header[0] = (MAGIC, VERSION, p_generation, self.population_size, self.dim, self.max_food, self.capacity,
+                           0, len(barriers), len(food_positions))
+
+        layout = self._file[HEADER.itemsize:HEADER.itemsize + layout_size].view(np.int16).reshape(-1, 2)
+        layout[:len(barriers)] = barriers
+        layout[len(barriers):len(barriers) + len(food_positions)] = food_positions
+        layout[len(barriers) + len(food_positions):] = p_positions
+        self._last_positions = np.asarray(p_positions, dtype=np.int16).copy()
+
+        self._records = self._file[HEADER.itemsize + layout_size:].view(records)
+
+        return
+
+    def record(self, p_frame: Frame) -> None:
+        """ appends state after step, frame of step 0 is the state before the first step """
+
+        steps = int(self._header['steps'][0])
+        assert steps < self.capacity
+
+        delta = p_frame.positions - self._last_positions
+        # specimen moves at most few cells per step
+        assert np.all(np.abs(delta) <= np.iinfo(np.int8).max)
+
+        record = self._records[steps]
+        record['delta'] = delta
+        record['alive'] = np.packbits(p_frame.alive)
+        record['food'] = p_frame.food
+        self._last_positions[:] = p_frame.positions
+        self._header['steps'] = steps + 1
+
+        return
+
+    def end_generation(self) -> None:
+        """ flushes generation's file to disk """
+
+        self.bytes_written += self._file.size
+        self._file.flush()
+        self._file = None
+        self._header = None
+        self._records = None
+
+        return
+
+
+class TrajectoryReader:
+    """ reads trajectory file of one generation """
+
+    def __init__(self, p_path: str):
+        self._file = np.memmap(p_path, dtype=np.uint8, mode='r')
+        header = self._file[:HEADER.itemsize].view(HEADER)[0]
+        if header['magic'] != MAGIC or header['version'] != VERSION:
+            raise ValueError(f'{p_path} is not a trajectory file')
+
+        self.generation = int(header['generation'])
+        self.population_size = int(header['population_size'])
+        self.dim = int(header['dim'])
+        self.max_food = int(header['max_food'])
+        self.steps = int(header['steps'])
+
+        barriers_count = int(header['barriers'])
+        food_count = int(header['food_sources'])
+        layout_size = (barriers_count + food_count + self.population_size) * 2 * 2
+        layout = self._file[HEADER.itemsize:HEADER.itemsize + layout_size].view(np.int16).reshape(-1, 2)
+        self.barriers = layout[:barriers_count]
+        self.food_positions = layout[barriers_count:barriers_count + food_count]
+        self.start_positions = layout[barriers_count + food_count:]
+
+        self._records = self._file[HEADER.itemsize + layout_size:].view(
+            record_dtype(self.population_size, food_count))[:self.steps]
+
+        return
+
+    def frames(self, p_start: int = 0, p_stop: int = None):
+        """ yields frames of steps from p_start (inclusive) to p_stop (exclusive) """
+
+        p_stop = self.steps if p_stop is None else min(p_stop, self.steps)
+        if p_start >= p_stop:
+            return
+
+        # positions of all requested steps at once, moves are summed up from the start of generation
+        deltas = self._records['delta'][:p_stop].astype(np.int16)
+        positions = self.start_positions + np.cumsum(deltas, axis=0, dtype=np.int16)
+        alive = np.unpackbits(self._records['alive'][:p_stop], axis=1, count=self.population_size).astype(bool)
+
+        for step in range(p_start, p_stop):
+            yield Frame(self.generation, step, positions[step], alive[step], self._records['food'][step], None, 0.0)
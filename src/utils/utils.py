@@ -1,10 +1,10 @@
 import logging
-import random
 from math import tanh, sin, cos
 
 import config
-from src.external import grid, population
+from src.external import grid, population, instrumentation
 from src.saves.Settings import Settings
+from src.utils import Rng
 from src.world.LocationTypes import Conversions, Coord, Direction
 
 
@@ -25,16 +25,22 @@ def generate_hex() -> str:
     Returns:
         str: An 8-char string representing a hexadecimal number.
     """
-    return '{:08x}'.format(random.randint(0, 0xFFFFFFFF))
+    return '{:08x}'.format(int(Rng.stream(Rng.GENOME).integers(0, 0xFFFFFFFF, endpoint=True)))
 
 
-def probability(p_prob: float) -> bool:
-    """ returns true with probability p_prob """
+def probability(p_prob: float, p_stream: str = Rng.BEHAVIOUR) -> bool:
+    """ returns true with probability p_prob, number is drawn from given random stream """
 
     assert isinstance(p_prob, float)
     assert 0 <= p_prob <= 1
 
-    return random.random() < p_prob
+    return Rng.stream(p_stream).random() < p_prob
+
+
+def random_sign() -> int:
+    """ returns 1 or -1 with equal probability """
+
+    return 1 if Rng.stream(Rng.BEHAVIOUR).random() < 0.5 else -1
 
 
 def squeeze(p_x: float) -> float:
@@ -125,6 +131,8 @@ def drain_move_queue(p_queue: list[tuple]):
                         specimen.eat()
                         grid.food_eaten_at(new_location)  # decreases amount of food at food source
                     specimen.use_energy(Settings.settings.energy_per_move)
+                elif instrumentation.enabled:
+                    instrumentation.blocked_moves += 1
 
             grid.data[specimen.location.x, specimen.location.y] = 0
             grid.data[new_location.x, new_location.y] = specimen.index
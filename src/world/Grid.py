@@ -1,11 +1,10 @@
 import math
-import random
 
 import numpy as np
-import scipy
 
 import config
 from src.saves.Settings import Settings
+from src.utils import Rng
 from src.world.LocationTypes import Coord, Conversions, Direction, Compass
 
 
@@ -25,12 +24,14 @@ class Grid:
 
     def reload_size(self):
         self.size = Settings.settings.dim
-        self.data = np.zeros((self.size, self.size), dtype=np.int16)
+        # grid may be reused by the same process for another simulation, so start from a clean world
+        self.clear()
+        self.pheromones = self.Pheromones(self.size)
 
     def reset(self):
         self.data = np.zeros((self.size, self.size), dtype=np.int16)
         for key in self.food_data:
-            self.food_data[key] = random.randint(Settings.settings.min_food_per_source, Settings.settings.max_food_per_source)
+            self.food_data[key] = self._random_food_level()
 
         if self.barriers:
             xs, ys = zip(*self.barriers)
@@ -45,6 +46,11 @@ class Grid:
 
         return
 
+    @staticmethod
+    def _random_food_level() -> int:
+        return int(Rng.stream(Rng.WORLD).integers(Settings.settings.min_food_per_source,
+                                                  Settings.settings.max_food_per_source + 1))
+
     def set_barriers_at_indexes(self, indexes: list[tuple]):
         xs, ys = zip(*indexes)
         assert self.in_bounds_xy(max(xs), max(ys)) and self.in_bounds_xy(min(xs), min(ys))
@@ -56,8 +62,7 @@ class Grid:
         xs, ys = zip(*indexes)
         assert self.in_bounds_xy(max(xs), max(ys)) and self.in_bounds_xy(min(xs), min(ys))
         assert (self.data[xs, ys] == Grid.EMPTY).all()
-        self.food_data = {idx: random.randint(Settings.settings.min_food_per_source, Settings.settings.max_food_per_source) for idx in
-                          indexes}
+        self.food_data = {idx: self._random_food_level() for idx in indexes}
 
     def food_eaten_at(self, loc: Coord):
         idx = (loc.x, loc.y)
@@ -179,6 +184,9 @@ class Grid:
             """
             Pheromone spread and decay using convolution.
             """
+            # scipy takes long to load, so it is loaded with first spread instead of with the module
+            import scipy.ndimage
+
             diffusion_rate = config.PHEROMONE_DIFFUSION_RATE
             decay_rate = config.PHEROMONE_DECAY_RATE
 
@@ -3,6 +3,8 @@ from enum import Enum
 
 import numpy as np
 
+from src.utils import Rng
+
 
 class Compass(Enum):
     NORTH_WEST = 0
@@ -66,7 +68,7 @@ class Direction:
 
     @staticmethod
     def random() -> 'Direction':
-        return Direction(Compass.NORTH).rotate(np.random.choice(8))  # never center
+        return Direction(Compass.NORTH).rotate(int(Rng.stream(Rng.BEHAVIOUR).integers(8)))  # never center
 
     def __str__(self):
         return f'Direction({self.compass})'
@@ -1,12 +1,34 @@
 import unittest
 
+from evolution.test_Kernels import TestKernels
 from evolution.test_Operators import TestOperators
+from evolution.test_Simulation import TestSimulation
+from evolution.test_Startup import TestStartup
+from evolution.test_Sweep import TestSweep
 from population.test_Layer import *
 from population.test_NeuralNetwork import TestNeuralNetwork, TestDecodeConnection
 from population.test_Sensor import TestSensor
 from population.test_Specimen import TestSpecimen
 from src.saves.SavesStarter import SavesStarter
-from utils.test_Save import TestSingleSaving, TestWriterSaving
+from utils.test_AnimationFrames import TestAnimationFrames
+from utils.test_BufferedWriter import TestBufferedWriter
+from utils.test_Checkpoint import TestCheckpoint
+from utils.test_FrameBuffer import TestFrameRing
+from utils.test_GenerationStore import TestGenerationStore
+from utils.test_Instrumentation import TestInstrumentation
+from utils.test_LiveFrame import TestLiveFrame
+from utils.test_MemoryReport import TestMemoryReport
+from utils.test_Plot import TestRenderWorld
+from utils.test_PopulationArchive import TestPopulationArchive
+from utils.test_Processes import TestProcesses
+from utils.test_Profiling import TestProfiling
+from utils.test_Progress import TestProgress
+from utils.test_Render import TestAnimationSink
+from utils.test_Rng import TestRng
+from utils.test_Sampling import TestFrameSampler
+from utils.test_Save import TestSingleSaving
+from utils.test_StatsStore import TestStatsStore
+from utils.test_Trajectory import TestTrajectory
 from utils.test_utils import TestUtils
 from world.test_Grid import TestGrid
 from world.test_Pheromones import TestPheromones
@@ -30,9 +52,30 @@ def run_all_tests():
     suite.addTest(loader.loadTestsFromTestCase(TestDecodeConnection))
     suite.addTest(loader.loadTestsFromTestCase(TestNeuralNetwork))
     suite.addTest(loader.loadTestsFromTestCase(TestOperators))
+    suite.addTest(loader.loadTestsFromTestCase(TestSweep))
+    suite.addTest(loader.loadTestsFromTestCase(TestStartup))
+    suite.addTest(loader.loadTestsFromTestCase(TestKernels))
     suite.addTest(loader.loadTestsFromTestCase(TestPheromones))
     suite.addTest(loader.loadTestsFromTestCase(TestSingleSaving))
-    suite.addTest(loader.loadTestsFromTestCase(TestWriterSaving))
+    suite.addTest(loader.loadTestsFromTestCase(TestProcesses))
+    suite.addTest(loader.loadTestsFromTestCase(TestRenderWorld))
+    suite.addTest(loader.loadTestsFromTestCase(TestAnimationSink))
+    suite.addTest(loader.loadTestsFromTestCase(TestFrameSampler))
+    suite.addTest(loader.loadTestsFromTestCase(TestFrameRing))
+    suite.addTest(loader.loadTestsFromTestCase(TestTrajectory))
+    suite.addTest(loader.loadTestsFromTestCase(TestRng))
+    suite.addTest(loader.loadTestsFromTestCase(TestCheckpoint))
+    suite.addTest(loader.loadTestsFromTestCase(TestPopulationArchive))
+    suite.addTest(loader.loadTestsFromTestCase(TestBufferedWriter))
+    suite.addTest(loader.loadTestsFromTestCase(TestGenerationStore))
+    suite.addTest(loader.loadTestsFromTestCase(TestStatsStore))
+    suite.addTest(loader.loadTestsFromTestCase(TestProgress))
+    suite.addTest(loader.loadTestsFromTestCase(TestLiveFrame))
+    suite.addTest(loader.loadTestsFromTestCase(TestAnimationFrames))
+    suite.addTest(loader.loadTestsFromTestCase(TestInstrumentation))
+    suite.addTest(loader.loadTestsFromTestCase(TestProfiling))
+    suite.addTest(loader.loadTestsFromTestCase(TestMemoryReport))
+    suite.addTest(loader.loadTestsFromTestCase(TestSimulation))
 
     runner = unittest.TextTestRunner(verbosity=2)
     runner.run(suite)
@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+import numpy as np
+
+from benchmarks.baseline import slower
+from benchmarks.kernels import Fixture, run, measure, SCALES
+from src.evolution.Operators import mutate
+from src.evolution.Simulation import population_step
+from src.external import grid, population
+from src.saves.Settings import Settings
+
+
+class TestKernels(TestCase):
+    def setUp(self):
+        self.previous_settings = Settings.settings
+
+    def tearDown(self):
+        Settings.settings = self.previous_settings
+
+    def test_fixture_is_the_same_every_time(self):
+        # given
+        Fixture('small')
+        genomes = [specimen.genome for specimen in population[1:]]
+        data = grid.data.copy()
+        # when
+        Fixture('small')
+        # then
+        self.assertEqual(SCALES['small']["population_size"], len(population) - 1)
+        self.assertListEqual(genomes, [specimen.genome for specimen in population[1:]])
+        np.testing.assert_array_equal(data, grid.data)
+
+    def test_restore_undoes_changes_of_benchmark(self):
+        # given
+        fixture = Fixture('small')
+        fixture.restore()
+        genome = population[1].genome
+        # when
+        mutate(population[1])
+        grid.pheromones.grid[:] = 1.0
+        fixture.restore()
+        # then
+        self.assertListEqual(genome, population[1].genome)
+        self.assertEqual(0.0, grid.pheromones.grid.min())
+
+    def test_every_repetition_starts_from_fixture(self):
+        # given
+        fixture = Fixture('small')
+        ages = []
+
+        def benchmark():
+            ages.append([specimen.age for specimen in population[1:]])
+            return population_step, False
+
+        # when
+        measure(fixture, benchmark, 2)
+        # then
+        self.assertEqual(2, len(ages))
+        self.assertListEqual(ages[0], ages[1])
+
+    def test_selected_benchmarks_are_measured(self):
+        # when
+        results = run(['small'], 1, ['drain_move_queue', 'Sensor.sense.LOC_*'])
+        # then
+        self.assertListEqual(['small/Sensor.sense.LOC_X', 'small/Sensor.sense.LOC_Y', 'small/drain_move_queue'],
+                             list(results))
+        for measured in results.values():
+            self.assertGreater(measured["seconds"], 0)
+            self.assertGreaterEqual(measured["calls"], 1)
+
+    def test_only_slow_down_above_threshold_is_regression(self):
+        # given
+        baseline = {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}
+        results = {"a": {"seconds": 1.2}, "b": {"seconds": 1.3}, "new": {"seconds": 5.0}}
+        # when
+        regressions = slower(results, baseline, 0.25)
+        # then
+        self.assertEqual(1, len(regressions))
+        self.assertTrue(regressions[0].startswith('b:'))
@@ -38,12 +38,11 @@ class TestOperators(TestCase):
         # Create a mock population
         self.mock_population = [None, self.mock_specimen, self.mock_specimen_2, self.mock_specimen_3]
 
-    @patch("src.evolution.Operators.random.sample")
-    @patch("src.evolution.Operators.random.randint")
-    def test_mutate(self, mock_randint, mock_sample):
+    @patch("src.evolution.Operators.Rng.stream")
+    def test_mutate(self, mock_stream):
         # given
-        mock_sample.return_value = [0, 1]  # select the first 2 genes
-        mock_randint.side_effect = [2, 0]  # bit negation indices
+        mock_stream.return_value.choice.return_value = np.array([0, 1])  # select the first 2 genes
+        mock_stream.return_value.integers.side_effect = [2, 0]  # bit negation indices
 
         # when
         mutate(self.mock_specimen)
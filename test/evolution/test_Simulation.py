@@ -0,0 +1,47 @@
+import dataclasses
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.evolution.Initialization import initialize_simulation
+from src.saves.Settings import Settings
+from src.utils.Render import RenderPool
+
+
+class TestSimulation(TestCase):
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+        self.previous_settings = Settings.settings
+        self.settings = dataclasses.replace(Settings(), population_size=20, dim=20, genome_length=8,
+                                            number_of_generations=2, steps_per_generation=20, seed=7,
+                                            SAVE_ANIMATION=True, SAVE_EVOLUTION_STEP=False, SAVE_GENERATION=False,
+                                            SAVE_SELECTION=False, SAVE_POPULATION=False, SAVE_CONFIG=False)
+
+    def tearDown(self):
+        Settings.settings = self.previous_settings
+        shutil.rmtree(self.folder_path)
+
+    @patch('config.RENDER_WAIT_SECONDS', 0.05)
+    @patch('config.RENDER_QUEUE_SIZE', 1)
+    @patch('config.RENDER_PROCESSES', 1)
+    def test_simulation_fails_when_render_process_dies(self):
+        # given
+        start_pool = RenderPool.start
+
+        def start_and_kill(pool):
+            start_pool(pool)
+            for p in pool._processes:
+                p.kill()
+                p.join()
+
+        with patch('config.SIMULATION_SAVES_FOLDER_PATH', self.folder_path), \
+                patch.object(RenderPool, 'start', start_and_kill):
+            start = time.time()
+            # when
+            with self.assertRaises(RuntimeError) as raised:
+                initialize_simulation(uid='test', settings=self.settings)
+        # then simulation stops as soon as it has to wait for render process
+        self.assertIn('Render process', str(raised.exception))
+        self.assertLess(time.time() - start, 30)
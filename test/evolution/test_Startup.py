@@ -0,0 +1,13 @@
+from unittest import TestCase
+
+from benchmarks.startup import ENTRY_POINTS, measure_import
+
+
+class TestStartup(TestCase):
+    def test_entry_points_do_not_load_heavy_modules(self):
+        for module, entry in ENTRY_POINTS.items():
+            with self.subTest(module=module):
+                # when
+                measured = measure_import(module, entry, 1)
+                # then
+                self.assertListEqual([], measured["loaded"])
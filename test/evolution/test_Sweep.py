@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from src.evolution.Sweep import expand_grid, apply_overrides
+from src.saves.Settings import Settings
+
+
+class TestSweep(TestCase):
+    def test_expand_grid(self):
+        # given
+        grid = {"population_size": [10, 20], "dim": [30, 40, 50]}
+        # when
+        overrides = expand_grid(grid)
+        # then
+        self.assertEqual(6, len(overrides))
+        self.assertIn({"population_size": 20, "dim": 40}, overrides)
+
+    def test_apply_overrides(self):
+        # given
+        base = Settings()
+        # when
+        settings = apply_overrides(base, {"population_size": 7})
+        # then
+        self.assertEqual(7, settings.population_size)
+        self.assertEqual(base.dim, settings.dim)
+        self.assertNotEqual(7, base.population_size)
+
+    def test_apply_unknown_override(self):
+        with self.assertRaises(ValueError):
+            apply_overrides(Settings(), {"no_such_field": 1})
@@ -67,6 +67,9 @@ class TestSensor(TestCase):
         self.population_patch.stop()
         self.neighbourhood_radius_patch.stop()
         self.direction_as_normalized_coord_patch.stop()
+        # grid is shared with other tests, so its methods replaced with mocks are removed
+        for name in ('at_xy', 'in_bounds_xy', 'is_barrier_at_xy', 'is_food_at_xy', 'is_occupied_at_xy'):
+            vars(self.grid_mock).pop(name, None)
 
     def test_get_oscillating_value(self):
         # given
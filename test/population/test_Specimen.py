@@ -2,6 +2,7 @@ from unittest import TestCase
 from unittest.mock import patch, MagicMock, Mock
 
 import config
+from src.external import instrumentation
 from src.population.SensorActionEnums import ActionType
 from src.population.Specimen import Specimen
 from src.saves.Settings import Settings
@@ -81,16 +82,16 @@ class TestSpecimen(TestCase):
         mock_emit.assert_called_once()
 
     @patch('src.world.LocationTypes.Conversions.direction_as_normalized_coord')
-    @patch('src.population.Specimen.random.choice')
+    @patch('src.population.Specimen.random_sign')
     @patch('src.population.Specimen.probability')
     @patch('src.world.LocationTypes.Conversions.coord_as_direction')
     @patch('src.population.Specimen.move_queue')
-    def test_act_for_move(self, mock_move_queue, mock_coord_as_direction, mock_probability, mock_choice,
+    def test_act_for_move(self, mock_move_queue, mock_coord_as_direction, mock_probability, mock_random_sign,
                           mock_direction_as_coord):
         # given
         mock_coord_as_direction.return_value = Direction(Compass.CENTER)
         mock_probability.return_value = True
-        mock_choice.return_value = -1
+        mock_random_sign.return_value = -1
         mock_direction_as_coord.return_value = Coord(1, 0)
         self.specimen.energy = Settings.settings.energy_per_move + 1
         value = 0.6
@@ -114,3 +115,39 @@ class TestSpecimen(TestCase):
         mock_move_queue.append.assert_called_once()
         # check if every move happened, was added to path as a step, and got appended to move_queue
         self.assertEqual(11, len(mock_move_queue.append.mock_calls[0].args[0][1]))
+
+    @patch('src.population.Specimen.random_sign')
+    @patch('src.population.Specimen.probability')
+    @patch('src.population.Specimen.move_queue')
+    def test_only_fired_actions_are_counted(self, mock_move_queue, mock_probability, mock_random_sign):
+        # given
+        mock_probability.side_effect = [True, False]
+        mock_random_sign.return_value = 1
+        self.specimen.energy = Settings.settings.energy_per_move + 1
+        p_actions = {ActionType.SET_RESPONSIVENESS: 0.6, ActionType.MOVE_X: 0.6, ActionType.MOVE_Y: 0.6}
+        instrumentation.enabled = True
+        try:
+            # when
+            self.specimen.act(p_actions)
+            _, counts = instrumentation.end_generation()
+        finally:
+            instrumentation.enabled = False
+        # then move in y direction was not drawn
+        self.assertDictEqual({'action.SET_RESPONSIVENESS': 1, 'action.MOVE_X': 1, 'blocked_moves': 0,
+                              'emissions': 0}, counts)
+
+    @patch('config.FORCE_EMISSION_TEST', False)
+    @patch('src.population.Specimen.probability')
+    def test_kill_and_emission_are_counted_only_when_they_happen(self, mock_probability):
+        # given
+        mock_probability.return_value = False
+        p_actions = {ActionType.KILL: 5.0, ActionType.EMIT_PHEROMONE: 5.0}
+        instrumentation.enabled = True
+        try:
+            # when
+            self.specimen.act(p_actions)
+            _, counts = instrumentation.end_generation()
+        finally:
+            instrumentation.enabled = False
+        # then nothing was drawn, so nothing happened
+        self.assertDictEqual({'blocked_moves': 0, 'emissions': 0}, counts)
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from src.utils.AnimationFrames import FrameCache, load_generation_frames
+from src.utils.FrameBuffer import Frame
+from src.utils.Render import AnimationSink
+from src.utils.Trajectory import TrajectoryWriter
+
+
+class TestAnimationFrames(TestCase):
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder_path)
+
+    def write_trajectory(self, p_generation, p_steps):
+        writer = TrajectoryWriter(os.path.join(self.folder_path, 'trajectory'), 2, 10, 5, p_steps)
+        positions = np.array([[1, 1], [5, 5]], dtype=np.int16)
+        writer.begin_generation(p_generation, [(0, 0)], [(4, 4)], positions)
+        for step in range(p_steps + 1):
+            writer.record(Frame(p_generation, step, positions + min(step, 3), np.array([True, step < 2]),
+                                np.array([5], dtype=np.int16)))
+        writer.end_generation()
+
+    def test_animation_is_decoded(self):
+        # given
+        os.mkdir(os.path.join(self.folder_path, 'animation'))
+        sink = AnimationSink(os.path.join(self.folder_path, 'animation'), 3)
+        for value in (0, 255, 0):
+            sink.append(np.full((40, 20, 3), value, dtype=np.uint8))
+        sink.close()
+        # when
+        frames = load_generation_frames(self.folder_path, 3, 20)
+        # then
+        self.assertEqual(3, len(frames))
+        self.assertEqual((20, 10, 3), frames[0].shape)
+        self.assertListEqual([0, 255, 0], [int(frame[0, 0, 0]) for frame in frames])
+
+    def test_trajectory_is_rendered_without_animation(self):
+        # given
+        self.write_trajectory(1, 4)
+        # when
+        frames = load_generation_frames(self.folder_path, 1, 25)
+        # then
+        self.assertEqual(5, len(frames))
+        # cells take 2 pixels, so 10 x 10 world fits into 25 pixels
+        self.assertEqual((20, 20, 3), frames[0].shape)
+        self.assertFalse(np.array_equal(frames[0], frames[3]))
+
+    def test_missing_generation(self):
+        # then
+        self.assertIsNone(load_generation_frames(self.folder_path, 0))
+
+    def test_least_recently_used_generation_is_dropped(self):
+        # given
+        cache = FrameCache(2 * 100)
+        frames = {generation: [np.zeros(100, dtype=np.uint8)] for generation in range(3)}
+        cache.put(0, frames[0])
+        cache.put(1, frames[1])
+        cache.get(0)
+        # when
+        cache.put(2, frames[2])
+        # then
+        self.assertListEqual([0, 2], cache.generations())
+        self.assertEqual(200, cache.bytes)
+        self.assertIsNone(cache.get(1))
+
+    def test_generation_bigger_than_cache_is_kept(self):
+        # given
+        cache = FrameCache(10)
+        cache.put(0, [np.zeros(5, dtype=np.uint8)])
+        # when
+        cache.put(1, [np.zeros(100, dtype=np.uint8)])
+        # then
+        self.assertListEqual([1], cache.generations())
+        cache.discard(1)
+        self.assertEqual(0, cache.bytes)
@@ -0,0 +1,97 @@
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.utils.BufferedWriter import BufferedWriter, read_records, records_filename
+
+
+class TestBufferedWriter(TestCase):
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder_path)
+
+    def path(self, p_compression='none'):
+        return os.path.join(self.folder_path, records_filename('saved_STEP', p_compression))
+
+    def test_records_are_batched(self):
+        # given
+        output = BufferedWriter(self.path(), p_max_bytes=1000, p_max_seconds=60)
+        # when
+        for step in range(10):
+            output.write({"step": step})
+        # then nothing written until buffer is full or flushed
+        self.assertEqual(0, os.path.getsize(self.path()))
+        output.close()
+        self.assertEqual(1, output.writes)
+        self.assertListEqual([{"step": step} for step in range(10)], list(read_records(self.path())))
+
+    def test_full_buffer_is_written(self):
+        # given
+        output = BufferedWriter(self.path(), p_max_bytes=24, p_max_seconds=60)
+        # when every line has 12 bytes
+        for step in range(5):
+            output.write('{"step": %d}' % step)
+        # then
+        self.assertEqual(2, output.writes)
+        self.assertEqual(48, os.path.getsize(self.path()))
+        output.close()
+
+    def test_buffer_is_written_after_time(self):
+        # given
+        output = BufferedWriter(self.path(), p_max_bytes=1000, p_max_seconds=5)
+        # when
+        output.write({"step": 0})
+        with patch('src.utils.BufferedWriter.time.monotonic', return_value=output._last_write + 5):
+            output.write({"step": 1})
+        # then
+        self.assertEqual(1, output.writes)
+        self.assertEqual(2, len(list(read_records(self.path()))))
+        output.close()
+
+    def test_compressed_records(self):
+        for compression in ['gzip', 'lzma']:
+            with self.subTest(compression=compression):
+                # given
+                output = BufferedWriter(self.path(compression), compression, p_max_bytes=50)
+                records = [{"gen": 0, "step": step, "dead count": step % 3} for step in range(20)]
+                # when
+                for record in records:
+                    output.write(record)
+                output.close()
+                # then every batch is separate member, all of them are read
+                self.assertGreater(output.writes, 1)
+                self.assertListEqual(records, list(read_records(self.path(compression))))
+
+    def test_offset_drops_records_after_it(self):
+        # given
+        output = BufferedWriter(self.path('gzip'), 'gzip')
+        output.write({"step": 0})
+        offset = output.tell()
+        output.write({"step": 1})
+        output.close()
+        # when
+        resumed = BufferedWriter(self.path('gzip'), 'gzip', p_offset=offset)
+        self.assertEqual(offset, resumed.tell())
+        resumed.write({"step": 2})
+        resumed.close()
+        # then
+        self.assertListEqual([{"step": 0}, {"step": 2}], list(read_records(self.path('gzip'))))
+        with gzip.open(self.path('gzip'), 'rt') as file:
+            self.assertEqual(2, len(file.readlines()))
+
+    def test_close_is_registered_at_exit(self):
+        # given
+        with patch('src.utils.BufferedWriter.atexit') as mock_atexit:
+            output = BufferedWriter(self.path())
+            output.write({"step": 0})
+            # when simulation dies, interpreter calls registered close
+            mock_atexit.register.call_args.args[0]()
+            # then
+            mock_atexit.unregister.assert_called_once()
+        self.assertTrue(output.closed)
+        self.assertListEqual([{"step": 0}], list(read_records(self.path())))
@@ -0,0 +1,74 @@
+import dataclasses
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from src.evolution.Initialization import initialize_random_world, initialize_random_population
+from src.external import population
+from src.saves.Settings import Settings
+from src.utils import Rng
+from src.utils.Checkpoint import write_checkpoint, read_checkpoint, restore_checkpoint, checkpoint_path
+from src.world.Grid import Grid
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self.previous_settings = Settings.settings
+        Settings.settings = dataclasses.replace(Settings(), dim=12, population_size=6, genome_length=4, seed=3)
+        Rng.seed(3)
+        # own grid, so state left in global grid by other tests does not matter
+        self.grid = Grid(12)
+        self.grid_patches = [patch(f'{module}.grid', self.grid) for module in
+                             ['src.utils.Checkpoint', 'src.evolution.Initialization']]
+        for grid_patch in self.grid_patches:
+            grid_patch.start()
+        grid = self.grid
+        initialize_random_world()
+        initialize_random_population()
+        grid.pheromones.grid[2, 3] = 0.5
+        self.folder_path = tempfile.mkdtemp()
+        self.path = checkpoint_path(self.folder_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder_path)
+        Settings.settings = self.previous_settings
+        for grid_patch in self.grid_patches:
+            grid_patch.stop()
+
+    def test_write_is_atomic(self):
+        # when
+        seconds, size = write_checkpoint(self.path, 1, {"steps": 0}, {})
+        # then
+        self.assertEqual([os.path.basename(self.path)], os.listdir(self.folder_path))
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertGreaterEqual(seconds, 0)
+
+    def test_state_restored(self):
+        # given
+        grid = self.grid
+        genomes = [specimen.genome for specimen in population[1:]]
+        locations = [(specimen.location.x, specimen.location.y) for specimen in population[1:]]
+        grid_data = grid.data.copy()
+        food_data = dict(grid.food_data)
+        write_checkpoint(self.path, 4, {"steps": 17}, {"saved_STEP.json": 120})
+        expected_random = Rng.stream(Rng.MUTATION).random()
+        # when world, population and random streams change
+        grid.reload_size()
+        initialize_random_world()
+        initialize_random_population()
+        checkpoint = read_checkpoint(self.path)
+        restore_checkpoint(checkpoint)
+        # then
+        self.assertEqual(4, checkpoint["meta"]["generation"])
+        self.assertEqual({"steps": 17}, checkpoint["meta"]["summary"])
+        self.assertEqual({"saved_STEP.json": 120}, checkpoint["meta"]["writer_offsets"])
+        np.testing.assert_array_equal(grid_data, grid.data)
+        self.assertEqual(food_data, grid.food_data)
+        self.assertEqual(0.5, grid.pheromones.grid[2, 3])
+        self.assertEqual(genomes, [specimen.genome for specimen in population[1:]])
+        self.assertEqual(locations, [(specimen.location.x, specimen.location.y) for specimen in population[1:]])
+        self.assertEqual(expected_random, Rng.stream(Rng.MUTATION).random())
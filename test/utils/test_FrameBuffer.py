@@ -0,0 +1,88 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from src.utils.FrameBuffer import Frame, FrameRing
+from src.utils.Processes import start_process, new_queue
+
+
+def read_in_process(p_ring: FrameRing, p_slot: int, p_results) -> None:
+    """ reads frame in render-like process and gives slot back """
+
+    frame = p_ring.read(p_slot)
+    p_results.put((frame.generation, frame.step, frame.positions.tolist(), frame.alive.tolist(), frame.food.tolist()))
+    del frame
+    p_ring.release(p_slot)
+
+
+class TestFrameRing(TestCase):
+    def setUp(self):
+        self.ring = FrameRing(3, 5, 2, True)
+        self.frame = Frame(4, 7, np.array([[0, 1], [2, 3], [4, 4]], dtype=np.int16), np.array([True, False, True]),
+                           np.array([5, 0], dtype=np.int16), np.arange(25, dtype=np.float32).reshape(5, 5), 12.5)
+
+    def tearDown(self):
+        self.ring.close(True)
+
+    def test_write_read(self):
+        # given
+        slot = self.ring.acquire()
+        # when
+        self.ring.write(slot, self.frame)
+        frame = self.ring.read(slot)
+        # then
+        self.assertEqual((4, 7, 12.5), (frame.generation, frame.step, frame.submitted_at))
+        np.testing.assert_array_equal(self.frame.positions, frame.positions)
+        np.testing.assert_array_equal(self.frame.alive, frame.alive)
+        np.testing.assert_array_equal(self.frame.food, frame.food)
+        np.testing.assert_array_equal(self.frame.pheromones, frame.pheromones)
+
+    def test_slots_are_separate(self):
+        # given
+        first = self.ring.acquire()
+        second = self.ring.acquire()
+        other = Frame(5, 0, np.zeros((3, 2), dtype=np.int16), np.zeros(3, dtype=bool), np.zeros(1, dtype=np.int16))
+        # when
+        self.ring.write(first, self.frame)
+        self.ring.write(second, other)
+        # then
+        self.assertNotEqual(first, second)
+        self.assertEqual(4, self.ring.read(first).generation)
+        self.assertEqual(5, self.ring.read(second).generation)
+        self.assertIsNone(self.ring.read(second).pheromones)
+
+    def test_read_in_other_process(self):
+        # given
+        results = new_queue()
+        slot = self.ring.acquire()
+        self.ring.write(slot, self.frame)
+        # when
+        p = start_process(read_in_process, (self.ring, slot, results))
+        generation, step, positions, alive, food = results.get(timeout=30)
+        p.join()
+        # then
+        self.assertEqual((4, 7), (generation, step))
+        self.assertEqual(self.frame.positions.tolist(), positions)
+        self.assertEqual(self.frame.alive.tolist(), alive)
+        self.assertEqual(self.frame.food.tolist(), food)
+        # slot released by other process can be taken again
+        self.assertCountEqual([0, 1], [self.ring.acquire(), self.ring.acquire()])
+
+    @patch('config.RENDER_WAIT_SECONDS', 0.01)
+    def test_waiting_for_slot_is_checked(self):
+        # given
+        self.ring.acquire()
+        self.ring.acquire()
+        checks = []
+
+        def check():
+            checks.append(True)
+            if len(checks) == 3:
+                raise RuntimeError('render process died')
+
+        # when
+        with self.assertRaises(RuntimeError):
+            self.ring.acquire(check)
+        # then
+        self.assertEqual(3, len(checks))
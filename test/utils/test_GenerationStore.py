@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from src.population.Specimen import Specimen
+from src.utils.GenerationStore import GenerationStore, GenerationReader, GENERATION, SELECTION, HEADER_SIZE
+from src.utils.utils import initialize_genome
+from src.world.LocationTypes import Coord
+
+
+class TestGenerationStore(TestCase):
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+        self.name = "test_SNAPSHOTS"
+
+        self.mock_settings = Mock()
+        self.mock_settings.genome_length = 4
+        self.mock_settings.disable_pheromones = False
+        self.mock_settings.max_number_of_inner_neurons = 2
+        self.mock_settings.entry_max_energy_level = 10
+        self.mock_settings.max_energy_level_supremum = 12
+        self.settings_patch = patch('src.population.Specimen.Settings.settings', self.mock_settings)
+        self.settings_patch.start()
+        self.pop = [None]
+        self.pop.extend(
+            [Specimen(i, Coord(i, i), initialize_genome(self.mock_settings.genome_length)) for i in range(1, 11)])
+        for specimen in self.pop[1::3]:
+            specimen.alive = False
+            specimen.energy = 0
+        self.pop[2].max_energy = 11.5
+
+    def tearDown(self):
+        self.settings_patch.stop()
+        shutil.rmtree(self.folder_path)
+
+    def assert_snapshot(self, p_specimens, p_snapshot):
+        self.assertListEqual([specimen.index for specimen in p_specimens], p_snapshot["index"].tolist())
+        for row, specimen in enumerate(p_specimens):
+            self.assertEqual(specimen.energy, p_snapshot["energy"][row])
+            self.assertEqual(specimen.max_energy, p_snapshot["max_energy"][row])
+            self.assertEqual(specimen.alive, p_snapshot["alive"][row])
+            self.assertEqual(specimen.is_killer, p_snapshot["is_killer"][row])
+            self.assertListEqual([int(gene, 16) for gene in specimen.genome], p_snapshot["genomes"][row].tolist())
+
+    def test_saving_pop_for_all(self):
+        # given
+        store = GenerationStore(self.folder_path, self.name)
+        # when
+        store.append(0, GENERATION, self.pop)
+        store.close()
+        # then
+        reader = GenerationReader(self.folder_path, self.name)
+        self.assertListEqual([0], reader.generations())
+        snapshot = reader.snapshot(0)
+        self.assertEqual((10, 4), snapshot["genomes"].shape)
+        self.assertEqual(np.float32, snapshot["energy"].dtype)
+        self.assert_snapshot(self.pop[1:], snapshot)
+
+    def test_saving_pop_for_selected(self):
+        # given
+        store = GenerationStore(self.folder_path, self.name)
+        selected = [2, 4, 6, 8, 10]
+        # when
+        store.append(0, GENERATION, self.pop)
+        store.append(0, SELECTION, [self.pop[idx] for idx in selected])
+        store.close()
+        # then
+        reader = GenerationReader(self.folder_path, self.name)
+        self.assertListEqual([0], reader.generations(SELECTION))
+        self.assert_snapshot([self.pop[idx] for idx in selected], reader.snapshot(0, SELECTION))
+        self.assertEqual(10, len(reader.snapshot(0, GENERATION)["index"]))
+
+    def test_any_generation_is_read_from_index(self):
+        # given
+        store = GenerationStore(self.folder_path, self.name)
+        for gen in range(5):
+            for specimen in self.pop[1:]:
+                specimen.energy = gen
+            store.append(gen, GENERATION, self.pop)
+        store.close()
+        # when
+        reader = GenerationReader(self.folder_path, self.name)
+        snapshot = reader.snapshot(3)
+        # then
+        self.assertListEqual(list(range(5)), reader.generations())
+        self.assertTrue((snapshot["energy"] == 3).all())
+        self.assertEqual(0, reader.index["offset"][3] % 8)
+        with self.assertRaises(KeyError):
+            reader.snapshot(5)
+
+    def test_offsets_drop_snapshots_after_them(self):
+        # given
+        store = GenerationStore(self.folder_path, self.name)
+        store.append(0, GENERATION, self.pop)
+        offsets = store.offsets()
+        store.append(1, GENERATION, self.pop)
+        store.close()
+        # when
+        resumed = GenerationStore(self.folder_path, self.name, offsets)
+        resumed.append(1, SELECTION, self.pop[1:3])
+        resumed.close()
+        # then
+        reader = GenerationReader(self.folder_path, self.name)
+        self.assertListEqual([0], reader.generations(GENERATION))
+        self.assertListEqual([1], reader.generations(SELECTION))
+        self.assert_snapshot(self.pop[1:3], reader.snapshot(1, SELECTION))
+
+    def test_not_a_store(self):
+        # given
+        for filename in [f"{self.name}.bin", f"{self.name}.idx"]:
+            with open(os.path.join(self.folder_path, filename), "wb") as file:
+                file.write(b'\x00' * HEADER_SIZE)
+        # then
+        with self.assertRaises(ValueError):
+            GenerationReader(self.folder_path, self.name)
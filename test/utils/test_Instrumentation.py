@@ -0,0 +1,80 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.population.SensorActionEnums import SensorType, ActionType
+from src.utils.Instrumentation import Instrumentation, PHASES, SPECIMEN_PHASES, rss_bytes, generation_metrics
+
+
+class TestInstrumentation(TestCase):
+    def test_laps_are_added_to_phases(self):
+        # given
+        instrumentation = Instrumentation(True)
+        # when
+        with patch('src.utils.Instrumentation.time.perf_counter', side_effect=[1.5, 2.0, 4.0]):
+            lap = instrumentation.lap('live', 1.0)
+            lap = instrumentation.lap('move', lap)
+            instrumentation.lap('live', lap)
+        # then
+        self.assertEqual(2.5, instrumentation.phases['live'])
+        self.assertEqual(0.5, instrumentation.phases['move'])
+
+    def test_disabled_laps_do_not_read_clock(self):
+        # given
+        instrumentation = Instrumentation()
+        # when
+        with patch('src.utils.Instrumentation.time.perf_counter') as perf_counter:
+            lap = instrumentation.lap('live', 1.0)
+            lap = instrumentation.lap('move', lap)
+        phases, counts = instrumentation.end_generation()
+        # then
+        perf_counter.assert_not_called()
+        self.assertEqual(1.0, lap)
+        self.assertDictEqual({}, phases)
+        self.assertDictEqual({}, counts)
+
+    def test_phases_are_reset_every_generation(self):
+        # given
+        instrumentation = Instrumentation(True)
+        instrumentation.phases['save'] = 1.0
+        # when
+        phases, counts = instrumentation.end_generation()
+        # then
+        self.assertEqual(1.0, phases['save'])
+        self.assertTupleEqual(PHASES, tuple(phases))
+        self.assertDictEqual({'blocked_moves': 0, 'emissions': 0}, counts)
+        self.assertEqual(0.0, sum(instrumentation.phases.values()))
+
+    def test_living_is_split_into_phases_and_counted(self):
+        # given
+        instrumentation = Instrumentation(True)
+        # sensing is measured inside of thinking, thinking and acting inside of living
+        instrumentation.phases.update({'live': 5.0, 'sense': 0.5, 'think': 1.5, 'act': 1.5})
+        instrumentation.sensors[SensorType.LOC_X.value] += 1
+        instrumentation.sensors[SensorType.AGE.value] += 1
+        instrumentation.actions[ActionType.MOVE_X.value] += 1
+        instrumentation.blocked_moves += 2
+        # when
+        phases, counts = instrumentation.end_generation()
+        # then
+        self.assertDictEqual({'sense': 0.5, 'think': 1.0, 'act': 1.5},
+                             {phase: phases[phase] for phase in SPECIMEN_PHASES})
+        # living without its parts
+        self.assertEqual(2.0, phases['live'])
+        self.assertDictEqual({'sensor.LOC_X': 1, 'sensor.AGE': 1, 'action.MOVE_X': 1, 'blocked_moves': 2,
+                              'emissions': 0}, counts)
+        self.assertDictEqual({'blocked_moves': 0, 'emissions': 0}, instrumentation.counts())
+
+    def test_generation_metrics(self):
+        # given
+        perf = {"time": 2.0, "steps_per_sec": 10.0, "specimen_steps_per_sec": 100.0, "rss": 1024,
+                "phases": {"live": 1.0, "move": 0.5}}
+        # when
+        metrics = generation_metrics(perf, {"blocked_moves": 3})
+        # then
+        self.assertDictEqual({"time.live": 1.0, "time.move": 0.5, "count.blocked_moves": 3, "perf.time": 2.0,
+                              "perf.steps_per_sec": 10.0, "perf.specimen_steps_per_sec": 100.0, "perf.rss": 1024},
+                             metrics)
+
+    def test_rss(self):
+        # then
+        self.assertGreater(rss_bytes(), 0)
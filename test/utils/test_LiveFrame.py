@@ -0,0 +1,78 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from src.utils.FrameBuffer import Frame
+from src.utils.LiveFrame import LiveFrame
+
+
+class TestLiveFrame(TestCase):
+    def setUp(self):
+        self.live_frame = LiveFrame(3, 10, 7)
+        self.reader = LiveFrame.attach(self.live_frame.description())
+
+    def tearDown(self):
+        self.reader.close()
+        self.live_frame.close()
+
+    def frame(self, p_step):
+        return Frame(2, p_step, np.array([[0, 0], [1, 2], [9, 9]], dtype=np.int16), np.array([True, False, True]),
+                     np.array([5, p_step], dtype=np.int16))
+
+    def test_nothing_published(self):
+        # then
+        self.assertIsNone(self.reader.read())
+
+    def test_description_carries_scale_of_food(self):
+        # then
+        self.assertEqual(7, self.live_frame.description()["max_food"])
+        self.assertEqual(7, self.reader.max_food)
+
+    def test_latest_frame_is_read(self):
+        # given
+        self.live_frame.begin_generation([(4, 4), (5, 5), (6, 6)], [(1, 1), (8, 8)])
+        # when
+        self.live_frame.publish(self.frame(1))
+        self.live_frame.publish(self.frame(2))
+        frame = self.reader.read()
+        # then
+        self.assertEqual(2, frame["generation"])
+        self.assertEqual(2, frame["step"])
+        self.assertEqual(0, frame["sequence"] % 2)
+        self.assertListEqual([[4, 4], [5, 5], [6, 6]], frame["barriers"].tolist())
+        self.assertListEqual([[1, 1], [8, 8]], frame["food_positions"].tolist())
+        self.assertListEqual([5, 2], frame["food_levels"].tolist())
+        self.assertListEqual([[0, 0], [1, 2], [9, 9]], frame["positions"].tolist())
+        self.assertListEqual([True, False, True], frame["alive"].tolist())
+
+    def test_read_frame_is_copy(self):
+        # given
+        self.live_frame.begin_generation([], [(1, 1), (8, 8)])
+        self.live_frame.publish(self.frame(1))
+        frame = self.reader.read()
+        # when
+        self.live_frame.publish(self.frame(7))
+        # then
+        self.assertEqual(1, frame["food_levels"][1])
+
+    def test_frame_being_written_is_not_read(self):
+        # given
+        self.live_frame.begin_generation([], [])
+        self.live_frame.publish(self.frame(1))
+        # when writer is in the middle of writing
+        self.live_frame._begin_write()
+        # then
+        self.assertIsNone(self.reader.read())
+        self.live_frame._end_write()
+        self.assertIsNotNone(self.reader.read())
+
+    def test_publishing_is_throttled(self):
+        # given
+        with patch('src.utils.LiveFrame.time.monotonic', return_value=100.0):
+            self.live_frame.publish(self.frame(1))
+        # then
+        with patch('src.utils.LiveFrame.time.monotonic', return_value=100.01):
+            self.assertFalse(self.live_frame.due(0.04))
+        with patch('src.utils.LiveFrame.time.monotonic', return_value=100.05):
+            self.assertTrue(self.live_frame.due(0.04))
@@ -0,0 +1,107 @@
+import json
+import shutil
+import tempfile
+from unittest import TestCase
+
+from src.population.Specimen import Specimen
+from src.saves.Settings import Settings
+from src.utils.MemoryReport import MemoryTracker, deep_size, specimen_components, specimen_sizes, COMPONENTS
+from src.world.LocationTypes import Coord
+
+# allocations kept alive by test of growth detection
+leaked = []
+
+
+def leak() -> None:
+    leaked.append(bytearray(600 * 1024))
+
+
+class TestMemoryReport(TestCase):
+    def setUp(self):
+        Settings.read()
+        self.folder = tempfile.mkdtemp()
+        self.genome = ["0a3f1200", "81e20a00", "0c1d0400", "8f002000"]
+
+    def tearDown(self):
+        leaked.clear()
+        shutil.rmtree(self.folder)
+
+    def test_shared_objects_are_counted_once(self):
+        # given
+        part = [1.5, 2.5]
+        seen = set()
+        # when
+        first = deep_size({'a': part}, seen)
+        second = deep_size({'b': part}, seen)
+        # then
+        self.assertLess(second, first)
+        self.assertIn(id(part), seen)
+
+    def test_parts_of_specimen_add_up_to_specimen(self):
+        # given
+        specimen = Specimen(1, Coord(2, 3), self.genome.copy())
+        # when
+        parts = specimen_components(specimen)
+        # then
+        self.assertTupleEqual(COMPONENTS, tuple(parts))
+        self.assertEqual(deep_size(specimen, set()), sum(parts.values()))
+        self.assertGreater(parts['layers'], 0)
+        self.assertGreater(parts['genome'], 0)
+
+    def test_sizes_are_averaged_over_population(self):
+        # given
+        population = [None] + [Specimen(i + 1, Coord(i, 0), self.genome.copy()) for i in range(4)]
+        # when
+        sizes = specimen_sizes(population, 2)
+        # then
+        self.assertAlmostEqual(sum(sizes[name] for name in COMPONENTS), sizes['total'])
+        self.assertAlmostEqual(4 * sizes['total'], sizes['population'])
+
+    def test_growing_allocation_is_flagged(self):
+        # given
+        tracker = MemoryTracker(self.folder, p_top=5, p_growth_generations=2, p_growth_bytes=1024 * 1024)
+        tracker.start()
+        # when
+        try:
+            for generation in range(3):
+                leak()
+                tracker.generation_finished(generation, [None], {"queue": generation})
+        finally:
+            tracker.stop()
+        tracker.write_summary()
+        # then every generation is one line of report
+        with open(tracker.path) as f:
+            records = [json.loads(line) for line in f]
+        with open(tracker.summary_path) as f:
+            summary = json.load(f)
+        self.assertListEqual([0, 1, 2], [record["generation"] for record in records])
+        self.assertEqual(3, summary["generations"])
+        self.assertIn('sizes.queue', summary["growing"])
+        self.assertTrue(any(name.startswith('allocation.') and 'test_MemoryReport.py' in name
+                            for name in summary["growing"]))
+        self.assertIn('test_MemoryReport.py', records[-1]["top_growth"][0]["location"])
+
+    def test_only_growing_allocation_sites_are_watched(self):
+        # given
+        tracker = MemoryTracker(self.folder, p_growth_generations=2, p_watched_sites=3)
+        tracker.start()
+        # when
+        try:
+            for generation in range(3):
+                leak()
+                tracker.generation_finished(generation, [None])
+        finally:
+            tracker.stop()
+        # then
+        sites = [name for name in tracker._history if name.startswith('allocation.')]
+        self.assertLessEqual(len(sites), 3)
+        self.assertTrue(any('test_MemoryReport.py' in name for name in sites))
+
+    def test_value_that_stops_growing_is_not_flagged(self):
+        # given
+        tracker = MemoryTracker(self.folder, p_growth_generations=2)
+        # when
+        for generation, value in enumerate([1, 2, 2, 3]):
+            tracker._observe('value', generation, value, 1)
+        # then
+        self.assertDictEqual({}, tracker.growing)
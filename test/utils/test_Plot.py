@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.utils.Plot import render_world, food_colors, BARRIER_RGB, SPECIMEN_RGB, BACKGROUND_RGB
+
+
+class TestRenderWorld(TestCase):
+    DIM = 5
+    PX = 10
+
+    def cell_center(self, p_image: np.ndarray, p_x: int, p_y: int) -> tuple:
+        """ color of center pixel of cell (x, y), y grows upwards """
+        row = (self.DIM - 1 - p_y) * self.PX + self.PX // 2
+        col = p_x * self.PX + self.PX // 2
+        return tuple(int(c) for c in p_image[row, col])
+
+    def test_picture_size(self):
+        # when
+        image = render_world([], [], [], np.empty((0, 2)), np.empty(0), self.DIM, 10, self.PX)
+        # then
+        self.assertEqual((self.DIM * self.PX, self.DIM * self.PX, 3), image.shape)
+        self.assertEqual(np.uint8, image.dtype)
+        self.assertEqual(BACKGROUND_RGB, self.cell_center(image, 2, 2))
+
+    def test_world_elements(self):
+        # given
+        barriers = [(0, 0)]
+        food_positions = [(4, 0)]
+        food_levels = [10]
+        positions = np.array([[1, 3], [3, 3]])
+        alive = np.array([True, False])
+        # when
+        image = render_world(barriers, food_positions, food_levels, positions, alive, self.DIM, 10, self.PX)
+        # then
+        self.assertEqual(BARRIER_RGB, self.cell_center(image, 0, 0))
+        self.assertEqual(tuple(int(c) for c in food_colors([10], 10)[0]), self.cell_center(image, 4, 0))
+        self.assertEqual(SPECIMEN_RGB[True], self.cell_center(image, 1, 3))
+        self.assertEqual(SPECIMEN_RGB[False], self.cell_center(image, 3, 3))
+        # specimen is a circle, corners of its cell stay empty
+        self.assertEqual(BACKGROUND_RGB, tuple(int(c) for c in image[2 * self.PX - 1, 2 * self.PX - 1]))
+
+    def test_food_colors_match_colormap(self):
+        # given
+        import matplotlib as mpl
+        levels = np.arange(0, 11)
+        # when
+        colors = food_colors(levels, 10)
+        # then
+        expected = np.rint(mpl.colormaps['Greens'](levels / 10)[:, :3] * 255)
+        self.assertTrue(np.all(np.abs(colors.astype(int) - expected) <= 1))
+
+    def test_pheromone_overlay(self):
+        # given
+        pheromones = np.zeros((self.DIM, self.DIM))
+        pheromones[2, 2] = 1.0
+        # when
+        image = render_world([], [], [], np.empty((0, 2)), np.empty(0), self.DIM, 10, self.PX, pheromones)
+        # then
+        self.assertNotEqual(BACKGROUND_RGB, self.cell_center(image, 2, 2))
+        self.assertEqual(BACKGROUND_RGB, self.cell_center(image, 1, 1))
@@ -0,0 +1,111 @@
+import dataclasses
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from src.evolution.Initialization import initialize_random_world, initialize_random_population, \
+    load_existing_population
+from src.external import population
+from src.saves.Settings import Settings
+from src.utils import Rng
+from src.utils.PopulationArchive import genomes_to_matrix, matrix_to_genomes, write_population_archive, \
+    read_population_archive, convert_legacy_pickle, population_arrays, is_population_archive
+from src.world.Grid import Grid
+
+
+class TestPopulationArchive(TestCase):
+    def setUp(self):
+        self.previous_settings = Settings.settings
+        Settings.settings = dataclasses.replace(Settings(), dim=12, population_size=6, genome_length=4, seed=5)
+        Rng.seed(5)
+        # own grid, so state left in global grid by other tests does not matter
+        self.grid = Grid(12)
+        self.grid_patch = patch('src.evolution.Initialization.grid', self.grid)
+        self.grid_patch.start()
+        initialize_random_world()
+        initialize_random_population()
+        self.folder_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder_path)
+        Settings.settings = self.previous_settings
+        self.grid_patch.stop()
+
+    def test_genome_matrix_round_trip(self):
+        # given
+        genomes = [['0000000f', 'ffffffff', '80000001'], ['12345678', '9abcdef0', '00000000']]
+        # when
+        matrix = genomes_to_matrix(genomes)
+        # then
+        self.assertEqual(np.uint32, matrix.dtype)
+        self.assertEqual((2, 3), matrix.shape)
+        self.assertEqual(0xffffffff, matrix[0, 1])
+        self.assertListEqual(genomes, matrix_to_genomes(matrix))
+
+    def test_archive_round_trip(self):
+        # given
+        path = os.path.join(self.folder_path, 'pop.npz')
+        genomes, energy, max_energy = population_arrays(population)
+        # when
+        write_population_archive(path, genomes, energy, max_energy, {"uid": "test"})
+        archive = read_population_archive(path)
+        # then
+        self.assertTrue(is_population_archive(path))
+        self.assertEqual(6, archive["meta"]["population_size"])
+        self.assertEqual(4, archive["meta"]["genome_length"])
+        self.assertEqual("test", archive["meta"]["uid"])
+        self.assertListEqual([specimen.genome for specimen in population[1:]], matrix_to_genomes(archive["genomes"]))
+        np.testing.assert_array_equal(max_energy, archive["max_energy"])
+        self.assertEqual(['pop.npz'], os.listdir(self.folder_path))
+
+    def test_unsupported_version_rejected(self):
+        # given
+        path = os.path.join(self.folder_path, 'pop.npz')
+        write_population_archive(path, *population_arrays(population))
+        with np.load(path) as data:
+            arrays = dict(data)
+        meta = json.loads(arrays["meta"].item())
+        meta["version"] += 1
+        arrays["meta"] = np.array(json.dumps(meta))
+        np.savez(path, **arrays)
+        # then
+        with self.assertRaises(ValueError):
+            read_population_archive(path)
+
+    def test_legacy_pickle_loaded_through_converter(self):
+        # given pickle the way it was saved before: whole population dumped once per specimen
+        path = os.path.join(self.folder_path, 'saved_POP.pickle')
+        genomes = [specimen.genome for specimen in population[1:]]
+        population[2].max_energy = 13
+        with open(path, "wb") as file:
+            for _ in population[1:]:
+                pickle.dump(population, file)
+        self.grid.reload_size()
+        initialize_random_world()
+        # when
+        load_existing_population(path)
+        # then
+        self.assertTrue(os.path.exists(os.path.join(self.folder_path, 'saved_POP.npz')))
+        self.assertListEqual(genomes, [specimen.genome for specimen in population[1:]])
+        self.assertEqual(13, population[2].max_energy)
+        self.assertEqual(13, population[2].energy)
+        for specimen in population[1:]:
+            self.assertEqual(specimen.index, self.grid.data[specimen.location.x, specimen.location.y])
+
+    def test_converter_writes_next_to_pickle(self):
+        # given
+        path = os.path.join(self.folder_path, 'old.pickle')
+        with open(path, "wb") as file:
+            pickle.dump(population, file)
+        # when
+        archive_path = convert_legacy_pickle(path)
+        # then
+        self.assertEqual(os.path.join(self.folder_path, 'old.npz'), archive_path)
+        self.assertEqual('old.pickle', read_population_archive(archive_path)["meta"]["converted_from"])
+        self.assertFalse(is_population_archive(path))
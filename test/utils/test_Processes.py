@@ -0,0 +1,25 @@
+import multiprocessing
+from unittest import TestCase
+
+from src.utils.Processes import get_context, start_process, new_queue
+
+
+class TestProcesses(TestCase):
+    def test_context_prefers_forkserver(self):
+        # when
+        context = get_context()
+        # then
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            self.assertEqual('forkserver', context.get_start_method())
+        else:
+            self.assertEqual('spawn', context.get_start_method())
+
+    def test_start_process(self):
+        # given
+        queue = new_queue()
+        # when
+        p = start_process(queue.put, ("done",))
+        p.join()
+        # then
+        self.assertEqual(0, p.exitcode)
+        self.assertEqual("done", queue.get(timeout=10))
@@ -0,0 +1,98 @@
+import glob
+import os
+import pstats
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.utils import Profiling
+from src.utils.Processes import start_process
+from src.utils.Profiling import Profiler, SamplingProfiler
+
+
+def busy(p_seconds: float) -> int:
+    """ keeps CPU busy, so there is something to be sampled """
+
+    end = time.process_time() + p_seconds
+    count = 0
+    while time.process_time() < end:
+        count += 1
+
+    return count
+
+
+class TestProfiling(TestCase):
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+        self.environment = patch.dict(os.environ, {Profiling.FOLDER_VARIABLE: self.folder_path})
+        self.environment.start()
+
+    def tearDown(self):
+        self.environment.stop()
+        shutil.rmtree(self.folder_path)
+
+    def test_cprofile_of_every_generation(self):
+        # given
+        profiler = Profiler(Profiling.CPROFILE, 'test')
+        profiler.start()
+        # when
+        busy(0.01)
+        first = profiler.generation_finished(0)
+        busy(0.01)
+        second = profiler.generation_finished(1)
+        profiler.stop()
+        # then
+        self.assertEqual(os.path.join(self.folder_path, 'generation_0.pstats'), first)
+        for path in (first, second):
+            calls = {function: stat[1] for (_, _, function), stat in pstats.Stats(path).stats.items()}
+            # every generation starts from scratch, so busy is called once in each of them
+            self.assertEqual(1, calls['busy'])
+
+    def test_folder_of_simulation_is_used_instead_of_environment(self):
+        # given
+        profiler = Profiler(Profiling.CPROFILE, 'test')
+        profiler.folder = os.path.join(self.folder_path, 'run')
+        profiler.start()
+        # when
+        path = profiler.generation_finished(0)
+        profiler.stop()
+        # then
+        self.assertEqual(os.path.join(self.folder_path, 'run', 'generation_0.pstats'), path)
+
+    @unittest.skipUnless(SamplingProfiler.available(), 'needs SIGPROF')
+    def test_sampled_stacks_are_collapsed(self):
+        # given
+        profiler = Profiler(Profiling.SAMPLE, 'test')
+        # when
+        profiler.start()
+        busy(0.2)
+        profiler.stop()
+        path = profiler.write()
+        # then
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any('test_Profiling.py:busy' in line for line in lines))
+
+    def test_not_requested(self):
+        # given
+        with patch.dict(os.environ, {Profiling.MODE_VARIABLE: ''}):
+            # then
+            self.assertIsNone(Profiling.mode())
+
+    def test_started_process_writes_its_own_profile(self):
+        # given
+        with patch.dict(os.environ, {Profiling.MODE_VARIABLE: Profiling.CPROFILE}):
+            # when
+            p = start_process(busy, (0.01,))
+        p.join()
+        # then
+        self.assertEqual(0, p.exitcode)
+        paths = glob.glob(os.path.join(self.folder_path, 'busy_*.pstats'))
+        self.assertEqual(1, len(paths))
+        self.assertNotEqual(f'busy_{os.getpid()}.pstats', os.path.basename(paths[0]))
@@ -0,0 +1,90 @@
+from multiprocessing import Pipe
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.evolution.Initialization import initialize_simulation
+from src.utils import Progress
+from src.utils.Progress import ProgressReporter, drain
+
+
+class TestProgress(TestCase):
+    def setUp(self):
+        self.receiver, self.sender = Pipe(duplex=False)
+
+    def tearDown(self):
+        self.receiver.close()
+        self.sender.close()
+
+    def test_events_are_received_in_order(self):
+        # given
+        reporter = ProgressReporter(self.sender)
+        # when
+        reporter.started("uid", 0, 2)
+        reporter.generation_started(0)
+        reporter.generation_finished(0, {"survived": 3}, {"steps": 10})
+        events, closed = drain(self.receiver)
+        # then
+        self.assertFalse(closed)
+        self.assertListEqual([Progress.STARTED, Progress.GENERATION_STARTED, Progress.GENERATION_FINISHED],
+                             [kind for kind, _ in events])
+        self.assertEqual({"survived": 3}, events[2][1]["stats"])
+        self.assertIn("time", events[2][1])
+
+    def test_drain_does_not_block(self):
+        # when
+        events, closed = drain(self.receiver)
+        # then
+        self.assertListEqual([], events)
+        self.assertFalse(closed)
+
+    def test_closed_sender_is_detected(self):
+        # given
+        reporter = ProgressReporter(self.sender)
+        reporter.generation_started(1)
+        # when
+        reporter.close()
+        self.sender.close()
+        events, closed = drain(self.receiver)
+        # then
+        self.assertEqual(1, len(events))
+        self.assertTrue(closed)
+
+    def test_reporter_without_connection(self):
+        # given
+        reporter = ProgressReporter()
+        # then nothing happens
+        self.assertFalse(reporter.enabled)
+        reporter.generation_started(0)
+        reporter.close()
+
+    def test_closed_receiver_stops_reporting(self):
+        # given
+        reporter = ProgressReporter(self.sender)
+        self.receiver.close()
+        # when
+        reporter.generation_started(0)
+        # then
+        self.assertFalse(reporter.enabled)
+
+    def test_simulation_reports_finish(self):
+        # given
+        summary = {"uid": "test", "wall_time": 1.0}
+        with patch('src.evolution.Initialization._initialize_simulation', return_value=summary):
+            # when
+            result = initialize_simulation(uid="test", progress_connection=self.sender)
+        events, closed = drain(self.receiver)
+        # then
+        self.assertEqual(summary, result)
+        self.assertEqual([(Progress.FINISHED, summary)], [(kind, data["summary"]) for kind, data in events])
+
+    def test_simulation_reports_error(self):
+        # given
+        with patch('src.evolution.Initialization._initialize_simulation', side_effect=RuntimeError("broken")):
+            # when
+            with self.assertRaises(RuntimeError):
+                initialize_simulation(uid="test", progress_connection=self.sender)
+        events, closed = drain(self.receiver)
+        # then
+        self.assertEqual(Progress.ERROR, events[0][0])
+        self.assertIn("broken", events[0][1]["message"])
+        self.assertIn("RuntimeError", events[0][1]["traceback"])
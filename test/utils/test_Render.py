@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from src.utils.Render import AnimationSink
+
+
+class TestAnimationSink(TestCase):
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder_path)
+
+    def test_frames_streamed_into_gif(self):
+        # given
+        sink = AnimationSink(self.folder_path, 3)
+        frames = [np.full((20, 20, 3), value, dtype=np.uint8) for value in (0, 128, 255)]
+        # when
+        for frame in frames:
+            sink.append(frame)
+        # then animation is not visible until it is finished
+        self.assertFalse(os.path.exists(sink.path))
+        sink.close()
+        import imageio.v2 as imageio
+        self.assertEqual(os.path.join(self.folder_path, 'generation_3.gif'), sink.path)
+        self.assertEqual(3, len(imageio.mimread(sink.path)))
+        self.assertEqual(['generation_3.gif'], os.listdir(self.folder_path))
+
+    def test_close_twice(self):
+        # given
+        sink = AnimationSink(self.folder_path, 0)
+        sink.append(np.zeros((4, 4, 3), dtype=np.uint8))
+        # when
+        sink.close()
+        sink.close()
+        # then
+        self.assertTrue(sink.closed)
+        self.assertTrue(os.path.exists(sink.path))
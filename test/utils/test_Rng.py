@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from src.utils import Rng
+
+
+class TestRng(TestCase):
+    def test_same_seed_same_numbers(self):
+        # given
+        Rng.seed(123)
+        first = [Rng.stream(name).random() for name in Rng.STREAMS]
+        # when
+        Rng.seed(123)
+        second = [Rng.stream(name).random() for name in Rng.STREAMS]
+        # then
+        self.assertEqual(first, second)
+        self.assertEqual(len(Rng.STREAMS), len(set(first)))
+
+    def test_streams_are_independent(self):
+        # given
+        Rng.seed(5)
+        expected = Rng.stream(Rng.WORLD).random()
+        # when other stream is used before
+        Rng.seed(5)
+        Rng.stream(Rng.BEHAVIOUR).random(100)
+        # then
+        self.assertEqual(expected, Rng.stream(Rng.WORLD).random())
+
+    def test_random_seed_is_recorded(self):
+        # when
+        seed = Rng.seed()
+        # then
+        self.assertEqual(seed, Rng.get_seed())
+        self.assertEqual(seed, Rng.get_state()["seed"])
+
+    def test_state_restored(self):
+        # given
+        Rng.seed(9)
+        Rng.stream(Rng.MUTATION).random(10)
+        state = Rng.get_state()
+        expected = Rng.stream(Rng.MUTATION).random()
+        # when
+        Rng.seed(1)
+        Rng.set_state(state)
+        # then
+        self.assertEqual(expected, Rng.stream(Rng.MUTATION).random())
+
+    def test_worker_seeds(self):
+        seeds = [Rng.worker_seed(42, worker) for worker in range(4)]
+        self.assertEqual(4, len(set(seeds)))
+        self.assertEqual(seeds[0], Rng.worker_seed(42, 0))
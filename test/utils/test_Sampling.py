@@ -0,0 +1,71 @@
+import dataclasses
+from unittest import TestCase
+
+import numpy as np
+
+from src.saves.Settings import Settings
+from src.utils.FrameBuffer import Frame
+from src.utils.Sampling import FrameSampler, changed_cells
+
+
+def make_frame(p_positions: list, p_alive: list, p_food: list) -> Frame:
+    return Frame(0, 0, np.array(p_positions, dtype=np.int16), np.array(p_alive), np.array(p_food, dtype=np.int16))
+
+
+class TestFrameSampler(TestCase):
+    def sampler(self, **p_overrides) -> FrameSampler:
+        return FrameSampler(dataclasses.replace(Settings(), number_of_generations=25, **p_overrides))
+
+    def test_every_step(self):
+        # given
+        sampler = self.sampler(animation_policy='every')
+        # then
+        self.assertTrue(all(sampler.step_sampled(step, False) for step in range(10)))
+
+    def test_nth_step(self):
+        # given
+        sampler = self.sampler(animation_policy='nth_step', animation_every_n_steps=3)
+        # when
+        sampled = [step for step in range(10) if sampler.step_sampled(step, step == 9)]
+        # then
+        self.assertEqual([0, 3, 6, 9], sampled)
+
+    def test_first_last(self):
+        # given
+        sampler = self.sampler(animation_policy='first_last')
+        # when
+        sampled = [step for step in range(10) if sampler.step_sampled(step, step == 7)]
+        # then
+        self.assertEqual([0, 7], sampled)
+
+    def test_selected_generations(self):
+        # given
+        sampler = self.sampler(animation_every_n_generations=10)
+        # when
+        sampled = [generation for generation in range(25) if sampler.generation_sampled(generation)]
+        # then
+        self.assertEqual([0, 10, 20, 24], sampled)
+
+    def test_adaptive(self):
+        # given
+        sampler = self.sampler(animation_policy='adaptive', animation_min_changed_cells=3)
+        first = make_frame([[0, 0], [5, 5]], [True, True], [3])
+        small_change = make_frame([[0, 1], [5, 5]], [True, True], [3])
+        big_change = make_frame([[0, 1], [5, 5]], [True, False], [2])
+        # then
+        self.assertTrue(sampler.keep(first, False))
+        self.assertFalse(sampler.keep(small_change, False))
+        self.assertTrue(sampler.keep(big_change, False))
+        # last frame is kept whatever changed
+        self.assertTrue(sampler.keep(big_change, True))
+
+    def test_changed_cells(self):
+        # given
+        first = make_frame([[0, 0], [5, 5]], [True, True], [3, 3])
+        second = make_frame([[0, 1], [5, 5]], [True, False], [3, 2])
+        # then
+        self.assertEqual(4, changed_cells(first, second))
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            self.sampler(animation_policy='sometimes')
@@ -0,0 +1,90 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+from src.utils.StatsStore import StatsStore, StatsReader, stats_path
+
+
+class TestStatsStore(TestCase):
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder_path)
+
+    def test_save_stats(self):
+        # given
+        store = StatsStore(self.folder_path)
+        expected_dict = {"generation": 0, "survived": 0, "selected": 0, "killers_count": 0}
+        # when
+        store.add_generation(0, 0, 0, 0)
+        store.close()
+        # then
+        reader = StatsReader(self.folder_path)
+        self.assertDictEqual(expected_dict, reader.generation(0))
+        self.assertIsNone(reader.generation(1))
+        reader.close()
+
+    def test_commits_are_batched(self):
+        # given
+        store = StatsStore(self.folder_path, p_commit_generations=3, p_commit_seconds=60)
+        reader = StatsReader(self.folder_path)
+        # when
+        store.add_generation(0, 5, 2, 1)
+        store.add_generation(1, 4, 2, 1)
+        # then not committed yet
+        self.assertIsNone(reader.last_generation())
+        store.add_generation(2, 3, 2, 0)
+        self.assertEqual(2, reader.last_generation())
+        store.close()
+        reader.close()
+
+    def test_database_in_wal_mode(self):
+        # given
+        store = StatsStore(self.folder_path)
+        # then
+        with sqlite3.connect(stats_path(self.folder_path)) as connection:
+            self.assertEqual('wal', connection.execute('PRAGMA journal_mode').fetchone()[0])
+        store.close()
+
+    def test_range_of_generations_and_metrics(self):
+        # given
+        store = StatsStore(self.folder_path)
+        for gen in range(10):
+            store.add_generation(gen, 10 - gen, 2, gen % 2)
+            store.add_metrics(gen, {"steps": 20 + gen, "time": 0.5})
+        store.close()
+        # when
+        reader = StatsReader(self.folder_path)
+        selected = reader.generations(3, 6)
+        # then
+        self.assertListEqual([3, 4, 5], [row["generation"] for row in selected])
+        self.assertListEqual([7, 6, 5], [row["survived"] for row in selected])
+        self.assertEqual(10, len(reader.generations()))
+        self.assertListEqual([(8, 28.0), (9, 29.0)], reader.metrics("steps", 8))
+        self.assertListEqual(["steps", "time"], reader.metric_names())
+        reader.close()
+
+    def test_truncate_for_resumed_simulation(self):
+        # given
+        store = StatsStore(self.folder_path)
+        for gen in range(6):
+            store.add_generation(gen, 1, 1, 1)
+            store.add_metrics(gen, {"steps": gen})
+        store.close()
+        # when
+        resumed = StatsStore(self.folder_path)
+        resumed.truncate(4)
+        resumed.close()
+        # then
+        reader = StatsReader(self.folder_path)
+        self.assertEqual(3, reader.last_generation())
+        self.assertEqual(4, len(reader.metrics("steps")))
+        reader.close()
+
+    def test_reader_of_missing_stats(self):
+        # then
+        with self.assertRaises(FileNotFoundError):
+            StatsReader(os.path.join(self.folder_path, 'missing'))
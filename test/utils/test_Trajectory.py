@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from src.utils.FrameBuffer import Frame
+from src.utils.Replay import replay_generation, parse_generations
+from src.utils.Trajectory import TrajectoryWriter, TrajectoryReader, trajectory_path
+
+
+class TestTrajectory(TestCase):
+    def setUp(self):
+        self.folder_path = tempfile.mkdtemp()
+        self.barriers = [(0, 0), (1, 0)]
+        self.food_positions = [(4, 4)]
+        rng = np.random.default_rng(0)
+        # random walk of 9 specimens on 10 x 10 grid
+        self.positions = [rng.integers(1, 9, (9, 2)).astype(np.int16)]
+        for _ in range(5):
+            self.positions.append(np.clip(self.positions[-1] + rng.integers(-1, 2, (9, 2)), 0, 9).astype(np.int16))
+        self.alive = [np.arange(9) >= step for step in range(6)]
+        self.food = [np.array([5 - step], dtype=np.int16) for step in range(6)]
+
+        writer = TrajectoryWriter(self.folder_path, 9, 10, 5, 5)
+        writer.begin_generation(2, self.barriers, self.food_positions, self.positions[0])
+        for step in range(6):
+            writer.record(Frame(2, step, self.positions[step], self.alive[step], self.food[step]))
+        writer.end_generation()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder_path)
+
+    def test_read_written_steps(self):
+        # when
+        trajectory = TrajectoryReader(trajectory_path(self.folder_path, 2))
+        frames = list(trajectory.frames())
+        # then
+        self.assertEqual((2, 10, 5, 6), (trajectory.generation, trajectory.dim, trajectory.max_food, trajectory.steps))
+        self.assertEqual(self.barriers, [tuple(barrier) for barrier in trajectory.barriers.tolist()])
+        self.assertEqual(self.food_positions, [tuple(food) for food in trajectory.food_positions.tolist()])
+        self.assertEqual(6, len(frames))
+        for step, frame in enumerate(frames):
+            self.assertEqual(step, frame.step)
+            np.testing.assert_array_equal(self.positions[step], frame.positions)
+            np.testing.assert_array_equal(self.alive[step], frame.alive)
+            np.testing.assert_array_equal(self.food[step], frame.food)
+
+    def test_step_range(self):
+        # when
+        frames = list(TrajectoryReader(trajectory_path(self.folder_path, 2)).frames(3, 5))
+        # then
+        self.assertEqual([3, 4], [frame.step for frame in frames])
+        np.testing.assert_array_equal(self.positions[4], frames[1].positions)
+
+    def test_replay_generation(self):
+        # given
+        output_path = os.path.join(self.folder_path, 'replay')
+        os.mkdir(output_path)
+        # when
+        generation, frames, _ = replay_generation(self.folder_path, output_path, 2, 1, None, 4, (2, 2, 5, 6))
+        # then
+        import imageio.v2 as imageio
+        images = imageio.mimread(os.path.join(output_path, 'generation_2.gif'))
+        self.assertEqual((2, 5), (generation, frames))
+        self.assertEqual((5 * 4, 4 * 4), images[0].shape[:2])
+
+    def test_parse_generations(self):
+        self.assertEqual([0, 3, 4, 5], parse_generations('0,3-5,7', [0, 1, 2, 3, 4, 5, 6]))
+        self.assertEqual([1, 2], parse_generations('all', [1, 2]))